@@ -0,0 +1,287 @@
+"""批量生成数独谜题：用进程池并行生成，并把结果流式写入文件
+
+命令行用法：
+    python -m sudoku_algorithm generate --count 100000 --difficulty 困难 --workers 8
+    python -m sudoku_algorithm verify puzzles.jsonl
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+import config
+import seed_library
+import symmetry
+from board_state import board_to_string
+from dedup import DedupIndex
+from packed_board import copy_board
+from puzzle_bank import MAGIC, PuzzleBank, PuzzleBankWriter
+from sudoku_algorithm import SudokuAlgorithm
+
+_algorithm = None  # 每个工作进程各自持有一个算法实例，复用求解器的内部数组
+
+
+def _init_worker(seeds=None):
+    """创建工作进程的算法实例
+    Args:
+        seeds: 种子库的种子列表，提供时使用这些种子而不是种子库文件
+    """
+    global _algorithm
+    _algorithm = SudokuAlgorithm()
+    if seeds is not None:
+        _algorithm.seeds = seed_library.SeedLibrary(size=len(seeds), seeds=seeds)
+
+
+def _generate_chunk(task):
+    """在工作进程中生成一批谜题
+    Args:
+        task: (批次编号, 数量, 难度, 随机种子, 是否按评分定向生成, 每个谜题派生的变换数,
+              是否计算规范形式)。种子为 None 时使用系统随机源，否则每个批次使用由种子和
+              批次编号确定的独立种子，结果与调度顺序无关
+    Returns:
+        list: 每个元素是一条可以写成 JSON 的谜题记录。计算规范形式时，记录的 'canonical'
+              为完整生成的那个谜题的规范形式，由它派生的谜题与它相同
+    """
+    index, size, difficulty, seed, rated, variants, canonical = task
+    if _algorithm is None:
+        _init_worker()
+    # fork 出的子进程会继承父进程的随机数状态，必须重新设置种子
+    random.seed(None if seed is None else seed * 1000003 + index)
+    records = []
+    while len(records) < size:
+        if rated:
+            board, solution, rating = _algorithm.generate_rated(difficulty)
+        else:
+            board = _algorithm.generate_board()
+            solution = copy_board(board)
+            _algorithm.remove_numbers(board, difficulty)
+            rating = _algorithm.rate(board)
+        # 对称变换得到的谜题与原谜题同样唯一解、同样难度，只需一次置换
+        group = [(board, solution)] + symmetry.variants(
+            board, solution, min(variants, size - len(records) - 1))
+        key = symmetry.canonical_form(board) if canonical else None
+        for puzzle, answer in group:
+            record = {
+                'difficulty': difficulty,
+                'puzzle': board_to_string(puzzle),
+                'solution': board_to_string(answer),
+                'rating': rating,  # 按解题技巧的评分，见 grader.py
+            }
+            if key:
+                record['canonical'] = key
+            records.append(record)
+    return records
+
+
+def _tasks(count, difficulties, chunk_size, seed, rated, variants, canonical):
+    """把生成任务切分成批次，每个难度各生成 count 个谜题"""
+    index = 0
+    for difficulty in difficulties:
+        for start in range(0, count, chunk_size):
+            yield (index, min(chunk_size, count - start), difficulty, seed, rated, variants,
+                   canonical)
+            index += 1
+
+
+def generate_puzzles(count, difficulties, workers=None, chunk_size=100, seed=None, rated=False,
+                     variants=None, dedup=None):
+    """并行生成谜题，按完成顺序逐批产出结果
+    Args:
+        count: 每个难度生成的谜题数量
+        difficulties: 难度列表，取值见 config.GAME['difficulties']
+        workers: 工作进程数，默认为 CPU 核数；为 1 时在当前进程中生成
+        chunk_size: 每个任务批次包含的谜题数量
+        seed: 随机种子，为 None 时不可复现。指定时种子库也由该种子在内存中建立（约半秒），
+              结果不依赖本机的种子库文件
+        rated: 为 True 时继续挖空，直到评分落在 config.GRADING['bands'] 中该难度的区间内
+        variants: 每个完整生成的谜题再通过对称变换派生的谜题数，默认为 config.GAME['variants']
+        dedup: 去重索引（dedup.DedupIndex）。与索引中已有谜题对称等价的谜题
+               连同由它派生的谜题一起丢弃，因此产出的谜题可能少于 count 个
+    Yields:
+        list: 一批谜题记录
+    """
+    for difficulty in difficulties:
+        if difficulty not in config.GAME['difficulties']:
+            raise ValueError(f"未知的难度: {difficulty}")
+    if variants is None:
+        variants = config.GAME['variants']
+    tasks = _tasks(count, difficulties, chunk_size, seed, rated, variants, dedup is not None)
+    seeds = None
+    if config.SEEDS['enabled']:
+        algorithm = SudokuAlgorithm()
+        if seed is None:
+            # 种子库在主进程中建立并保存，工作进程加载同一个文件
+            algorithm.seeds.ensure(algorithm.fill_new_board)
+        else:
+            # 指定随机种子时种子库也由随机种子决定，交给每个工作进程，结果与调度顺序无关
+            seeds = seed_library.seeded(seed, algorithm.fill_new_board).seeds
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(seeds)
+        chunks = map(_generate_chunk, tasks)
+        yield from _deduplicate(chunks, dedup)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(seeds,)) as pool:
+        # 规范形式在工作进程中计算，主进程只做 O(1) 的索引查询
+        yield from _deduplicate(pool.imap_unordered(_generate_chunk, tasks), dedup)
+
+
+def _deduplicate(chunks, dedup):
+    """按规范形式过滤各批谜题记录，同一个规范形式的一组记录同时保留或丢弃"""
+    if dedup is None:
+        yield from chunks
+        return
+    for records in chunks:
+        accepted = {}
+        kept = []
+        for record in records:
+            key = record['canonical']
+            if key not in accepted:
+                accepted[key] = dedup.add_key(key)
+            if accepted[key]:
+                kept.append(record)
+        yield kept
+
+
+def write_puzzles(path, count, difficulties, workers=None, chunk_size=100, seed=None,
+                  rated=False, variants=None, dedup=None):
+    """生成谜题并以 JSON Lines 格式流式写入文件，每批完成后立即写出
+    Returns:
+        int: 写入的谜题数量
+    """
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for records in generate_puzzles(count, difficulties, workers, chunk_size, seed, rated,
+                                        variants, dedup):
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            written += len(records)
+    return written
+
+
+def write_bank(path, count, difficulties, workers=None, chunk_size=100, seed=None,
+               rated=False, variants=None, dedup=None):
+    """生成谜题并流式追加到题库文件（见 puzzle_bank.py），每批完成后立即写出
+    Returns:
+        int: 写入的谜题数量
+    """
+    written = 0
+    with PuzzleBankWriter(path, list(config.GAME['difficulties'])) as writer:
+        for records in generate_puzzles(count, difficulties, workers, chunk_size, seed, rated,
+                                        variants, dedup):
+            for record in records:
+                writer.append(record['puzzle'], record['solution'],
+                              record['difficulty'], record['rating'])
+            written += len(records)
+    return written
+
+
+def _read_records(path):
+    """逐条读取 JSON Lines 或题库文件中的 (谜题, 答案)"""
+    with open(path, 'rb') as f:
+        is_bank = f.read(len(MAGIC)) == MAGIC
+    if is_bank:
+        with PuzzleBank(path) as bank:
+            for index in range(len(bank)):
+                puzzle, solution, _, _ = bank.get(index)
+                yield puzzle, solution
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record['puzzle'], record['solution']
+
+
+def verify_puzzles(path, chunk_size=10000):
+    """用 NumPy 整批校验谜题文件（需要安装 numpy）
+
+    检查每个答案是完整且正确的解、保留了谜题的所有已知数字，
+    并对谜题做批量候选数传播，找出有矛盾的谜题。
+    Args:
+        path: JSON Lines 或题库文件
+        chunk_size: 每批校验的谜题数，限制内存占用
+    Returns:
+        dict: 各项检查未通过的谜题数以及总数
+    """
+    import vectorized  # numpy 是可选依赖，只在校验时导入
+    result = {'total': 0, 'bad_solution': 0, 'mismatch': 0, 'contradiction': 0}
+    records = _read_records(path)
+    while True:
+        chunk = [record for _, record in zip(range(chunk_size), records)]
+        if not chunk:
+            return result
+        puzzles = vectorized.to_array([puzzle for puzzle, _ in chunk])
+        solutions = vectorized.to_array([solution for _, solution in chunk])
+        _, status = vectorized.propagate(puzzles)
+        result['total'] += len(chunk)
+        result['bad_solution'] += int((~vectorized.is_solved(solutions)).sum())
+        result['mismatch'] += int((~vectorized.matches(puzzles, solutions)).sum())
+        result['contradiction'] += int((status == vectorized.CONTRADICTION).sum())
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(prog='python -m sudoku_algorithm',
+                                     description='数独谜题离线批量生成')
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help='批量生成谜题')
+    generate.add_argument('--count', type=int, required=True, help='每个难度生成的谜题数量')
+    generate.add_argument('--difficulty', action='append', choices=list(config.GAME['difficulties']),
+                          help='难度，可重复指定；默认生成所有难度')
+    generate.add_argument('--workers', type=int, default=None, help='工作进程数，默认为 CPU 核数')
+    generate.add_argument('--chunk-size', type=int, default=100, help='每个任务批次的谜题数量')
+    generate.add_argument('--seed', type=int, default=None,
+                          help='随机种子，用于复现结果（种子库也由该种子建立，不依赖种子库文件）')
+    generate.add_argument('--output', default='puzzles.jsonl', help='输出文件')
+    generate.add_argument('--format', choices=['jsonl', 'bank'], default='jsonl',
+                          help='输出格式：JSON Lines 或题库文件（追加写入）')
+    generate.add_argument('--rated', action='store_true',
+                          help='按解题技巧评分定向生成，评分区间见 config.GRADING')
+    generate.add_argument('--variants', type=int, default=None,
+                          help='每个完整生成的谜题通过对称变换派生的谜题数，默认见 config.GAME')
+    generate.add_argument('--dedup', metavar='PATH',
+                          help='去重索引文件，跨多次生成去重（不存在时创建）；默认只在本次生成内去重')
+    generate.add_argument('--no-dedup', action='store_true', help='不去重')
+    generate.add_argument('--verbose', '-v', action='count', default=0,
+                          help='输出算法日志：-v 为每个谜题的摘要，-vv 为逐格的详细过程')
+    verify = commands.add_parser('verify', help='用 NumPy 批量校验谜题文件（需要安装 numpy）')
+    verify.add_argument('input', help='JSON Lines 或题库文件')
+    args = parser.parse_args(argv)
+
+    if args.command == 'verify':
+        try:
+            result = verify_puzzles(args.input)
+        except ImportError:
+            parser.error('批量校验需要安装 numpy')
+        print(f"共 {result['total']} 个谜题：答案错误 {result['bad_solution']} 个，"
+              f"答案与谜题不符 {result['mismatch']} 个，谜题有矛盾 {result['contradiction']} 个",
+              file=sys.stderr)
+        return 1 if result['bad_solution'] or result['mismatch'] or result['contradiction'] else 0
+
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO if args.verbose == 1 else logging.DEBUG,
+                            format='%(processName)s %(name)s: %(message)s')
+
+    difficulties = args.difficulty or list(config.GAME['difficulties'])
+    requested = args.count * len(difficulties)
+    dedup = None
+    if not args.no_dedup:
+        # 只在本次生成内去重时，索引容量按本次的谜题数确定
+        dedup = DedupIndex(args.dedup, capacity=None if args.dedup else max(requested, 1000))
+    start = time.perf_counter()
+    write = write_bank if args.format == 'bank' else write_puzzles
+    written = write(args.output, args.count, difficulties, args.workers, args.chunk_size,
+                    args.seed, args.rated, args.variants, dedup)
+    elapsed = time.perf_counter() - start
+    if dedup is not None:
+        dedup.save()
+    print(f"已生成 {written} 个谜题，用时 {elapsed:.1f} 秒，"
+          f"{written / elapsed:.1f} 个/秒，写入 {args.output}", file=sys.stderr)
+    if written < requested:
+        print(f"丢弃了 {requested - written} 个重复的谜题", file=sys.stderr)
+    return 0
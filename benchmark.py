@@ -0,0 +1,279 @@
+"""性能基准：在固定随机种子和已知谜题上测量生成、挖空和唯一解验证的开销
+
+用法：
+    python benchmark.py --output bench.json
+    python benchmark.py --engine dlx --repeat 50 --compare bench.json
+    python benchmark.py --box 4 --box 5
+--box 额外测量其他大小的棋盘（宫大小，4 即 16x16），结果的引擎一栏记为棋盘大小。
+启用种子库（config.SEEDS）时使用由 --seed 在内存中建立的种子库，结果不依赖本机的种子库文件。
+结果以 JSON 保存，--compare 会与之前的结果逐项比较，便于发现不同提交之间的性能退化。
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import config
+import seed_library
+from packed_board import PackedBoard, copy_board
+from solve_cache import SolveCache
+from sudoku_algorithm import SudokuAlgorithm
+
+# 已知谜题：公开的高难度谜题和17个提示数的最少提示谜题
+KNOWN_PUZZLES = {
+    'expert': [
+        "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+        "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+    ],
+    '17-clue': [
+        "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+        "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+        "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+        "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "....14....3....2...7..........9...3.6.1.............8.2.....1.4....5.6.....7.8...",
+    ],
+}
+
+ENGINES = ('backtracking', 'dlx')
+
+_seed_libraries = {}  # (随机种子, 种子数) -> 内存中的种子库，各引擎共用
+
+
+def use_seeded_library(algorithm, seed):
+    """算法使用种子库时，换成由 seed 在内存中建立的种子库（见 seed_library.seeded）"""
+    if algorithm.seeds is None:
+        return
+    key = (seed, config.SEEDS['size'])
+    if key not in _seed_libraries:
+        _seed_libraries[key] = seed_library.seeded(seed, algorithm.fill_new_board)
+    algorithm.seeds = _seed_libraries[key]
+
+
+def build_corpus(algorithm, per_difficulty, seed):
+    """构建测试谜题集：按 config.GAME['difficulties'] 用固定种子生成的谜题，加上已知谜题
+    Returns:
+        dict: 类别 -> 谜题列表（PackedBoard）
+    """
+    use_seeded_library(algorithm, seed)
+    random.seed(seed)
+    corpus = {}
+    for difficulty in config.GAME['difficulties']:
+        puzzles = []
+        for _ in range(per_difficulty):
+            board = PackedBoard.from_rows(algorithm.generate_board())
+            algorithm.remove_numbers(board, difficulty)
+            puzzles.append(board)
+        corpus[difficulty] = puzzles
+    for category, puzzles in KNOWN_PUZZLES.items():
+        corpus[category] = [PackedBoard.from_string(puzzle) for puzzle in puzzles]
+    return corpus
+
+
+def percentile(sorted_values, fraction):
+    """最近秩法计算百分位数"""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def measure(operation, inputs, repeat):
+    """对每个输入重复执行 operation，返回耗时统计和峰值内存
+    Args:
+        operation: 接受一个输入的函数
+        inputs: 输入列表
+        repeat: 每个输入执行的次数
+    """
+    timings = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            operation(item)
+            timings.append(time.perf_counter() - start)
+    # 峰值内存单独测一遍，避免 tracemalloc 影响计时
+    tracemalloc.start()
+    for item in inputs:
+        operation(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'calls': len(timings),
+        'mean_ms': total / len(timings) * 1000,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p90_ms': percentile(timings, 0.90) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'max_ms': timings[-1] * 1000,
+        'per_sec': len(timings) / total if total else float('inf'),
+        'peak_kib': peak / 1024,
+    }
+
+
+def run_engine(engine, corpus, repeat, seed):
+    """在一个求解引擎上运行所有基准项目，返回结果列表"""
+    algorithm = SudokuAlgorithm(engine)
+    algorithm.cache = None  # 测量实际的搜索开销，重复输入不能命中求解缓存
+    use_seeded_library(algorithm, seed)
+    results = []
+
+    def record(operation, category, inputs, function):
+        random.seed(seed)
+        algorithm.stats.reset()
+        stats = measure(function, inputs, repeat)
+        # measure 在计时之外还会为测内存再执行一遍所有输入
+        calls = stats['calls'] + len(inputs)
+        stats['nodes'] = algorithm.stats.nodes / calls
+        stats['backtracks'] = algorithm.stats.backtracks / calls
+        results.append(dict(engine=engine, operation=operation, category=category, **stats))
+
+    # 生成完整棋盘与挖空（每个难度用同一批完整棋盘）
+    random.seed(seed)
+    full_boards = [PackedBoard.from_rows(algorithm.generate_board())
+                   for _ in range(max(len(puzzles) for puzzles in corpus.values()))]
+    record('generate_board', 'full', [None] * len(full_boards),
+           lambda _: algorithm.generate_board())
+    record('fill_new_board', 'full', [None] * len(full_boards),
+           lambda _: algorithm.fill_new_board())
+    for difficulty in config.GAME['difficulties']:
+        record('remove_numbers', difficulty, full_boards,
+               lambda board: algorithm.remove_numbers(board.copy(), difficulty))
+
+    for category, puzzles in corpus.items():
+        record('fill_board', category, puzzles,
+               lambda board: algorithm.fill_board(copy_board(board)))
+        record('find_empty', category, puzzles, algorithm.find_empty)
+        record('is_unique_solution', category, puzzles, algorithm.is_unique_solution)
+        # 同一批谜题在新的缓存上重复检查：第一遍未命中，之后都命中
+        algorithm.cache = SolveCache(len(puzzles))
+        record('is_unique_solution_cached', category, puzzles, algorithm.is_unique_solution)
+        algorithm.cache = None
+    return results
+
+
+def run_grid(box, repeat, per_difficulty, seed):
+    """在宫大小为 box 的棋盘上测量生成、挖空和唯一解验证，返回结果列表"""
+    algorithm = SudokuAlgorithm(box=box)
+    algorithm.cache = None
+    use_seeded_library(algorithm, seed)
+    name = f"{box * box}x{box * box}"
+    results = []
+
+    def record(operation, category, inputs, function):
+        random.seed(seed)
+        algorithm.stats.reset()
+        stats = measure(function, inputs, repeat)
+        calls = stats['calls'] + len(inputs)
+        stats['nodes'] = algorithm.stats.nodes / calls
+        stats['backtracks'] = algorithm.stats.backtracks / calls
+        results.append(dict(engine=name, operation=operation, category=category, **stats))
+
+    random.seed(seed)
+    full_boards = [PackedBoard.from_rows(algorithm.generate_board())
+                   for _ in range(per_difficulty)]
+    record('generate_board', 'full', [None] * per_difficulty,
+           lambda _: algorithm.generate_board())
+    for difficulty in config.GAME['difficulties']:
+        puzzles = []
+        for board in full_boards:
+            puzzle = board.copy()
+            algorithm.remove_numbers(puzzle, difficulty)
+            puzzles.append(puzzle)
+        record('remove_numbers', difficulty, full_boards,
+               lambda board: algorithm.remove_numbers(board.copy(), difficulty))
+        record('is_unique_solution', difficulty, puzzles, algorithm.is_unique_solution)
+    return results
+
+
+def git_revision():
+    """返回当前提交的哈希，不在 git 仓库中时返回 None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(engines=ENGINES, repeat=5, per_difficulty=10, seed=2024, boxes=()):
+    """运行完整的基准测试
+    Args:
+        boxes: 额外测量的其他棋盘大小（宫大小）
+    Returns:
+        dict: 包含运行环境信息和各项结果，可以直接写成 JSON
+    """
+    corpus = build_corpus(SudokuAlgorithm('backtracking'), per_difficulty, seed)
+    results = []
+    for engine in engines:
+        results.extend(run_engine(engine, corpus, repeat, seed))
+    for box in boxes:
+        results.extend(run_grid(box, repeat, per_difficulty, seed))
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'per_difficulty': per_difficulty,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline):
+    """逐项比较平均耗时，返回 (引擎, 操作, 类别, 之前, 现在, 比值) 列表"""
+    previous = {(item['engine'], item['operation'], item['category']): item
+                for item in baseline['results']}
+    rows = []
+    for item in current['results']:
+        key = (item['engine'], item['operation'], item['category'])
+        if key in previous:
+            before = previous[key]['mean_ms']
+            rows.append(key + (before, item['mean_ms'],
+                               item['mean_ms'] / before if before else float('inf')))
+    return rows
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='数独算法性能基准')
+    parser.add_argument('--engine', action='append', choices=ENGINES,
+                        help='求解引擎，可重复指定；默认测试所有引擎')
+    parser.add_argument('--repeat', type=int, default=5, help='每个输入重复执行的次数')
+    parser.add_argument('--per-difficulty', type=int, default=10, help='每个难度生成的测试谜题数')
+    parser.add_argument('--seed', type=int, default=2024, help='随机种子')
+    parser.add_argument('--box', type=int, action='append', choices=(2, 4, 5),
+                        help='额外测量的棋盘宫大小（2、4、5 即 4x4、16x16、25x25），可重复指定')
+    parser.add_argument('--output', help='把结果写入 JSON 文件')
+    parser.add_argument('--compare', help='与之前保存的 JSON 结果比较')
+    args = parser.parse_args(argv)
+
+    report = run(args.engine or ENGINES, args.repeat, args.per_difficulty, args.seed,
+                 args.box or ())
+    print(f"{'引擎':<14}{'操作':<28}{'类别':<10}{'次数':>6}{'p50毫秒':>10}{'p99毫秒':>10}"
+          f"{'每秒':>10}{'峰值KiB':>10}{'节点':>10}{'回溯':>10}")
+    for item in report['results']:
+        print(f"{item['engine']:<14}{item['operation']:<28}{item['category']:<10}{item['calls']:>6}"
+              f"{item['p50_ms']:>10.3f}{item['p99_ms']:>10.3f}{item['per_sec']:>10.1f}"
+              f"{item['peak_kib']:>10.1f}{item['nodes']:>10.1f}{item['backtracks']:>10.1f}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n与 {args.compare}（{baseline['meta'].get('revision')}）比较平均耗时：")
+        for engine, operation, category, before, after, ratio in compare(report, baseline):
+            print(f"{engine:<14}{operation:<28}{category:<10}{before:>10.3f} -> {after:>10.3f}"
+                  f"  x{ratio:.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""位掩码棋盘状态：为求解器提供常数时间的候选数查询"""
+from packed_board import PackedBoard
+
+# 数字 n (1-9) 对应掩码中的第 n-1 位，9位全为1表示全部数字
+FULL_MASK = 0x1FF
+BIT = [0] + [1 << (num - 1) for num in range(1, 10)]
+
+# 预先计算的查找表，避免在热路径上做任何循环
+POPCOUNT = [bin(mask).count('1') for mask in range(FULL_MASK + 1)]   # 掩码中候选数的个数
+MASK_DIGITS = [tuple(num for num in range(1, 10) if mask & BIT[num])  # 掩码包含的数字（升序）
+               for mask in range(FULL_MASK + 1)]
+
+# 一维下标 (0-80) 到行、列、宫的映射
+ROW_OF = [pos // 9 for pos in range(81)]
+COL_OF = [pos % 9 for pos in range(81)]
+BOX_OF = [(pos // 27) * 3 + (pos % 9) // 3 for pos in range(81)]
+ALL_POSITIONS = range(81)
+
+# 27个单元（9行、9列、9宫），每个单元是9个位置
+UNITS = ([[row * 9 + col for col in range(9)] for row in range(9)]
+         + [[row * 9 + col for row in range(9)] for col in range(9)]
+         + [[pos for pos in range(81) if BOX_OF[pos] == box] for box in range(9)])
+# 每个位置的20个相关位置（同行、同列或同宫）
+PEERS = [tuple(other for other in range(81) if other != pos and (
+             ROW_OF[other] == ROW_OF[pos] or COL_OF[other] == COL_OF[pos]
+             or BOX_OF[other] == BOX_OF[pos]))
+         for pos in range(81)]
+
+
+def board_to_string(board):
+    """把棋盘（PackedBoard 或 9x9 二维列表）转换为81个字符的字符串，0 表示空格"""
+    if isinstance(board, PackedBoard):
+        return board.to_string()
+    return ''.join(str(num) for row in board for num in row)
+
+
+class BoardState:
+    """增量维护的数独棋盘状态
+
+    用一维列表保存81个格子，并为每行、每列、每个3x3宫保存一个9位掩码，
+    记录其中已经出现的数字。填入/撤销数字时只更新三个掩码，
+    因此查询某格的候选数只需要几次位运算，而不必重新扫描行列宫。
+    """
+    __slots__ = ('cells', 'row_used', 'col_used', 'box_used', 'valid')
+
+    def __init__(self, board):
+        """根据二维棋盘构建状态
+        Args:
+            board: 9x9 二维列表或 PackedBoard，0 表示空格
+        """
+        if isinstance(board, PackedBoard):
+            self.cells = cells = list(board.cells)
+        else:
+            self.cells = cells = [num for line in board for num in line]
+        self.row_used = row_used = [0] * 9
+        self.col_used = col_used = [0] * 9
+        self.box_used = box_used = [0] * 9
+        self.valid = True  # 初始数字之间是否互不冲突
+        for pos in range(81):
+            num = cells[pos]
+            if num:
+                bit = BIT[num]
+                row, col, box = ROW_OF[pos], COL_OF[pos], BOX_OF[pos]
+                if (row_used[row] | col_used[col] | box_used[box]) & bit:
+                    self.valid = False
+                row_used[row] |= bit
+                col_used[col] |= bit
+                box_used[box] |= bit
+
+    def candidates(self, pos):
+        """返回指定格子的候选数掩码"""
+        return FULL_MASK & ~(self.row_used[ROW_OF[pos]]
+                             | self.col_used[COL_OF[pos]]
+                             | self.box_used[BOX_OF[pos]])
+
+    def is_valid(self, pos, num):
+        """检查数字能否填入指定格子"""
+        return bool(self.candidates(pos) & BIT[num])
+
+    def place(self, pos, num):
+        """在指定格子填入数字并更新掩码"""
+        bit = BIT[num]
+        self.cells[pos] = num
+        self.row_used[ROW_OF[pos]] |= bit
+        self.col_used[COL_OF[pos]] |= bit
+        self.box_used[BOX_OF[pos]] |= bit
+
+    def unplace(self, pos):
+        """清空指定格子并更新掩码"""
+        clear = ~BIT[self.cells[pos]]
+        self.cells[pos] = 0
+        self.row_used[ROW_OF[pos]] &= clear
+        self.col_used[COL_OF[pos]] &= clear
+        self.box_used[BOX_OF[pos]] &= clear
+
+    def find_empty(self, positions=ALL_POSITIONS):
+        """查找候选数最少的空格（最小剩余值策略）
+        Args:
+            positions: 只在这些位置中查找，求解时传入初始空格列表可以跳过已知数字
+        Returns:
+            tuple: (位置, 候选数掩码)；没有空格时位置为 -1。
+            与 SudokuAlgorithm.find_empty 的选择顺序一致：
+            返回第一个候选数最少的格子，遇到只有0或1个候选数的格子立即返回。
+        """
+        cells = self.cells
+        row_used, col_used, box_used = self.row_used, self.col_used, self.box_used
+        best_pos, best_mask, best_count = -1, 0, 10
+        for pos in positions:
+            if cells[pos]:
+                continue
+            mask = FULL_MASK & ~(row_used[ROW_OF[pos]]
+                                 | col_used[COL_OF[pos]]
+                                 | box_used[BOX_OF[pos]])
+            count = POPCOUNT[mask]
+            if count < best_count:
+                best_pos, best_mask, best_count = pos, mask, count
+                if count <= 1:
+                    break
+        return best_pos, best_mask
+
+    def empty_positions(self):
+        """返回当前所有空格的位置列表"""
+        cells = self.cells
+        return [pos for pos in range(81) if not cells[pos]]
+
+    def write_to(self, board):
+        """把当前状态写回棋盘（PackedBoard 或 9x9 二维列表）"""
+        cells = self.cells
+        if isinstance(board, PackedBoard):
+            board.cells[:] = bytes(cells)
+            return
+        for row in range(9):
+            board[row][:] = cells[row * 9:row * 9 + 9]
+
+    def to_board(self):
+        """转换回 9x9 二维列表"""
+        cells = self.cells
+        return [cells[row * 9:row * 9 + 9] for row in range(9)]
@@ -27,6 +27,9 @@ COLORS = {
     'fg_default': 'black',            # 默认文字颜色
     'fg_fixed': 'black',              # 固定数字的文字颜色
     'fg_hint': 'blue',                # 提示数字的文字颜色
+    'fg_conflict': 'red',             # 与同行、同列或同宫数字重复时的文字颜色
+    'bg_canvas': 'white',             # 画布网格中格子的背景色
+    'cursor': '#7f9cf5',              # 画布网格中选中格子的边框颜色
     'button_bg': 'white',             # 按钮背景色
     'button_fg': 'black'              # 按钮文字颜色
 }
@@ -36,7 +39,9 @@ GRID = {
     'border_width': 2,     # 网格边框宽度
     'cell_width': 2,       # 单元格宽度（以字符为单位）
     'cell_padding': 2,     # 单元格内边距
-    'relief': 'solid'      # 边框样式（实线）
+    'relief': 'solid',     # 边框样式（实线）
+    'renderer': 'entry',   # 网格绘制方式：'entry'（每格一个组件）或 'canvas'（单个画布，见 grid_view.py）
+    'cell_size': 48        # 画布网格中每个格子的边长（像素）
 }
 
 # 按钮配置：控制按钮的视觉效果和布局
@@ -52,9 +57,91 @@ BUTTONS = {
 # 游戏配置：控制游戏的核心参数
 GAME = {
     'max_checks': 5,       # 最大检查次数，超过后会显示答案
+    'max_restarts': 100,   # 生成完整棋盘失败时的最大重试次数
+    'fill_branch_limit': 2000,  # 9x9 以外的棋盘随机填充时每次最多的分支次数，超过后重新开始
+    'box_size': 3,         # 默认棋盘的宫大小（边长为宫大小的平方，3 即 9x9）
+    'sizes': {             # 界面中可以选择的棋盘大小：名称 -> 宫大小
+        '4x4': 2,
+        '9x9': 3,
+        '16x16': 4,
+    },
+    'poll_interval': 50,   # 界面轮询后台生成结果的间隔（毫秒）
+    'history_limit': 1000, # 撤销/重做历史最多保留的步数
+    'variants': 7,         # 每生成一个谜题，再通过对称变换派生出的谜题数（见 symmetry.py）
+    'solver': 'backtracking',  # 求解引擎：'backtracking'（位掩码回溯）或 'dlx'（舞蹈链精确覆盖）
+    'propagation': {       # 回溯引擎在各场景分支前使用的约束传播技巧，按顺序应用，空表示不传播
+        'fill': (),                                         # 生成棋盘：随机填充几乎不需要回溯
+        'check': ('naked_singles', 'hidden_singles'),       # 唯一解验证
+        'solve': ('naked_singles', 'hidden_singles', 'locked_candidates'),  # 求解谜题
+    },
     'difficulties': {      # 难度设置，数字表示要移除的数字数量
         '简单': 10,        # 简单模式：移除10个数字
         '中等': 25,        # 中等模式：移除25个数字
         '困难': 40         # 困难模式：移除40个数字
     }
-} 
\ No newline at end of file
+}
+
+# 挖空配置：见 SudokuAlgorithm.carve
+CARVING = {
+    'group_size': 1,       # 每次搜索最多一起移除的格子（或对称格子对）数，大于1时成组移除、多解时二分
+    'symmetric': False     # 是否成对移除中心对称的格子，得到中心对称的谜题
+}
+
+# 难度评分配置：按技巧评分，见 grader.py
+GRADING = {
+    'techniques': (        # (推理技巧, 每一步的权重)，按从易到难的顺序尝试
+        ('naked_singles', 1),
+        ('hidden_singles', 2),
+        ('locked_candidates', 8),
+        ('naked_pairs', 12),
+        ('hidden_pairs', 16),
+        ('x_wing', 24),
+    ),
+    'guess': 60,           # 所有技巧都无法继续、必须猜测时加上的评分
+    'bands': {             # 按评分定向生成时各难度的评分区间（含两端）
+        '简单': (0, 20),
+        '中等': (21, 45),
+        '困难': (46, 255),
+    },
+    'max_attempts': 20,    # 定向生成时最多尝试的完整棋盘数
+}
+
+# 谜题池配置：后台预先生成谜题，开始新游戏时直接取用
+POOL = {
+    'path': 'saves/puzzle_pool.json',  # 谜题池文件，冷启动时从中加载
+    'low_water': 3,        # 某个难度的谜题少于该数量时后台开始补充
+    'size': 10             # 每次补充到的数量
+}
+
+# 去重索引配置：按对称规范形式记录已生成的谜题，见 dedup.py
+DEDUP = {
+    'path': 'saves/puzzles.seen',  # 谜题池使用的去重索引文件
+    'capacity': 1000000,   # 布隆过滤器的容量
+    'error_rate': 0.0001   # 达到容量时的误判率
+}
+
+# 种子库配置：生成完整棋盘时从种子库中取一个并做随机对称变换，见 seed_library.py
+SEEDS = {
+    'enabled': True,       # 为 False 时每次都用回溯填充生成完整棋盘
+    'path': 'saves/seeds.bin',  # 种子库文件，第一次使用时建立
+    'size': 1000           # 种子数，建立时约需要回溯填充这么多次
+}
+
+# 求解结果缓存：按棋盘哈希记录解的个数和解，唯一解检查和求解先查缓存，见 solve_cache.py
+CACHE = {
+    'enabled': True,       # 为 False 时每次都重新搜索
+    'path': 'saves/solve_cache.bin',  # 缓存文件，启动时加载、关闭窗口时保存；为 None 时只在内存中使用
+    'capacity': 10000      # 最多保存的棋盘数，超过后淘汰最久未使用的
+}
+
+# 存档配置：每个存档槽一个文件，见 save_store.py
+SAVES = {
+    'dir': 'saves/slots',  # 存档目录
+    'slots': ('1', '2', '3'),  # 界面中可以选择的存档槽，第一个为默认存档槽
+    'legacy_path': 'saves/sudoku_save.json'  # 旧版本的存档，默认存档槽为空时从中加载
+}
+
+# 题库配置：题库文件存在时，新游戏优先从中随机取题（生成方法见 README）
+BANK = {
+    'path': 'saves/puzzles.bank'
+}
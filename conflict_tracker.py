@@ -0,0 +1,136 @@
+"""冲突跟踪：增量维护玩家填写的棋盘中每个单元的数字计数和冲突格子
+
+与界面无关，只用一维下标 (0-80) 和数字 (0-9，0 表示空格) 描述棋盘。
+每次填入或清除一个数字只更新该格所在的三个单元，因此即时冲突高亮、
+剩余空格数和完成判断都不需要重新扫描整个棋盘。
+其他大小的棋盘（见 geometry.py）按格子数自动选择单元结构。
+"""
+from geometry import geometry_for_cells
+from packed_board import PackedBoard
+
+
+class ConflictTracker:
+    """增量冲突索引
+
+    counts[unit * (n + 1) + num] 记录数字 num 在某个单元中出现的次数（n 为棋盘边长）；
+    duplicates[pos] 记录该格的数字在几个单元中重复出现，大于0即为冲突格子。
+    固定数字（谜题给出的数字）参与冲突计算，但不能修改。
+    所有数组都是 bytearray，一个实例只占用约1KB内存，可以同时保留大量实例。
+    """
+    __slots__ = ('geometry', 'cells', 'fixed', 'solution', 'counts', 'duplicates',
+                 'conflicting', 'remaining', 'wrong')
+
+    def __init__(self, board, solution=None):
+        """
+        Args:
+            board: 谜题棋盘（PackedBoard、81字符字符串或 9x9 二维列表），非0的格子为固定数字
+            solution: 该谜题的答案，提供时可以判断填写是否正确
+        """
+        self.cells = cells = PackedBoard.of(board).cells
+        self.geometry = geometry = geometry_for_cells(len(cells))
+        self.fixed = bytes(num != 0 for num in cells)
+        self.solution = bytes(PackedBoard.of(solution).cells) if solution is not None else None
+        self.counts = bytearray(len(geometry.units) * (geometry.size + 1))
+        self.duplicates = bytearray(geometry.cells)
+        self.conflicting = set()
+        self.remaining = cells.count(0)  # 剩余空格数
+        self.wrong = 0  # 已填写但与答案不同的格子数
+        for pos in range(geometry.cells):
+            num = cells[pos]
+            if num:
+                cells[pos] = 0
+                self.remaining += 1
+                self.set(pos, num, force=True)
+
+    def _adjust(self, pos, delta, changed):
+        """调整某格重复出现的单元数，冲突状态改变时记入 changed（改变两次则抵消）"""
+        before = self.duplicates[pos]
+        self.duplicates[pos] = after = before + delta
+        if bool(before) != bool(after):
+            if after:
+                self.conflicting.add(pos)
+            else:
+                self.conflicting.discard(pos)
+            changed ^= {pos}
+
+    def _other(self, unit, pos, num):
+        """返回单元中除 pos 之外数字为 num 的格子"""
+        cells = self.cells
+        for other in self.geometry.units[unit]:
+            if other != pos and cells[other] == num:
+                return other
+
+    def set(self, pos, num, force=False):
+        """填入或清除一个数字
+        Args:
+            pos: 一维下标 (0-80)
+            num: 数字 1-9（其他大小的棋盘为 1-n），0 表示清除
+            force: 是否允许修改固定数字（只在初始化时使用）
+        Returns:
+            set: 冲突状态发生变化的格子，界面只需要重新绘制这些格子和 pos 本身
+        """
+        if self.fixed[pos] and not force:
+            raise ValueError(f"第 {pos} 格是固定数字，不能修改")
+        cells, counts = self.cells, self.counts
+        units_of, stride = self.geometry.units_of, self.geometry.size + 1
+        old = cells[pos]
+        changed = set()
+        if old == num:
+            return changed
+
+        if old:
+            for unit in units_of[pos]:
+                key = unit * stride + old
+                count = counts[key]
+                counts[key] = count - 1
+                if count >= 2:  # 该格离开一个有重复的单元
+                    self._adjust(pos, -1, changed)
+                if count == 2:  # 剩下的那个格子不再重复
+                    self._adjust(self._other(unit, pos, old), -1, changed)
+            self.remaining += 1
+        cells[pos] = num
+        if num:
+            for unit in units_of[pos]:
+                key = unit * stride + num
+                count = counts[key]
+                counts[key] = count + 1
+                if count >= 1:
+                    self._adjust(pos, 1, changed)
+                if count == 1:  # 原来唯一的那个格子开始重复
+                    self._adjust(self._other(unit, pos, num), 1, changed)
+            self.remaining -= 1
+
+        solution = self.solution
+        if solution is not None:
+            self.wrong += ((num != 0 and num != solution[pos])
+                           - (old != 0 and old != solution[pos]))
+        return changed
+
+    def get(self, pos):
+        """返回某格的数字，0 表示空格"""
+        return self.cells[pos]
+
+    def is_conflict(self, pos):
+        """某格的数字是否与同行、同列或同宫的数字重复"""
+        return self.duplicates[pos] > 0
+
+    def conflicts(self):
+        """返回所有冲突格子的集合（只读，不要修改）"""
+        return self.conflicting
+
+    def count(self, unit, num):
+        """返回数字 num 在某个单元（geometry.units 的下标）中出现的次数"""
+        return self.counts[unit * (self.geometry.size + 1) + num]
+
+    def is_complete(self):
+        """棋盘是否已填满且没有冲突；谜题有唯一解时这就是正确答案"""
+        return not self.remaining and not self.conflicting
+
+    def is_solved(self):
+        """棋盘是否已填满且与答案一致（需要提供答案）"""
+        return not self.remaining and not self.wrong
+
+    def errors(self):
+        """返回所有为空或与答案不同的可编辑格子（需要提供答案，只在检查时使用）"""
+        cells, solution, fixed = self.cells, self.solution, self.fixed
+        return [pos for pos in range(len(cells)) if not fixed[pos] and cells[pos] != solution[pos]]
@@ -0,0 +1,144 @@
+"""去重索引：用布隆过滤器记录谜题的规范形式，判断新谜题是否与已有谜题对称等价
+
+布隆过滤器的内存占用只取决于容量和误判率，与实际记录的谜题数无关：
+容量一百万、误判率万分之一时约为 2.3MB。误判只会让极少数新谜题被当作重复丢弃，
+不会让重复的谜题通过。
+
+文件布局（整数均为小端序）：
+    文件头（32字节）：8字节魔数 b'SUDOKUBF'、u16 版本号、u16 哈希函数个数、
+                    4字节保留、u64 位数组的位数、u64 已记录的个数
+    位数组
+"""
+import hashlib
+import math
+import struct
+import config
+from file_io import atomic_write, load_file
+from symmetry import canonical_form
+
+MAGIC = b'SUDOKUBF'
+VERSION = 1
+_HEADER = struct.Struct('<8sHH4xQQ')
+_DIGEST = struct.Struct('<QQ')
+
+
+class BloomFilter:
+    """定长位数组上的布隆过滤器，添加和查询都是 O(哈希函数个数)"""
+
+    def __init__(self, capacity=1000000, error_rate=0.0001):
+        """
+        Args:
+            capacity: 预计记录的个数
+            error_rate: 记录数达到容量时的误判率
+        """
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.bit_count = max(64, (bits + 7) // 8 * 8)
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray(self.bit_count // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        """用一次哈希的两个64位部分组合出所有哈希函数的位置（Kirsch-Mitzenmacher）"""
+        first, second = _DIGEST.unpack(hashlib.blake2b(key, digest_size=16).digest())
+        bit_count = self.bit_count
+        return [(first + i * second) % bit_count for i in range(self.hash_count)]
+
+    def add(self, key):
+        """记录一个键
+        Args:
+            key: bytes
+        Returns:
+            bool: 该键此前不存在时返回 True（存在误判时可能返回 False）
+        """
+        bits = self.bits
+        new = False
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        self.count += new
+        return new
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+    def dumps(self):
+        """返回文件内容（位数组的副本），之后的修改不影响返回值"""
+        return (_HEADER.pack(MAGIC, VERSION, self.hash_count, self.bit_count, self.count)
+                + bytes(self.bits))
+
+    def save(self, path, data=None):
+        """原子写入文件（见 file_io.atomic_write）
+        Args:
+            data: dumps() 的返回值，默认为当前内容
+        """
+        atomic_write(path, self.dumps() if data is None else data)
+
+    @classmethod
+    def loads(cls, data):
+        """从 dumps()/save() 写出的内容恢复"""
+        magic, version, hash_count, bit_count, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("不是去重索引文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的去重索引版本: {version}")
+        bits = bytearray(data[_HEADER.size:])
+        if len(bits) * 8 != bit_count:
+            raise ValueError("去重索引文件不完整")
+        bloom = cls.__new__(cls)
+        bloom.bit_count, bloom.hash_count = bit_count, hash_count
+        bloom.bits, bloom.count = bits, count
+        return bloom
+
+
+class DedupIndex:
+    """按规范形式去重的谜题索引
+
+    互为对称变换的谜题（见 symmetry.canonical_form）被视为同一个谜题。
+    不是线程安全的，多个线程共用时由调用方加锁。
+    """
+
+    def __init__(self, path=None, capacity=None, error_rate=None):
+        """
+        Args:
+            path: 索引文件路径，文件存在时从中加载；为 None 时只在内存中使用
+            capacity: 新建索引的容量，默认为 config.DEDUP['capacity']
+            error_rate: 新建索引的误判率，默认为 config.DEDUP['error_rate']
+        """
+        self.path = path
+        self.bloom = load_file(path, BloomFilter.loads)
+        if self.bloom is None:
+            self.bloom = BloomFilter(capacity or config.DEDUP['capacity'],
+                                     error_rate or config.DEDUP['error_rate'])
+
+    def add(self, puzzle):
+        """记录一个谜题，谜题此前没有出现过时返回 True"""
+        return self.add_key(canonical_form(puzzle))
+
+    def add_key(self, key):
+        """记录一个已计算好的去重键（例如在工作进程中算出的规范形式）"""
+        return self.bloom.add(key.encode('ascii'))
+
+    def __contains__(self, puzzle):
+        return canonical_form(puzzle).encode('ascii') in self.bloom
+
+    def __len__(self):
+        return len(self.bloom)
+
+    def dumps(self):
+        """返回索引文件的内容（副本），可以在加锁时复制、释放锁后再用 save(data) 写入"""
+        return self.bloom.dumps()
+
+    def save(self, data=None):
+        """保存到 path，没有指定路径时什么也不做
+        Args:
+            data: dumps() 的返回值，默认为当前内容
+        """
+        if self.path:
+            self.bloom.save(self.path, data)
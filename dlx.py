@@ -0,0 +1,227 @@
+"""舞蹈链（Dancing Links）精确覆盖求解器
+
+数独可以表示为324个约束的精确覆盖问题：
+每格恰好一个数字（81）、每行每个数字恰好一次（81）、
+每列每个数字恰好一次（81）、每宫每个数字恰好一次（81）。
+矩阵的每一行对应"在某格填某数字"，共729行，每行覆盖4个约束。
+"""
+import random
+from board_state import ROW_OF, COL_OF, BOX_OF
+from solver import Solver
+
+ROOT = 0
+COLUMNS = 324
+ROWS = 729
+FIRST_NODE = COLUMNS + 1  # 0 为根节点，1-324 为列头节点
+
+
+def _row_columns(pos, num):
+    """返回 (pos, num) 这一行覆盖的4个约束列（列头节点编号）"""
+    digit = num - 1
+    return (1 + pos,
+            1 + 81 + ROW_OF[pos] * 9 + digit,
+            1 + 162 + COL_OF[pos] * 9 + digit,
+            1 + 243 + BOX_OF[pos] * 9 + digit)
+
+
+class DLXSolver(Solver):
+    """基于舞蹈链的 Algorithm X 求解器
+
+    整个覆盖矩阵只在创建时构建一次。每次搜索先"选中"已知数字所在的行，
+    搜索结束后按相反顺序恢复，矩阵回到初始状态，可以被下一次搜索复用。
+    每次选择候选行数最少的约束列分支，相当于同时利用了唯一候选数和隐性唯一数。
+    搜索用显式栈迭代进行，同一个实例不能同时在多个线程中使用。
+    """
+    __slots__ = ('left', 'right', 'up', 'down', 'column', 'size', 'row_of_node', 'chosen')
+
+    def __init__(self):
+        super().__init__()
+        total = FIRST_NODE + ROWS * 4
+        self.left = list(range(total))
+        self.right = list(range(total))
+        self.up = list(range(total))
+        self.down = list(range(total))
+        self.column = list(range(total))
+        self.size = [0] * (COLUMNS + 1)
+        self.row_of_node = [0] * total  # 节点所在行的编号 pos * 9 + num - 1
+        self.chosen = [0] * 81          # 每层选中的行节点
+
+        left, right = self.left, self.right
+        # 列头组成以根节点开始的环形链表
+        for col in range(COLUMNS + 1):
+            left[col] = col - 1 if col else COLUMNS
+            right[col] = col + 1 if col < COLUMNS else ROOT
+
+        node = FIRST_NODE
+        for pos in range(81):
+            for num in range(1, 10):
+                first = node
+                for col in _row_columns(pos, num):
+                    self._append(col, node)
+                    self.row_of_node[node] = pos * 9 + num - 1
+                    left[node] = node - 1 if node > first else first + 3
+                    right[node] = node + 1 if node < first + 3 else first
+                    node += 1
+
+    def _append(self, col, node):
+        """把节点接到列的末尾"""
+        up, down = self.up, self.down
+        self.column[node] = col
+        last = up[col]
+        up[node], down[node] = last, col
+        down[last] = node
+        up[col] = node
+        self.size[col] += 1
+
+    def _cover(self, col):
+        """移除约束列以及与它冲突的所有行"""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        left[right[col]] = left[col]
+        right[left[col]] = right[col]
+        row = down[col]
+        while row != col:
+            node = right[row]
+            while node != row:
+                up[down[node]] = up[node]
+                down[up[node]] = down[node]
+                size[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def _uncover(self, col):
+        """按与 _cover 相反的顺序恢复约束列"""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        row = up[col]
+        while row != col:
+            node = left[row]
+            while node != row:
+                size[column[node]] += 1
+                up[down[node]] = node
+                down[up[node]] = node
+                node = left[node]
+            row = up[row]
+        left[right[col]] = col
+        right[left[col]] = col
+
+    def _select(self, row):
+        """选中一行：覆盖该行涉及的其余约束列"""
+        right, column = self.right, self.column
+        node = right[row]
+        while node != row:
+            self._cover(column[node])
+            node = right[node]
+
+    def _deselect(self, row):
+        """撤销 _select"""
+        left, column = self.left, self.column
+        node = left[row]
+        while node != row:
+            self._uncover(column[node])
+            node = left[node]
+
+    def _shuffle_columns(self):
+        """随机打乱每个约束列内各行的顺序，使搜索按随机顺序尝试候选"""
+        up, down = self.up, self.down
+        for col in range(1, COLUMNS + 1):
+            nodes = []
+            node = down[col]
+            while node != col:
+                nodes.append(node)
+                node = down[node]
+            random.shuffle(nodes)
+            prev = col
+            for node in nodes:
+                down[prev], up[node] = node, prev
+                prev = node
+            down[prev], up[col] = col, prev
+
+    def _givens(self, state):
+        """返回已知数字对应的行首节点列表"""
+        cells = state.cells
+        return [FIRST_NODE + (pos * 9 + cells[pos] - 1) * 4
+                for pos in range(81) if cells[pos]]
+
+    def search(self, state, limit=1, randomize=False, keep=False):
+        """搜索数独的解，参数见 Solver.search；DLX 不做单独的传播，propagated 始终为0"""
+        self.branches = 0
+        self.backtracks = 0
+        self.propagated = 0
+        if not state.valid:
+            return 0
+        if randomize:
+            self._shuffle_columns()
+
+        right, down, size, column = self.right, self.down, self.size, self.column
+        chosen, row_of_node = self.chosen, self.row_of_node
+
+        # 选中已知数字所在的行
+        givens = self._givens(state)
+        for row in givens:
+            self._cover(column[row])
+            self._select(row)
+
+        count = branches = backtracks = 0  # 用局部变量计数，搜索结束后再写回
+        depth = 0
+        forward = True
+        while True:
+            if forward:
+                if right[ROOT] == ROOT:  # 所有约束都已覆盖，找到一个解
+                    count += 1
+                    if count >= limit:
+                        if keep:
+                            for level in range(depth):
+                                pos, digit = divmod(row_of_node[chosen[level]], 9)
+                                state.place(pos, digit + 1)
+                        break
+                    forward = False
+                    continue
+                # 选择候选行最少的约束列
+                col = right[ROOT]
+                best, best_size = col, size[col]
+                while col != ROOT and best_size > 1:
+                    if size[col] < best_size:
+                        best, best_size = col, size[col]
+                    col = right[col]
+                if not best_size:  # 某个约束无法满足，回溯
+                    backtracks += 1
+                    forward = False
+                    continue
+                self._cover(best)
+                row = down[best]
+                chosen[depth] = row
+                self._select(row)
+                branches += 1
+                depth += 1
+                continue
+
+            # 回溯：撤销当前层的选择并尝试同一列的下一行
+            if not depth:
+                break
+            depth -= 1
+            row = chosen[depth]
+            self._deselect(row)
+            col = column[row]
+            row = down[row]
+            if row != col:
+                chosen[depth] = row
+                self._select(row)
+                branches += 1
+                depth += 1
+                forward = True
+            else:
+                self._uncover(col)
+                backtracks += 1
+
+        self.branches, self.backtracks = branches, backtracks
+        # 恢复矩阵：先撤销搜索中的选择，再撤销已知数字
+        while depth:
+            depth -= 1
+            row = chosen[depth]
+            self._deselect(row)
+            self._uncover(column[row])
+        for row in reversed(givens):
+            self._deselect(row)
+            self._uncover(column[row])
+        return count
@@ -0,0 +1,76 @@
+"""文件读写工具：原子写入，以及文件不存在或损坏时返回 None 的读取
+
+存档（包括旧版本的 JSON 存档）、谜题池、去重索引、种子库和求解结果缓存都通过这里读写文件。
+"""
+import logging
+import os
+import struct
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# 读取时视为文件损坏的异常：读文件失败、格式不对（解析函数抛出的 ValueError、TypeError、
+# KeyError）或数据被截断（struct.error）
+CORRUPT_ERRORS = (OSError, ValueError, TypeError, KeyError, struct.error)
+
+
+def atomic_write(path, data):
+    """原子写入：先在同一目录写临时文件并刷到磁盘，再用 os.replace 替换原文件
+
+    写到一半时崩溃或断电，原文件保持不变；读到的总是完整的旧内容或新内容。
+    每次写入使用不同的临时文件，多个线程同时写同一个文件也不会互相破坏。
+    Args:
+        path: 目标文件路径，所在目录不存在时创建
+        data: 要写入的 bytes
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.',
+                                     suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory):
+    """把目录项（替换后的文件名）也刷到磁盘；不支持打开目录的平台（Windows）上跳过"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def load_file(path, parse):
+    """读取文件并解析
+    Args:
+        path: 文件路径，可以为 None
+        parse: 解析函数，参数为文件内容（bytes），格式不对时抛出 ValueError 等异常
+    Returns:
+        parse 的返回值；path 为 None、文件不存在或已损坏时返回 None，调用方重新建立
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return parse(f.read())
+    except CORRUPT_ERRORS as e:
+        logger.warning("无法读取 %s，将重新建立: %s", path, e)
+        return None
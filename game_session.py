@@ -0,0 +1,162 @@
+"""游戏会话：一局游戏的全部状态和操作，与界面无关
+
+GameSession 保存谜题、答案、玩家填写的数字（冲突索引）、撤销/重做历史和检查次数，
+提供输入、检查、撤销、重做、保存和加载操作。不依赖 Tk，没有显示器时也可以使用，
+一个进程中可以同时保留大量会话；ui.py 只负责把会话显示出来并把玩家操作转交给会话。
+棋盘可以是 9x9 以外的大小（见 geometry.py），由谜题的格子数决定。
+"""
+import json
+import config
+from conflict_tracker import ConflictTracker
+from file_io import atomic_write
+from history import History, digit_bits
+from packed_board import PackedBoard
+
+
+class GameSession:
+    """一局数独游戏
+
+    格子用一维下标 (0 到 n*n-1) 表示，数字 0 表示空格。
+    修改格子的操作返回需要重新绘制的格子（被修改的格子和冲突状态改变的格子）。
+    """
+    __slots__ = ('difficulty', 'board', 'solution', 'tracker', 'history',
+                 'check_count', 'max_checks')
+
+    def __init__(self, board, solution, difficulty="简单", max_checks=None):
+        """
+        Args:
+            board: 谜题棋盘（PackedBoard、81字符字符串或 n x n 二维列表）
+            solution: 完整答案
+            difficulty: 游戏难度
+            max_checks: 最大检查次数，默认为 config.GAME['max_checks']
+        """
+        self.difficulty = difficulty
+        self.board = PackedBoard.of(board)
+        self.solution = PackedBoard.of(solution)
+        self.tracker = ConflictTracker(self.board, self.solution)
+        self.history = History(bits=digit_bits(self.size))
+        self.check_count = 0
+        self.max_checks = config.GAME['max_checks'] if max_checks is None else max_checks
+
+    @property
+    def size(self):
+        """棋盘边长"""
+        return self.board.size
+
+    def value(self, pos):
+        """返回某格当前的数字，0 表示空格"""
+        return self.tracker.get(pos)
+
+    def is_fixed(self, pos):
+        """某格是否是谜题给出的固定数字"""
+        return bool(self.tracker.fixed[pos])
+
+    def is_conflict(self, pos):
+        return self.tracker.is_conflict(pos)
+
+    @property
+    def remaining(self):
+        """剩余空格数"""
+        return self.tracker.remaining
+
+    @property
+    def checks_left(self):
+        """剩余检查次数"""
+        return self.max_checks - self.check_count
+
+    def input(self, pos, num, record=True):
+        """填入或清除一个数字
+        Args:
+            pos: 一维下标
+            num: 数字 1-n，0 表示清除
+            record: 是否记入撤销历史
+        Returns:
+            set: 需要重新绘制的格子
+        Raises:
+            ValueError: pos 是固定数字，或 num 不在 0-n 之间
+        """
+        if not 0 <= num <= self.size:
+            raise ValueError(f"数字必须在 0-{self.size} 之间: {num}")
+        old = self.tracker.get(pos)
+        changed = self.tracker.set(pos, num)
+        if record:
+            self.history.record(pos, old, num)
+        changed.add(pos)
+        return changed
+
+    def undo(self):
+        """撤销一步
+        Returns:
+            tuple: (被修改的格子, 需要重新绘制的格子)，没有可撤销的步骤时返回 None
+        """
+        move = self.history.undo()
+        if move is None:
+            return None
+        pos, old, _ = move
+        return pos, self.input(pos, old, record=False)
+
+    def redo(self):
+        """重做一步，返回值同 undo()"""
+        move = self.history.redo()
+        if move is None:
+            return None
+        pos, _, new = move
+        return pos, self.input(pos, new, record=False)
+
+    def check(self):
+        """检查当前解答，消耗一次检查次数
+
+        检查次数用完且仍有错误时，把所有错误的格子改为正确答案，
+        并从撤销/重做历史中删除这些格子的步骤，撤销不会把揭示的答案改回错误的数字。
+        Returns:
+            tuple: (错误的格子, 被揭示答案的格子)，两者都为空表示已正确完成；
+                   检查次数已用完时返回 None
+        """
+        if self.check_count >= self.max_checks:
+            return None
+        self.check_count += 1
+        errors = self.tracker.errors()
+        revealed = []
+        if errors and self.check_count >= self.max_checks:
+            solution = self.solution.cells
+            for pos in errors:
+                self.input(pos, solution[pos], record=False)
+            self.history.discard(errors)
+            revealed = errors
+        return errors, revealed
+
+    def to_dict(self):
+        """转换为可以写入 JSON 的字典（与原有存档格式兼容）"""
+        tracker, n = self.tracker, self.size
+        return {
+            'board': self.board.to_string(),        # 每格一个字符的紧凑表示
+            'solution': self.solution.to_string(),
+            'current_state': {f"{pos // n},{pos % n}": str(tracker.get(pos) or "")
+                              for pos in range(n * n) if not tracker.fixed[pos]},
+            'difficulty': self.difficulty,
+            'check_count': self.check_count,
+            'history': self.history.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """从 to_dict() 的结果恢复（兼容旧存档的二维列表棋盘和没有历史的存档）"""
+        session = cls(data['board'], data['solution'], data['difficulty'])
+        n = session.size
+        for pos, value in data['current_state'].items():
+            i, j = map(int, pos.split(','))
+            if value and not session.is_fixed(i * n + j):
+                session.input(i * n + j, int(value), record=False)
+        session.check_count = data['check_count']
+        session.history = History.from_dict(data.get('history'), bits=digit_bits(n))
+        return session
+
+    def save(self, path):
+        """原子写入 JSON 文件（见 file_io.atomic_write）"""
+        atomic_write(path, json.dumps(self.to_dict()).encode('utf-8'))
+
+    @classmethod
+    def load(cls, path):
+        """从 save() 写入的文件加载"""
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
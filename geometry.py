@@ -0,0 +1,95 @@
+"""棋盘几何：任意宫大小的数独的行、列、宫、单元和相关格子表
+
+宫大小为 box 的数独边长 n = box * box，共 n * n 个格子，数字为 1-n。
+常用的有 box = 2（4x4）、3（9x9）、4（16x16）、5（25x25）。
+每种宫大小的查找表只计算一次；9x9 直接使用 board_state 中的查找表，
+所以 9x9 的热路径（BoardState、propagation、dlx）不受影响。
+"""
+from functools import lru_cache
+import board_state
+
+
+class Geometry:
+    """一种宫大小的查找表，所有属性在创建后只读
+
+    格子用一维下标 (0 到 cells-1) 表示，按行优先排列；
+    units 按"n 行、n 列、n 宫"的顺序排列，units_of[pos] 是该格所在的三个单元的下标。
+    """
+    __slots__ = ('box', 'size', 'cells', 'full_mask', 'bit',
+                 'row_of', 'col_of', 'box_of', 'units', 'units_of', 'peers')
+
+    def __init__(self, box):
+        """
+        Args:
+            box: 宫的边长（2-5）
+        """
+        if not 2 <= box <= 5:
+            raise ValueError(f"宫大小必须在 2-5 之间: {box}")
+        self.box = box
+        self.size = n = box * box
+        self.cells = cells = n * n
+        self.full_mask = (1 << n) - 1
+        if box == 3:
+            self.bit = board_state.BIT
+            self.row_of, self.col_of, self.box_of = (board_state.ROW_OF, board_state.COL_OF,
+                                                     board_state.BOX_OF)
+            self.units, self.peers = board_state.UNITS, board_state.PEERS
+        else:
+            self.bit = [0] + [1 << (num - 1) for num in range(1, n + 1)]
+            self.row_of = [pos // n for pos in range(cells)]
+            self.col_of = [pos % n for pos in range(cells)]
+            self.box_of = [(pos // (n * box)) * box + (pos % n) // box for pos in range(cells)]
+            self.units = ([[row * n + col for col in range(n)] for row in range(n)]
+                          + [[row * n + col for row in range(n)] for col in range(n)]
+                          + [[pos for pos in range(cells) if self.box_of[pos] == b]
+                             for b in range(n)])
+            self.peers = [tuple(sorted({other for unit in self._units_of(pos)
+                                        for other in self.units[unit]} - {pos}))
+                          for pos in range(cells)]
+        self.units_of = [self._units_of(pos) for pos in range(cells)]
+
+    def _units_of(self, pos):
+        return (self.row_of[pos], self.size + self.col_of[pos], 2 * self.size + self.box_of[pos])
+
+    def empty_board(self):
+        """返回 n x n 的空棋盘（二维列表）"""
+        return [[0] * self.size for _ in range(self.size)]
+
+    def to_rows(self, cells):
+        """把一维格子序列转换为 n x n 二维列表"""
+        n = self.size
+        return [list(cells[row * n:row * n + n]) for row in range(n)]
+
+    def __repr__(self):
+        return f"Geometry({self.box})"
+
+
+# 格子数 -> 宫大小
+_BOX_OF_CELLS = {box ** 4: box for box in range(2, 6)}
+
+
+@lru_cache(maxsize=None)
+def geometry(box=3):
+    """返回宫大小为 box 的查找表（每种大小只创建一次）"""
+    return Geometry(box)
+
+
+def geometry_for_cells(count):
+    """按格子数（16、81、256、625）返回查找表
+    Raises:
+        ValueError: 格子数不对应任何宫大小
+    """
+    box = _BOX_OF_CELLS.get(count)
+    if box is None:
+        raise ValueError(f"棋盘格子数必须是 16、81、256 或 625，实际为 {count}")
+    return geometry(box)
+
+
+def mask_digits(mask):
+    """返回掩码包含的数字（升序），用于超过9个数字、没有查找表的掩码"""
+    digits = []
+    while mask:
+        low = mask & -mask
+        digits.append(low.bit_length())
+        mask ^= low
+    return tuple(digits)
@@ -0,0 +1,95 @@
+"""难度评分：按人类解题的技巧顺序求解谜题，根据用到的技巧给出评分"""
+import config
+from board_state import BoardState
+from propagation import Propagator, TECHNIQUES
+
+GUESS = 'guess'  # 所有技巧都无法继续、必须猜测时记录的最难技巧
+
+
+class Grader:
+    """按技巧评分的难度评估器
+
+    与人类解题一样，每一步都从最简单的技巧开始尝试，某个技巧取得进展后
+    再从最简单的技巧重新开始。技巧每填入一个数字（只排除候选数的技巧每取得一次进展）
+    算一步，加上该技巧的权重，评分是所有步骤权重之和，所以评分同时反映了
+    需要的技巧有多难、需要多少步。所有技巧都无法继续时加上猜测的权重并停止。
+    技巧和权重见 config.GRADING。
+    评分只在位掩码状态和传播阶段的候选数数组上进行，结束后恢复棋盘状态，
+    同一个实例可以反复使用，但不能同时在多个线程中使用。
+    """
+    __slots__ = ('names', 'weights', 'guess_weight', 'propagator', 'placed',
+                 'steps', 'hardest', 'solved')
+
+    def __init__(self, techniques=None, guess_weight=None):
+        """
+        Args:
+            techniques: (技巧名称, 权重) 序列，按从易到难排列，默认为 config.GRADING['techniques']
+            guess_weight: 需要猜测时加上的权重，默认为 config.GRADING['guess']
+        """
+        techniques = techniques or config.GRADING['techniques']
+        self.names = tuple(name for name, _ in techniques)
+        self.weights = tuple(weight for _, weight in techniques)
+        self.guess_weight = config.GRADING['guess'] if guess_weight is None else guess_weight
+        self.propagator = Propagator(TECHNIQUES[name] for name in self.names)
+        self.placed = [0] * 81
+        self.steps = [0] * len(self.names)  # 最近一次评分中每个技巧的使用步数
+        self.hardest = None  # 最近一次评分用到的最难技巧名称，需要猜测时为 GUESS
+        self.solved = False  # 最近一次评分是否只用技巧就解出了谜题
+
+    def grade(self, board):
+        """评估谜题难度
+        Args:
+            board: 数独谜题（9x9 二维列表、PackedBoard 或 BoardState，不会被修改）
+        Returns:
+            int: 评分，谜题有矛盾（无解）时返回 -1
+        """
+        state = board if isinstance(board, BoardState) else BoardState(board)
+        steps = self.steps
+        for index in range(len(steps)):
+            steps[index] = 0
+        self.hardest = None
+        self.solved = False
+        if not state.valid:
+            return -1
+
+        propagator = self.propagator
+        techniques, weights = propagator.techniques, self.weights
+        empties = state.empty_positions()
+        propagator.begin(state, empties, self.placed, 0)
+        score = top = 0
+        hardest = -1
+        index = 0
+        while index < len(techniques):
+            result = techniques[index](propagator, empties)
+            if result < 0:
+                score = -1
+                break
+            if result:
+                count = (propagator.top - top) or 1
+                top = propagator.top
+                steps[index] += count
+                score += weights[index] * count
+                if index > hardest:
+                    hardest = index
+                index = 0
+            else:
+                index += 1
+
+        # 传播填入的格子记录在 placed 中，全部撤销后棋盘状态恢复原样
+        top = propagator.top
+        self.solved = score >= 0 and top == len(empties)
+        while top > 0:
+            top -= 1
+            state.unplace(self.placed[top])
+        if score < 0:
+            return -1
+        if hardest >= 0:
+            self.hardest = self.names[hardest]
+        if not self.solved:
+            self.hardest = GUESS
+            score += self.guess_weight
+        return score
+
+    def report(self):
+        """返回最近一次评分中各技巧的使用步数，只包含用到的技巧"""
+        return {name: count for name, count in zip(self.names, self.steps) if count}
@@ -0,0 +1,227 @@
+"""任意大小棋盘的位掩码状态与约束传播
+
+GridState 与 board_state.BoardState 接口相同，按 geometry.Geometry 的查找表工作，
+可以用于 4x4、16x16、25x25 等棋盘；GridPropagator 与 propagation.Propagator 接口相同，
+在分支前应用唯一候选数和隐性唯一数。二者都可以直接交给 solver.BacktrackingSolver 使用。
+9x9 棋盘仍然使用 BoardState 和 propagation 中按固定大小展开的实现。
+"""
+from packed_board import PackedBoard
+from propagation import CONTRADICTION
+
+
+class GridState:
+    """增量维护的任意大小数独棋盘状态
+
+    为每行、每列、每宫保存一个 n 位掩码，记录其中已经出现的数字，
+    查询某格的候选数只需要几次位运算，与棋盘大小无关。
+    """
+    __slots__ = ('geometry', 'cells', 'row_used', 'col_used', 'box_used', 'valid')
+
+    def __init__(self, board, geometry):
+        """根据棋盘构建状态
+        Args:
+            board: n x n 二维列表或 PackedBoard，0 表示空格
+            geometry: 棋盘的查找表（geometry.geometry(box)）
+        """
+        self.geometry = geometry
+        if isinstance(board, PackedBoard):
+            self.cells = cells = list(board.cells)
+        else:
+            self.cells = cells = [num for line in board for num in line]
+        if len(cells) != geometry.cells:
+            raise ValueError(f"棋盘必须有 {geometry.cells} 个格子，实际为 {len(cells)}")
+        n, bit = geometry.size, geometry.bit
+        self.row_used = row_used = [0] * n
+        self.col_used = col_used = [0] * n
+        self.box_used = box_used = [0] * n
+        self.valid = True  # 初始数字之间是否互不冲突
+        row_of, col_of, box_of = geometry.row_of, geometry.col_of, geometry.box_of
+        for pos in range(geometry.cells):
+            num = cells[pos]
+            if num:
+                if num > n:
+                    raise ValueError(f"数字必须在 1-{n} 之间: {num}")
+                mask = bit[num]
+                row, col, box = row_of[pos], col_of[pos], box_of[pos]
+                if (row_used[row] | col_used[col] | box_used[box]) & mask:
+                    self.valid = False
+                row_used[row] |= mask
+                col_used[col] |= mask
+                box_used[box] |= mask
+
+    def candidates(self, pos):
+        """返回指定格子的候选数掩码"""
+        geometry = self.geometry
+        return geometry.full_mask & ~(self.row_used[geometry.row_of[pos]]
+                                      | self.col_used[geometry.col_of[pos]]
+                                      | self.box_used[geometry.box_of[pos]])
+
+    def is_valid(self, pos, num):
+        """检查数字能否填入指定格子"""
+        return bool(self.candidates(pos) & self.geometry.bit[num])
+
+    def place(self, pos, num):
+        """在指定格子填入数字并更新掩码"""
+        geometry = self.geometry
+        bit = geometry.bit[num]
+        self.cells[pos] = num
+        self.row_used[geometry.row_of[pos]] |= bit
+        self.col_used[geometry.col_of[pos]] |= bit
+        self.box_used[geometry.box_of[pos]] |= bit
+
+    def unplace(self, pos):
+        """清空指定格子并更新掩码"""
+        geometry = self.geometry
+        clear = ~geometry.bit[self.cells[pos]]
+        self.cells[pos] = 0
+        self.row_used[geometry.row_of[pos]] &= clear
+        self.col_used[geometry.col_of[pos]] &= clear
+        self.box_used[geometry.box_of[pos]] &= clear
+
+    def find_empty(self, positions=None):
+        """查找候选数最少的空格（最小剩余值策略），返回值同 BoardState.find_empty"""
+        geometry = self.geometry
+        cells, full = self.cells, geometry.full_mask
+        row_used, col_used, box_used = self.row_used, self.col_used, self.box_used
+        row_of, col_of, box_of = geometry.row_of, geometry.col_of, geometry.box_of
+        best_pos, best_mask, best_count = -1, 0, geometry.size + 1
+        for pos in range(geometry.cells) if positions is None else positions:
+            if cells[pos]:
+                continue
+            mask = full & ~(row_used[row_of[pos]] | col_used[col_of[pos]] | box_used[box_of[pos]])
+            count = mask.bit_count()
+            if count < best_count:
+                best_pos, best_mask, best_count = pos, mask, count
+                if count <= 1:
+                    break
+        return best_pos, best_mask
+
+    def empty_positions(self):
+        """返回当前所有空格的位置列表"""
+        cells = self.cells
+        return [pos for pos in range(len(cells)) if not cells[pos]]
+
+    def write_to(self, board):
+        """把当前状态写回棋盘（PackedBoard 或 n x n 二维列表）"""
+        cells, n = self.cells, self.geometry.size
+        if isinstance(board, PackedBoard):
+            board.cells[:] = bytes(cells)
+            return
+        for row in range(n):
+            board[row][:] = cells[row * n:row * n + n]
+
+    def to_board(self):
+        """转换回 n x n 二维列表"""
+        return self.geometry.to_rows(self.cells)
+
+
+class GridPropagator:
+    """任意大小棋盘的约束传播阶段：唯一候选数和隐性唯一数
+
+    与 propagation.Propagator 一样，在每次分支前运行到不动点，填入的数字记录到求解器的栈中；
+    候选数数组每次从棋盘状态重新计算。大棋盘上隐性唯一数能把分支数降低几个数量级，
+    是 16x16 以上的棋盘能在合理时间内生成和验证唯一解的关键。
+    """
+    __slots__ = ('geometry', 'cand', 'state', 'placed', 'top', 'assigned')
+
+    def __init__(self, geometry):
+        """
+        Args:
+            geometry: 棋盘的查找表
+        """
+        self.geometry = geometry
+        self.cand = [0] * geometry.cells
+        self.state = None
+        self.placed = None
+        self.top = 0
+        self.assigned = 0  # 累计由传播填入的数字个数
+
+    def assign(self, pos, num):
+        """填入一个确定的数字，记录到栈中并更新相关格子的候选数"""
+        self.state.place(pos, num)
+        self.placed[self.top] = pos
+        self.top += 1
+        self.assigned += 1
+        cand = self.cand
+        clear = ~self.geometry.bit[num]
+        for peer in self.geometry.peers[pos]:
+            cand[peer] &= clear
+
+    def naked_singles(self, empties):
+        """唯一候选数，返回值同 propagation.naked_singles"""
+        cells, cand = self.state.cells, self.cand
+        progress = 0
+        for pos in empties:
+            if cells[pos]:
+                continue
+            mask = cand[pos]
+            if not mask:
+                return -1
+            if not mask & (mask - 1):
+                self.assign(pos, mask.bit_length())
+                progress = 1
+        return progress
+
+    def hidden_singles(self, empties):
+        """隐性唯一数，返回值同 propagation.hidden_singles"""
+        cells, cand, bit = self.state.cells, self.cand, self.geometry.bit
+        full = self.geometry.full_mask
+        progress = 0
+        for unit in self.geometry.units:
+            once = twice = used = 0
+            for pos in unit:
+                num = cells[pos]
+                if num:
+                    used |= bit[num]
+                else:
+                    mask = cand[pos]
+                    twice |= once & mask
+                    once |= mask
+            if (once | used) != full:  # 某个数字在本单元无处可填
+                return -1
+            single = once & ~twice
+            if not single:
+                continue
+            for pos in unit:
+                if cells[pos]:
+                    continue
+                mask = cand[pos] & single
+                if mask:
+                    if mask & (mask - 1):  # 同一格是两个数字的唯一位置
+                        return -1
+                    self.assign(pos, mask.bit_length())
+                    progress = 1
+        return progress
+
+    def propagate(self, state, empties, placed, top):
+        """运行传播直到不动点，并选出下一个分支位置，参数和返回值同 Propagator.propagate"""
+        cells, cand = state.cells, self.cand
+        for pos in empties:
+            if not cells[pos]:
+                cand[pos] = state.candidates(pos)
+        self.state, self.placed, self.top = state, placed, top
+        while True:
+            result = self.naked_singles(empties)
+            if result < 0:
+                return self.top, CONTRADICTION, 0
+            if result:
+                continue
+            result = self.hidden_singles(empties)
+            if result < 0:
+                return self.top, CONTRADICTION, 0
+            if not result:
+                break
+
+        best_pos, best_mask, best_count = -1, 0, self.geometry.size + 1
+        for pos in empties:
+            if cells[pos]:
+                continue
+            mask = cand[pos]
+            count = mask.bit_count()
+            if count < best_count:
+                best_pos, best_mask, best_count = pos, mask, count
+                if count <= 2:
+                    break
+        if best_pos >= 0 and not best_mask:
+            return self.top, CONTRADICTION, 0
+        return self.top, best_pos, best_mask
@@ -0,0 +1,353 @@
+"""数独网格的两种绘制方式，界面通过相同的接口使用它们
+
+EntryGrid 为每个格子创建一个 Entry/Label 组件（原有的界面）；
+CanvasGrid 在一个 tk.Canvas 上绘制整个网格，只修改画布上的图元，
+开始新游戏时复用画布，不创建也不销毁组件。使用哪一种由 config.GRID['renderer'] 决定。
+
+两种网格都用一维下标 (0-80) 表示格子，玩家修改某格后调用 on_input(pos, num)，
+num 为 0 表示清空。棋盘大小由 show() 传入的谜题决定，大小改变时重建网格；
+10 以上的数字用字母表示（16x16 为 A-G），大于 9x9 的棋盘按比例缩小字体。
+"""
+import math
+import tkinter as tk
+import config
+from packed_board import DIGIT_CHARS
+
+# 揭示答案时使用的字体
+REVEAL_FONT = ('Arial', 20, 'bold')
+
+
+def scale_font(font, size):
+    """按棋盘边长缩小字体：9x9 及以下不变，更大的棋盘按边长比例缩小"""
+    if size <= 9:
+        return font
+    return (font[0], max(8, font[1] * 9 // size)) + tuple(font[2:])
+
+
+def parse_digit(char, size):
+    """把按键字符或格子文字转换为数字 1-size，无效时返回 0"""
+    num = DIGIT_CHARS.find(char.upper()) if len(char) == 1 else -1
+    return num if 1 <= num <= size else 0
+
+
+def create_grid(parent, on_input):
+    """按 config.GRID['renderer'] 创建网格"""
+    if config.GRID['renderer'] == 'canvas':
+        return CanvasGrid(parent, on_input)
+    return EntryGrid(parent, on_input)
+
+
+class EntryGrid:
+    """每个格子一个组件的网格：空格使用 Entry，固定数字使用 Label"""
+
+    def __init__(self, parent, on_input):
+        """
+        Args:
+            parent: 父组件
+            on_input: 玩家修改格子后的回调 on_input(pos, num)
+        """
+        self.on_input = on_input
+        self.cells = {}
+        self.size = 0
+        # 创建数独网格的主框架
+        self.frame = tk.Frame(parent,
+                              relief='solid',
+                              borderwidth=2)
+        self.subgrids = {}
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def build_subgrids(self, size):
+        """为边长为 size 的棋盘创建每个宫的子框架"""
+        for frame in self.subgrids.values():
+            frame.destroy()
+        self.subgrids = {}
+        self.size = size
+        box = math.isqrt(size)
+        for i in range(box):
+            for j in range(box):
+                frame = tk.Frame(self.frame,
+                                 relief='solid',
+                                 borderwidth=2)
+                frame.grid(row=i, column=j, padx=2, pady=2)
+                self.subgrids[(i, j)] = frame
+
+    def show(self, board):
+        """显示新的谜题：重新创建所有格子组件"""
+        for cell in self.cells.values():
+            cell.destroy()
+        self.cells = {}
+        n = len(board)
+        if n != self.size:
+            self.build_subgrids(n)
+        box = math.isqrt(n)
+        for i in range(n):
+            for j in range(n):
+                value = board[i][j]
+                subgrid = self.subgrids[(i // box, j // box)]
+                cell_row, cell_col = i % box, j % box
+                pos = i * n + j
+
+                if value == 0:  # 空格子使用Entry组件
+                    entry = tk.Entry(subgrid,
+                                     width=2,
+                                     font=scale_font(config.FONTS['cell'], n),
+                                     justify='center',
+                                     relief='solid',
+                                     borderwidth=1)
+                    entry.grid(row=cell_row, column=cell_col,
+                               padx=2, pady=2, ipadx=2, ipady=2)
+                    entry.bind('<KeyPress>', lambda e, pos=pos: self.validate_input(e, pos))
+                    # 修改高亮颜色
+                    entry.bind('<FocusIn>', lambda e, entry=entry:
+                               entry.configure(bg=config.COLORS['bg_highlight']))
+                    entry.bind('<FocusOut>', lambda e, entry=entry:
+                               entry.configure(bg=config.COLORS['bg_default']))
+                    self.cells[pos] = entry
+                else:  # 已有数字使用Label组件
+                    label = tk.Label(subgrid,
+                                     text=DIGIT_CHARS[value],
+                                     width=2,
+                                     font=scale_font(config.FONTS['cell_fixed'], n),
+                                     relief='solid',
+                                     borderwidth=1)
+                    label.grid(row=cell_row, column=cell_col,
+                               padx=2, pady=2, ipadx=2, ipady=2)
+                    self.cells[pos] = label
+
+    def validate_input(self, event, pos):
+        """验证输入是否为1-n的数字（10以上为字母）"""
+        # 允许删除和退格键
+        if event.keysym in ['BackSpace', 'Delete']:
+            # 按键处理完成（输入框内容改变）后再通知界面
+            self.frame.after_idle(self.read_cell, pos)
+            return
+        # 只允许输入1-n的数字
+        if not parse_digit(event.char, self.size):
+            return "break"
+        # 如果已经有数字，阻止输入
+        if event.widget.get():
+            return "break"
+        self.frame.after_idle(self.read_cell, pos)
+
+    def read_cell(self, pos):
+        """读取输入框的内容并通知界面"""
+        value = self.cells[pos].get()
+        num = parse_digit(value, self.size)
+        if num and value != DIGIT_CHARS[num]:  # 小写字母统一显示为大写
+            self.set_value(pos, num)
+        self.on_input(pos, num)
+
+    def set_value(self, pos, num):
+        """设置可编辑格子的数字（不调用 on_input），0 表示清空"""
+        entry = self.cells[pos]
+        entry.delete(0, tk.END)
+        if num:
+            entry.insert(0, DIGIT_CHARS[num])
+
+    def set_fg(self, pos, color, font=None):
+        """设置格子的文字颜色（和字体）"""
+        if font is None:
+            self.cells[pos].config(fg=color)
+        else:
+            self.cells[pos].config(fg=color, font=scale_font(font, self.size))
+
+    def show_check(self, errors):
+        """显示检查结果：可编辑格子中 errors 内的标红，其余标绿"""
+        for pos, cell in self.cells.items():
+            if isinstance(cell, tk.Entry):
+                cell.config(bg=config.COLORS['bg_error'] if pos in errors
+                            else config.COLORS['bg_correct'])
+
+
+class CanvasGrid:
+    """在单个画布上绘制的网格
+
+    每个格子由一个背景矩形和一个文字图元组成，网格线只在创建时绘制一次。
+    修改只记录在 values/fgs/bgs/fonts 中并把格子标记为脏，空闲时一次性重绘：
+    只对与已绘制状态不同的属性调用 itemconfigure。可编辑格子的背景矩形带有
+    'editable' 标签，检查结果可以用一次标签操作整体着色。选中的格子用一个边框图元表示，
+    移动选中格子只需要修改这个图元的坐标。棋盘大小改变时才删除并重建所有图元，
+    大于 9x9 的棋盘缩小格子，使整个网格保持 9x9 时的尺寸。
+    """
+
+    def __init__(self, parent, on_input):
+        """
+        Args:
+            parent: 父组件
+            on_input: 玩家修改格子后的回调 on_input(pos, num)
+        """
+        self.on_input = on_input
+        self.margin = config.GRID['border_width']
+        self.canvas = canvas = tk.Canvas(parent, highlightthickness=0, takefocus=1)
+        self.dirty = set()
+        self.flush_pending = False
+        self.selected = None
+        self.build(9)
+        canvas.bind('<Button-1>', self.click)
+        canvas.bind('<Key>', self.key)
+
+    def build(self, n):
+        """为边长为 n 的棋盘创建所有图元"""
+        canvas, margin = self.canvas, self.margin
+        canvas.delete('all')
+        self.n = n
+        self.cells = cells = n * n
+        self.size = size = min(config.GRID['cell_size'], config.GRID['cell_size'] * 9 // n)
+        side = size * n + margin * 2
+        canvas.configure(width=side, height=side)
+        self.fixed = [True] * cells
+        # 期望的状态，以及画布上已经绘制的状态
+        self.values = [0] * cells
+        self.fgs = [config.COLORS['fg_fixed']] * cells
+        self.bgs = [config.COLORS['bg_canvas']] * cells
+        self.fonts = [config.FONTS['cell_fixed']] * cells
+        # 已绘制的文字、文字颜色、背景色、字体、是否为固定数字
+        self.drawn = [[0, None, None, None, True] for _ in range(cells)]
+        self.dirty.clear()
+        self.selected = None
+
+        self.rects = []
+        self.texts = []
+        for pos in range(cells):
+            x, y = self.origin(pos)
+            self.rects.append(canvas.create_rectangle(x, y, x + size, y + size, width=0,
+                                                      fill=self.bgs[pos]))
+            self.texts.append(canvas.create_text(x + size // 2, y + size // 2, text=''))
+        # 细线分隔格子，粗线分隔宫
+        box = math.isqrt(n)
+        for line in range(n + 1):
+            offset = margin + line * size
+            width = config.GRID['border_width'] if line % box == 0 else 1
+            canvas.create_line(margin, offset, margin + size * n, offset, width=width)
+            canvas.create_line(offset, margin, offset, margin + size * n, width=width)
+        self.cursor = canvas.create_rectangle(0, 0, 0, 0, width=3,
+                                              outline=config.COLORS['cursor'],
+                                              state='hidden')
+
+    def grid(self, **kwargs):
+        self.canvas.grid(**kwargs)
+
+    def origin(self, pos):
+        """返回格子左上角的画布坐标"""
+        n = self.n
+        return (self.margin + (pos % n) * self.size, self.margin + (pos // n) * self.size)
+
+    def show(self, board):
+        """显示新的谜题：复用所有图元，只修改与上一局不同的属性"""
+        n = len(board)
+        if n != self.n:
+            self.build(n)
+        colors = config.COLORS
+        cell_font = scale_font(config.FONTS['cell'], n)
+        fixed_font = scale_font(config.FONTS['cell_fixed'], n)
+        for pos in range(self.cells):
+            num = board[pos // n][pos % n]
+            fixed = num != 0
+            self.fixed[pos] = fixed
+            self.values[pos] = num
+            self.fgs[pos] = colors['fg_fixed'] if fixed else colors['fg_default']
+            self.bgs[pos] = colors['bg_canvas']
+            self.fonts[pos] = fixed_font if fixed else cell_font
+        self.dirty.update(range(self.cells))
+        self.select(None)
+        self.flush()
+
+    def mark(self, pos):
+        """把格子标记为脏，空闲时统一重绘"""
+        self.dirty.add(pos)
+        if not self.flush_pending:
+            self.flush_pending = True
+            self.canvas.after_idle(self.flush)
+
+    def flush(self):
+        """重绘所有脏格子中发生变化的属性"""
+        self.flush_pending = False
+        canvas = self.canvas
+        for pos in self.dirty:
+            drawn = self.drawn[pos]
+            text = self.values[pos]
+            changes = {}
+            if drawn[0] != text:
+                changes['text'] = DIGIT_CHARS[text] if text else ''
+            if drawn[1] != self.fgs[pos]:
+                changes['fill'] = self.fgs[pos]
+            if drawn[3] != self.fonts[pos]:
+                changes['font'] = self.fonts[pos]
+            if changes:
+                canvas.itemconfigure(self.texts[pos], **changes)
+            changes = {}
+            if drawn[2] != self.bgs[pos]:
+                changes['fill'] = self.bgs[pos]
+            if drawn[4] != self.fixed[pos]:
+                changes['tags'] = () if self.fixed[pos] else ('editable',)
+            if changes:
+                canvas.itemconfigure(self.rects[pos], **changes)
+            drawn[:] = text, self.fgs[pos], self.bgs[pos], self.fonts[pos], self.fixed[pos]
+        self.dirty.clear()
+
+    def select(self, pos):
+        """选中可编辑的格子（pos 为 None 时取消选中）"""
+        self.selected = pos
+        if pos is None:
+            self.canvas.itemconfigure(self.cursor, state='hidden')
+            return
+        x, y = self.origin(pos)
+        self.canvas.coords(self.cursor, x + 2, y + 2, x + self.size - 2, y + self.size - 2)
+        self.canvas.itemconfigure(self.cursor, state='normal')
+
+    def click(self, event):
+        """点击格子时选中它并获取键盘焦点"""
+        n = self.n
+        col = (event.x - self.margin) // self.size
+        row = (event.y - self.margin) // self.size
+        self.canvas.focus_set()
+        if 0 <= row < n and 0 <= col < n and not self.fixed[row * n + col]:
+            self.select(row * n + col)
+
+    def key(self, event):
+        """方向键移动到下一个可编辑的格子；数字键填入空格，删除键清空"""
+        pos = self.selected
+        if pos is None:
+            return
+        n, cells = self.n, self.cells
+        step = {'Up': -n, 'Down': n, 'Left': -1, 'Right': 1}.get(event.keysym)
+        if step:
+            target = pos + step
+            while 0 <= target < cells and self.fixed[target]:
+                target += step
+            if 0 <= target < cells:
+                self.select(target)
+        elif event.keysym in ('BackSpace', 'Delete'):
+            if self.values[pos]:
+                self.set_value(pos, 0)
+                self.on_input(pos, 0)
+        elif parse_digit(event.char, n) and not self.values[pos]:
+            num = parse_digit(event.char, n)
+            self.set_value(pos, num)
+            self.on_input(pos, num)
+
+    def set_value(self, pos, num):
+        """设置可编辑格子的数字（不调用 on_input），0 表示清空"""
+        self.values[pos] = num
+        self.mark(pos)
+
+    def set_fg(self, pos, color, font=None):
+        """设置格子的文字颜色（和字体）"""
+        self.fgs[pos] = color
+        if font is not None:
+            self.fonts[pos] = scale_font(font, self.n)
+        self.mark(pos)
+
+    def show_check(self, errors):
+        """显示检查结果：用一次标签操作把可编辑格子标绿，再只把 errors 标红"""
+        self.flush()
+        correct = config.COLORS['bg_correct']
+        self.canvas.itemconfigure('editable', fill=correct)
+        for pos in range(self.cells):
+            if not self.fixed[pos]:
+                self.bgs[pos] = self.drawn[pos][2] = correct
+        for pos in errors:
+            self.bgs[pos] = config.COLORS['bg_error']
+            self.mark(pos)
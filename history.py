@@ -0,0 +1,101 @@
+"""撤销/重做历史：只记录每一步修改的格子和前后的数字
+
+每一步编码为一个整数 pos << 8 | old << 4 | new（格子下标、修改前和修改后的数字），
+撤销和重做只需要恢复这一个格子。16x16 以上的棋盘数字超过15，每个数字改用5位。历史最多保留 limit 步，超出时丢弃最早的步骤，
+因此内存占用有上限。历史可以转换为列表保存到存档中。
+"""
+from collections import deque
+import config
+
+
+def encode_move(pos, old, new, bits=4):
+    """把一步修改编码为整数，bits 为每个数字占用的位数"""
+    return (pos << bits | old) << bits | new
+
+
+def digit_bits(size):
+    """返回边长为 size 的棋盘编码每个数字需要的位数"""
+    return 4 if size < 16 else 5
+
+
+def decode_move(move, bits=4):
+    """把整数解码为 (格子下标, 修改前的数字, 修改后的数字)"""
+    mask = (1 << bits) - 1
+    return move >> (2 * bits), (move >> bits) & mask, move & mask
+
+
+class History:
+    """有上限的撤销/重做栈"""
+    __slots__ = ('undo_stack', 'redo_stack', 'bits')
+
+    def __init__(self, limit=None, bits=4):
+        """
+        Args:
+            limit: 最多保留的步数，默认为 config.GAME['history_limit']
+            bits: 编码中每个数字占用的位数，数字超过15（16x16 以上的棋盘）时为5
+        """
+        self.bits = bits
+        limit = limit or config.GAME['history_limit']
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = deque(maxlen=limit)
+
+    def record(self, pos, old, new):
+        """记录一步修改，新的修改会清空重做栈"""
+        if old != new:
+            self.undo_stack.append(encode_move(pos, old, new, self.bits))
+            self.redo_stack.clear()
+
+    def undo(self):
+        """撤销一步
+        Returns:
+            tuple: (格子下标, 修改前的数字, 修改后的数字)，没有可撤销的步骤时返回 None。
+                   调用方把该格恢复为修改前的数字
+        """
+        if not self.undo_stack:
+            return None
+        move = self.undo_stack.pop()
+        self.redo_stack.append(move)
+        return decode_move(move, self.bits)
+
+    def redo(self):
+        """重做一步，返回值同 undo()，调用方把该格设为修改后的数字"""
+        if not self.redo_stack:
+            return None
+        move = self.redo_stack.pop()
+        self.undo_stack.append(move)
+        return decode_move(move, self.bits)
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def discard(self, positions):
+        """删除涉及这些格子的所有步骤，其他格子的步骤保持不变
+
+        这些格子被直接改写（例如揭示答案）、不应再被撤销或重做时使用。
+        """
+        positions = set(positions)
+        shift = 2 * self.bits
+        for stack in (self.undo_stack, self.redo_stack):
+            kept = [move for move in stack if move >> shift not in positions]
+            stack.clear()
+            stack.extend(kept)
+
+    def to_dict(self):
+        """转换为可以写入 JSON 的字典"""
+        return {'undo': list(self.undo_stack), 'redo': list(self.redo_stack)}
+
+    @classmethod
+    def from_dict(cls, data, limit=None, bits=4):
+        """从 to_dict() 的结果恢复（data 为 None 时返回空历史，兼容旧存档）"""
+        history = cls(limit, bits)
+        if data:
+            history.undo_stack.extend(int(move) for move in data.get('undo', ()))
+            history.redo_stack.extend(int(move) for move in data.get('redo', ()))
+        return history
@@ -0,0 +1,63 @@
+"""算法开销统计：计数器、各阶段耗时和阶段结束回调"""
+import time
+
+
+class Instrumentation:
+    """记录 SudokuAlgorithm 的开销
+
+    计数器：
+        nodes: 搜索中尝试填入的次数（搜索树的节点数）
+        backtracks: 某一层候选数全部失败、退回上一层的次数
+        checks: 唯一解/多解检查的次数
+        restarts: 生成完整棋盘时的重试次数
+    求解器在自己的局部变量中计数，每次搜索结束后才累加到这里，
+    因此热路径上没有额外开销。每个阶段（generate、fill、remove、check、solve）
+    结束时累加耗时，并调用 callback(phase, elapsed, instrumentation)。
+    """
+    COUNTERS = ('nodes', 'backtracks', 'checks', 'restarts')
+    __slots__ = COUNTERS + ('phase_time', 'phase_calls', 'callbacks')
+
+    def __init__(self):
+        self.callbacks = []
+        self.reset()
+
+    def reset(self):
+        """清零所有计数器和阶段耗时（保留回调）"""
+        self.nodes = 0
+        self.backtracks = 0
+        self.checks = 0
+        self.restarts = 0
+        self.phase_time = {}   # 阶段 -> 累计耗时（秒）
+        self.phase_calls = {}  # 阶段 -> 调用次数
+
+    def add_callback(self, callback):
+        """注册阶段结束回调 callback(phase, elapsed, instrumentation)"""
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self.callbacks.remove(callback)
+
+    def record_search(self, solver):
+        """累加一次搜索的节点数和回溯次数"""
+        self.nodes += solver.branches
+        self.backtracks += solver.backtracks
+
+    @staticmethod
+    def start():
+        """返回阶段开始时间，与 finish 配对使用"""
+        return time.perf_counter()
+
+    def finish(self, phase, start):
+        """结束一个阶段：累加耗时并通知回调"""
+        elapsed = time.perf_counter() - start
+        self.phase_time[phase] = self.phase_time.get(phase, 0.0) + elapsed
+        self.phase_calls[phase] = self.phase_calls.get(phase, 0) + 1
+        for callback in self.callbacks:
+            callback(phase, elapsed, self)
+
+    def snapshot(self):
+        """返回当前统计的字典副本，便于导出"""
+        data = {name: getattr(self, name) for name in self.COUNTERS}
+        data['phase_time'] = dict(self.phase_time)
+        data['phase_calls'] = dict(self.phase_calls)
+        return data
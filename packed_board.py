@@ -0,0 +1,151 @@
+"""紧凑棋盘：用81字节的 bytearray 保存棋盘，便于存储和进程间传递
+
+也可以保存 4x4、16x16、25x25 的棋盘（每格一字节）。字符串表示中 10 以上的数字
+依次用字母 A-P 表示（16x16 的数字为 1-9、A-G），'0' 和 '.' 表示空格。
+"""
+
+PACKED_SIZE = 41  # 每格4位，81格共40.5字节
+
+# 格子数 -> 棋盘边长
+_SIDE_OF_CELLS = {16: 4, 81: 9, 256: 16, 625: 25}
+# 字符串表示中的数字字符，下标即数字
+DIGIT_CHARS = '0123456789ABCDEFGHIJKLMNOP'
+
+
+class PackedBoard:
+    """81字节的紧凑棋盘
+
+    按行优先顺序把81个格子存放在一个 bytearray 中，0 表示空格。
+    board[row] 返回该行的可写 memoryview（不复制数据），因此 board[row][col]
+    的读写方式与二维列表相同，算法和界面代码可以直接使用；
+    board[row, col] 直接读写单个格子。复制只需复制一次缓冲区。
+    注意 board[row][:] 仍然是视图而不是副本，复制棋盘请使用 copy() 或 copy_board()。
+    其他大小的棋盘按格子数确定边长 size，用法相同。
+    """
+    __slots__ = ('cells', 'size')
+
+    def __init__(self, cells=None):
+        """
+        Args:
+            cells: 81个格子的值（任意字节序列或整数序列），默认为空棋盘；
+                   也可以是 16、256 或 625 个格子
+        """
+        self.cells = bytearray(81) if cells is None else bytearray(cells)
+        self.size = _SIDE_OF_CELLS.get(len(self.cells))
+        if self.size is None:
+            raise ValueError(f"棋盘必须有81个格子（或16、256、625个），实际为 {len(self.cells)}")
+
+    @classmethod
+    def from_rows(cls, rows):
+        """从 n x n 二维列表创建"""
+        return cls(num for row in rows for num in row)
+
+    @classmethod
+    def from_string(cls, text):
+        """从81个字符的字符串创建，'0' 和 '.' 表示空格（其他大小的棋盘见模块说明）"""
+        text = text.replace('.', '0')
+        side = _SIDE_OF_CELLS.get(len(text))
+        cells = text.upper().encode('ascii').translate(_FROM_ASCII) if text.isascii() else None
+        if side is None or cells is None or max(cells) > side:
+            raise ValueError(f"棋盘字符串必须是81个数字: {text!r}")
+        return cls(cells)
+
+    @classmethod
+    def from_packed(cls, data):
+        """从 pack() 生成的41字节数据创建"""
+        if len(data) != PACKED_SIZE:
+            raise ValueError(f"紧凑棋盘数据必须是 {PACKED_SIZE} 字节，实际为 {len(data)}")
+        cells = bytearray(82)
+        cells[0::2] = bytes(byte >> 4 for byte in data)
+        cells[1::2] = bytes(byte & 0x0F for byte in data)
+        if max(cells) > 9:
+            raise ValueError("紧凑棋盘数据中有超出 0-9 的格子")
+        return cls(cells[:81])
+
+    @classmethod
+    def of(cls, board):
+        """把任意支持的棋盘表示转换为 PackedBoard（总是返回新对象）
+        Args:
+            board: PackedBoard、81字符字符串、41字节紧凑数据或 n x n 二维列表
+        """
+        if isinstance(board, cls):
+            return board.copy()
+        if isinstance(board, str):
+            return cls.from_string(board)
+        if isinstance(board, (bytes, bytearray)) and len(board) == PACKED_SIZE:
+            return cls.from_packed(board)
+        return cls.from_rows(board)
+
+    def copy(self):
+        """复制棋盘（一次缓冲区复制）"""
+        return PackedBoard(self.cells)
+
+    def view(self):
+        """返回所有格子的可写 memoryview，不复制数据"""
+        return memoryview(self.cells)
+
+    def to_rows(self):
+        """转换为 n x n 二维列表"""
+        cells, n = self.cells, self.size
+        return [list(cells[row * n:row * n + n]) for row in range(n)]
+
+    def to_string(self):
+        """转换为每格一个字符的规范字符串，0 表示空格"""
+        return self.cells.translate(_TO_ASCII).decode('ascii')
+
+    def pack(self):
+        """压缩为41字节：每格4位，高4位在前（只支持 9x9，其他大小直接保存 cells）"""
+        if self.size != 9:
+            raise ValueError(f"只有 9x9 棋盘可以压缩，当前为 {self.size}x{self.size}")
+        cells = self.cells + b'\0'
+        return bytes((high << 4) | low for high, low in zip(cells[0::2], cells[1::2]))
+
+    def __getitem__(self, index):
+        n = self.size
+        if isinstance(index, tuple):
+            row, col = index
+            return self.cells[row * n + col]
+        return memoryview(self.cells)[index * n:index * n + n]
+
+    def __setitem__(self, index, value):
+        n = self.size
+        if isinstance(index, tuple):
+            row, col = index
+            self.cells[row * n + col] = value
+        else:
+            self.cells[index * n:index * n + n] = bytes(value)
+
+    def __iter__(self):
+        view, n = memoryview(self.cells), self.size
+        return (view[row * n:row * n + n] for row in range(n))
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        if isinstance(other, PackedBoard):
+            return self.cells == other.cells
+        return NotImplemented
+
+    __hash__ = None  # 棋盘可变，不能作为字典键；需要时使用 to_string() 或 pack()
+
+    def __repr__(self):
+        return f"PackedBoard({self.to_string()!r})"
+
+    __str__ = to_string
+
+
+# 数字与 ASCII 字符之间的转换表：_FROM_ASCII 把无效字符转换为 255，from_string 据此拒绝；
+# _TO_ASCII 只对 0-25 有定义，更大的值转换为 '\0'
+_TO_ASCII = DIGIT_CHARS.encode('ascii') + bytes(256 - len(DIGIT_CHARS))
+_FROM_ASCII = bytearray(b'\xff' * 256)
+for _num, _char in enumerate(DIGIT_CHARS.encode('ascii')):
+    _FROM_ASCII[_char] = _num
+_FROM_ASCII = bytes(_FROM_ASCII)
+
+
+def copy_board(board):
+    """复制棋盘，同时支持 PackedBoard 和 n x n 二维列表"""
+    if isinstance(board, PackedBoard):
+        return board.copy()
+    return [row[:] for row in board]
@@ -0,0 +1,319 @@
+"""约束传播：在回溯分支之前用推理技巧填入确定的数字、排除不可能的候选数"""
+from board_state import FULL_MASK, BIT, POPCOUNT, MASK_DIGITS, PEERS, UNITS
+
+# 传播结果：发现矛盾（当前状态无解）
+CONTRADICTION = -2
+
+# 行/列与三个宫相交的线段，每段3个位置
+# ROW_SEGMENTS[row * 3 + k] 是第 row 行落在第 k 个宫列中的3个格子
+ROW_SEGMENTS = [[row * 9 + k * 3 + i for i in range(3)] for row in range(9) for k in range(3)]
+# COL_SEGMENTS[col * 3 + k] 是第 col 列落在第 k 个宫行中的3个格子
+COL_SEGMENTS = [[(k * 3 + i) * 9 + col for i in range(3)] for col in range(9) for k in range(3)]
+
+
+def naked_singles(propagator, empties):
+    """唯一候选数：某格只剩一个候选数时直接填入
+    Returns:
+        int: 1 表示有进展，0 表示没有进展，-1 表示发现矛盾
+    """
+    cells, cand = propagator.state.cells, propagator.cand
+    progress = 0
+    for pos in empties:
+        if cells[pos]:
+            continue
+        mask = cand[pos]
+        if not mask:
+            return -1
+        if not mask & (mask - 1):
+            propagator.assign(pos, mask.bit_length())
+            progress = 1
+    return progress
+
+
+def hidden_singles(propagator, empties):
+    """隐性唯一数：某数字在一个单元中只有一个位置可填时直接填入"""
+    cells, cand = propagator.state.cells, propagator.cand
+    progress = 0
+    for unit in UNITS:
+        once = twice = used = 0
+        for pos in unit:
+            num = cells[pos]
+            if num:
+                used |= BIT[num]
+            else:
+                mask = cand[pos]
+                twice |= once & mask
+                once |= mask
+        if (once | used) != FULL_MASK:  # 某个数字在本单元无处可填
+            return -1
+        single = once & ~twice
+        if not single:
+            continue
+        for pos in unit:
+            if cells[pos]:
+                continue
+            mask = cand[pos] & single
+            if mask:
+                if mask & (mask - 1):  # 同一格是两个数字的唯一位置
+                    return -1
+                propagator.assign(pos, mask.bit_length())
+                progress = 1
+    return progress
+
+
+def _segment_targets(segments):
+    """为每条线段预先计算区块排除的目标格子
+
+    Returns:
+        tuple: (同行/列的其他6格, 同宫的其他6格)，均按线段下标排列
+    """
+    line_targets, box_targets = [], []
+    for index in range(27):
+        line, k = divmod(index, 3)
+        band = (line // 3) * 3
+        line_targets.append([pos for other in range(3) if other != k
+                             for pos in segments[line * 3 + other]])
+        box_targets.append([pos for other in range(band, band + 3) if other != line
+                            for pos in segments[other * 3 + k]])
+    return line_targets, box_targets
+
+
+ROW_TARGETS = _segment_targets(ROW_SEGMENTS)
+COL_TARGETS = _segment_targets(COL_SEGMENTS)
+
+
+def _locked_in_segments(propagator, segments, targets):
+    """对一个方向（行或列）的27条线段应用区块排除，返回是否排除了候选数"""
+    cells, cand, seg_masks = propagator.state.cells, propagator.cand, propagator.seg_masks
+    for index in range(27):
+        mask = 0
+        for pos in segments[index]:
+            if not cells[pos]:
+                mask |= cand[pos]
+        seg_masks[index] = mask
+
+    line_targets, box_targets = targets
+    progress = 0
+    for index in range(27):
+        mask = seg_masks[index]
+        if not mask:
+            continue
+        line, k = divmod(index, 3)
+        base, band = line * 3, (line // 3) * 3
+        # 宫内区块：数字在宫内只出现在这条线段上，则从同行（列）的其他宫中排除
+        box_others = 0
+        for other in range(band, band + 3):
+            if other != line:
+                box_others |= seg_masks[other * 3 + k]
+        # 行列区块：数字在行（列）内只出现在这条线段上，则从同宫的其他行（列）中排除
+        line_others = 0
+        for other in range(3):
+            if other != k:
+                line_others |= seg_masks[base + other]
+        for digits, positions in ((mask & ~box_others, line_targets[index]),
+                                  (mask & ~line_others, box_targets[index])):
+            if not digits:
+                continue
+            for pos in positions:
+                if not cells[pos] and cand[pos] & digits:
+                    cand[pos] &= ~digits
+                    progress = 1
+    return progress
+
+
+def locked_candidates(propagator, empties):
+    """区块排除（宫内区块与行列区块），只排除候选数，不直接填数"""
+    progress = _locked_in_segments(propagator, ROW_SEGMENTS, ROW_TARGETS)
+    return _locked_in_segments(propagator, COL_SEGMENTS, COL_TARGETS) | progress
+
+
+def naked_pairs(propagator, empties):
+    """显性数对：单元内两格的候选数是同一对数字时，从单元内其他格中排除这两个数字"""
+    cells, cand = propagator.state.cells, propagator.cand
+    seen = {}  # 候选数对掩码 -> 第一次出现的位置
+    progress = 0
+    for unit in UNITS:
+        seen.clear()
+        for pos in unit:
+            if cells[pos]:
+                continue
+            mask = cand[pos]
+            if POPCOUNT[mask] != 2:
+                continue
+            other = seen.get(mask)
+            if other is None:
+                seen[mask] = pos
+                continue
+            for peer in unit:
+                if peer != pos and peer != other and not cells[peer] and cand[peer] & mask:
+                    cand[peer] &= ~mask
+                    progress = 1
+    return progress
+
+
+def hidden_pairs(propagator, empties):
+    """隐性数对：两个数字在单元内都只能填在相同的两格时，这两格排除其他候选数"""
+    cells, cand = propagator.state.cells, propagator.cand
+    seen = {}  # 两格位置 -> 第一个只出现在这两格的数字掩码
+    progress = 0
+    for unit in UNITS:
+        seen.clear()
+        for num in range(1, 10):
+            bit = BIT[num]
+            first = second = -1
+            for pos in unit:
+                if not cells[pos] and cand[pos] & bit:
+                    if first < 0:
+                        first = pos
+                    elif second < 0:
+                        second = pos
+                    else:
+                        break
+            else:
+                if second < 0:
+                    continue
+                key = first * 81 + second
+                other = seen.get(key)
+                if other is None:
+                    seen[key] = bit
+                    continue
+                keep = bit | other
+                for pos in (first, second):
+                    if cand[pos] & ~keep:
+                        cand[pos] &= keep
+                        progress = 1
+    return progress
+
+
+def _x_wing_in_lines(propagator, lines, crosses):
+    """对一个方向应用 X 翼：lines 为9条基线，crosses[i] 为经过各基线第 i 格的交叉线"""
+    cells, cand = propagator.state.cells, propagator.cand
+    seen = {}  # 数字所在的两个位置（基线内下标掩码）-> 第一条基线
+    progress = 0
+    for num in range(1, 10):
+        bit = BIT[num]
+        seen.clear()
+        for index, line in enumerate(lines):
+            where = 0
+            for i, pos in enumerate(line):
+                if not cells[pos] and cand[pos] & bit:
+                    where |= 1 << i
+            if POPCOUNT[where] != 2:
+                continue
+            other = seen.get(where)
+            if other is None:
+                seen[where] = index
+                continue
+            # 交叉线的第 j 格位于第 j 条基线上，跳过构成 X 翼的两条基线
+            for i in MASK_DIGITS[where]:
+                for j, pos in enumerate(crosses[i - 1]):
+                    if j != index and j != other and not cells[pos] and cand[pos] & bit:
+                        cand[pos] &= ~bit
+                        progress = 1
+    return progress
+
+
+def x_wing(propagator, empties):
+    """X 翼：某数字在两行中都只能填在相同的两列时，从这两列的其他行中排除该数字（列方向同理）"""
+    progress = _x_wing_in_lines(propagator, UNITS[:9], UNITS[9:18])
+    return _x_wing_in_lines(propagator, UNITS[9:18], UNITS[:9]) | progress
+
+
+# 可在配置中按名称选用的推理技巧
+TECHNIQUES = {
+    'naked_singles': naked_singles,
+    'hidden_singles': hidden_singles,
+    'locked_candidates': locked_candidates,
+    'naked_pairs': naked_pairs,
+    'hidden_pairs': hidden_pairs,
+    'x_wing': x_wing,
+}
+# 默认按代价从低到高排列的推理技巧
+DEFAULT_TECHNIQUES = (naked_singles, hidden_singles, locked_candidates)
+
+
+class Propagator:
+    """约束传播阶段
+
+    在每次分支前依次应用推理技巧，任何技巧取得进展后都从最便宜的技巧重新开始，
+    直到所有技巧都没有进展（不动点）。填入的数字记录到求解器的栈中，
+    回溯时由求解器统一撤销；排除的候选数只保存在本次传播的候选数数组中，
+    每次传播都会从棋盘状态重新计算，因此不需要撤销。
+    """
+    __slots__ = ('techniques', 'cand', 'seg_masks', 'state', 'placed', 'top', 'assigned')
+
+    def __init__(self, techniques=DEFAULT_TECHNIQUES):
+        """
+        Args:
+            techniques: 推理技巧序列，每个技巧是 technique(propagator, empties) 形式的函数，
+                        返回 1（有进展）、0（无进展）或 -1（发现矛盾）
+        """
+        self.techniques = tuple(techniques)
+        self.cand = [0] * 81  # 每格的候选数掩码（包含传播中排除的结果）
+        self.seg_masks = [0] * 27  # 区块排除使用的线段候选数掩码
+        self.state = None
+        self.placed = None
+        self.top = 0
+        self.assigned = 0  # 累计由传播填入的数字个数，即省掉的分支点数
+
+    def assign(self, pos, num):
+        """填入一个确定的数字，记录到栈中并更新相关格子的候选数"""
+        self.state.place(pos, num)
+        self.placed[self.top] = pos
+        self.top += 1
+        self.assigned += 1
+        cand = self.cand
+        clear = ~BIT[num]
+        for peer in PEERS[pos]:
+            cand[peer] &= clear
+
+    def begin(self, state, empties, placed, top):
+        """从棋盘状态重新计算空格的候选数，并绑定求解器的栈，参数见 propagate"""
+        cells, cand = state.cells, self.cand
+        for pos in empties:
+            if not cells[pos]:
+                cand[pos] = state.candidates(pos)
+        self.state, self.placed, self.top = state, placed, top
+
+    def propagate(self, state, empties, placed, top):
+        """运行传播直到不动点，并选出下一个分支位置
+        Args:
+            state: 位掩码棋盘状态
+            empties: 搜索开始时的空格位置
+            placed: 求解器记录已填位置的栈
+            top: 栈顶位置
+        Returns:
+            tuple: (新的栈顶, 分支位置, 候选数掩码)。分支位置为 -1 表示已经填满，
+                   为 CONTRADICTION 表示当前状态无解
+        """
+        self.begin(state, empties, placed, top)
+        cells, cand = state.cells, self.cand
+        techniques = self.techniques
+        index = 0
+        while index < len(techniques):
+            result = techniques[index](self, empties)
+            if result < 0:
+                return self.top, CONTRADICTION, 0
+            index = 0 if result else index + 1
+
+        # 在传播后的候选数上按最小剩余值选择分支位置
+        best_pos, best_mask, best_count = -1, 0, 10
+        for pos in empties:
+            if cells[pos]:
+                continue
+            mask = cand[pos]
+            count = POPCOUNT[mask]
+            if count < best_count:
+                best_pos, best_mask, best_count = pos, mask, count
+                if count <= 2:
+                    break
+        if best_pos >= 0 and not best_mask:
+            return self.top, CONTRADICTION, 0
+        return self.top, best_pos, best_mask
+
+
+def make_propagator(names):
+    """根据技巧名称列表创建传播阶段，列表为空时返回 None（不做传播）"""
+    if not names:
+        return None
+    return Propagator(TECHNIQUES[name] for name in names)
@@ -0,0 +1,197 @@
+"""题库文件：定长记录的二进制格式，用 mmap 打开后可以按编号 O(1) 随机读取
+
+文件布局（整数均为小端序）：
+    文件头（128字节）
+        0   8字节  魔数 b'SUDOKUBK'
+        8   u16    版本号
+        10  u16    记录长度
+        12  u8     难度数量（最多8个）
+        16  u32    记录总数
+        20  u64    难度索引区的偏移，0 表示题库尚未完成写入
+        28  8×u32  每个难度的记录数
+        60  68字节 难度名称（UTF-8，换行分隔，不足补0）
+    记录区：每条记录84字节
+        41字节谜题（PackedBoard.pack）、41字节答案、u8 难度编号、u8 评分
+    难度索引区：按难度依次存放该难度所有记录的编号（u32）
+"""
+import mmap
+import os
+import random
+import struct
+from packed_board import PackedBoard, PACKED_SIZE
+
+MAGIC = b'SUDOKUBK'
+VERSION = 1
+HEADER_SIZE = 128
+MAX_DIFFICULTIES = 8
+RECORD_SIZE = PACKED_SIZE * 2 + 2
+TAG_OFFSET = PACKED_SIZE * 2  # 记录内难度编号的位置
+
+_HEADER = struct.Struct('<8sHHB3xIQ8I68s')
+_INDEX = struct.Struct('<I')
+
+
+def _pack_header(difficulties, record_count, index_offset, counts):
+    names = '\n'.join(difficulties).encode('utf-8')
+    if len(names) > 68:
+        raise ValueError("难度名称过长，无法写入题库文件头")
+    return _HEADER.pack(MAGIC, VERSION, RECORD_SIZE, len(difficulties), record_count,
+                        index_offset, *(list(counts) + [0] * (MAX_DIFFICULTIES - len(counts))),
+                        names)
+
+
+def _unpack_header(data):
+    """解析文件头，返回 (难度名称列表, 记录总数, 索引区偏移, 各难度记录数)"""
+    (magic, version, record_size, difficulty_count, record_count, index_offset,
+     *rest) = _HEADER.unpack_from(data)
+    counts, names = rest[:MAX_DIFFICULTIES], rest[MAX_DIFFICULTIES]
+    if magic != MAGIC:
+        raise ValueError("不是题库文件")
+    if version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f"不支持的题库版本: {version}")
+    difficulties = names.rstrip(b'\0').decode('utf-8').split('\n') if difficulty_count else []
+    return difficulties, record_count, index_offset, counts[:difficulty_count]
+
+
+class PuzzleBank:
+    """只读题库，通过 mmap 按编号或按难度随机读取谜题，不需要解析整个文件"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.difficulties, self.record_count, self.index_offset, counts = \
+                _unpack_header(self.mm)
+        except (OSError, ValueError, struct.error):
+            self.file.close()
+            raise
+        if not self.index_offset:
+            self.close()
+            raise ValueError("题库尚未完成写入")
+        # 每个难度在索引区中的起始位置
+        self.counts = dict(zip(self.difficulties, counts))
+        self.index_starts = {}
+        start = self.index_offset
+        for difficulty, count in self.counts.items():
+            self.index_starts[difficulty] = start
+            start += count * _INDEX.size
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.record_count
+
+    def count(self, difficulty):
+        """返回某个难度的谜题数量"""
+        return self.counts.get(difficulty, 0)
+
+    def get(self, index):
+        """按编号读取一条记录
+        Returns:
+            tuple: (谜题, 答案, 难度, 评分)，谜题和答案为 PackedBoard
+        """
+        if not 0 <= index < self.record_count:
+            raise IndexError(f"题库编号超出范围: {index}")
+        offset = HEADER_SIZE + index * RECORD_SIZE
+        mm = self.mm
+        puzzle = PackedBoard.from_packed(mm[offset:offset + PACKED_SIZE])
+        solution = PackedBoard.from_packed(mm[offset + PACKED_SIZE:offset + TAG_OFFSET])
+        return puzzle, solution, self.difficulties[mm[offset + TAG_OFFSET]], mm[offset + TAG_OFFSET + 1]
+
+    def get_by_difficulty(self, difficulty, n):
+        """读取某个难度的第 n 条记录（通过文件头中的难度索引定位）"""
+        if not 0 <= n < self.count(difficulty):
+            raise IndexError(f"{difficulty}难度的编号超出范围: {n}")
+        index, = _INDEX.unpack_from(self.mm, self.index_starts[difficulty] + n * _INDEX.size)
+        return self.get(index)
+
+    def random(self, difficulty):
+        """随机读取某个难度的一条记录，该难度没有谜题时返回 None"""
+        count = self.count(difficulty)
+        if not count:
+            return None
+        return self.get_by_difficulty(difficulty, random.randrange(count))
+
+
+class PuzzleBankWriter:
+    """题库追加写入器
+
+    记录按到达顺序追加到记录区，关闭时重新生成难度索引区并更新文件头。
+    追加到已有题库时，先截掉旧的索引区，再在其位置继续写入记录。
+    """
+
+    def __init__(self, path, difficulties):
+        """
+        Args:
+            path: 题库文件路径，不存在时创建
+            difficulties: 难度名称列表，记录中的难度编号是它在列表中的位置
+        """
+        if len(difficulties) > MAX_DIFFICULTIES:
+            raise ValueError(f"题库最多支持 {MAX_DIFFICULTIES} 个难度")
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            self.file = open(path, 'r+b')
+            existing, self.record_count, _, _ = _unpack_header(self.file.read(HEADER_SIZE))
+            if existing != list(difficulties):
+                self.file.close()
+                raise ValueError(f"题库的难度 {existing} 与 {list(difficulties)} 不一致")
+            self.file.truncate(HEADER_SIZE + self.record_count * RECORD_SIZE)
+        else:
+            self.file = open(path, 'w+b')
+            self.record_count = 0
+        self.difficulties = list(difficulties)
+        self.tags = {difficulty: tag for tag, difficulty in enumerate(self.difficulties)}
+        self._write_header(0, [0] * len(self.difficulties))
+        self.file.seek(0, os.SEEK_END)
+
+    def _write_header(self, index_offset, counts):
+        self.file.seek(0)
+        self.file.write(_pack_header(self.difficulties, self.record_count, index_offset, counts))
+
+    def append(self, puzzle, solution, difficulty, rating=0):
+        """追加一条记录
+        Args:
+            puzzle: 谜题（PackedBoard 或其他支持的棋盘表示）
+            solution: 完整答案
+            difficulty: 难度名称
+            rating: 评分（0-255，超出范围时截断），见 grader.py
+        """
+        record = (PackedBoard.of(puzzle).pack() + PackedBoard.of(solution).pack()
+                  + bytes((self.tags[difficulty], min(max(rating, 0), 255))))
+        self.file.write(record)
+        self.record_count += 1
+
+    def close(self):
+        """写出难度索引区和文件头，完成写入"""
+        if self.file.closed:
+            return
+        self.file.flush()
+        size = HEADER_SIZE + self.record_count * RECORD_SIZE
+        indexes = [[] for _ in self.difficulties]
+        if self.record_count:
+            with mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                # 按步长切片一次取出所有记录的难度编号
+                tags = mm[HEADER_SIZE + TAG_OFFSET:size:RECORD_SIZE]
+            for index, tag in enumerate(tags):
+                indexes[tag].append(index)
+        self.file.seek(size)
+        for records in indexes:
+            self.file.write(struct.pack(f'<{len(records)}I', *records))
+        self.file.truncate()
+        self._write_header(size, [len(records) for records in indexes])
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,166 @@
+"""预生成谜题池：后台线程为每个难度预先生成谜题，开始新游戏时直接取用"""
+import collections
+import json
+import logging
+import threading
+import config
+from dedup import DedupIndex
+from file_io import atomic_write, load_file
+from packed_board import PackedBoard
+from sudoku_algorithm import SudokuAlgorithm
+from symmetry import canonical_form, variants
+
+logger = logging.getLogger(__name__)
+
+
+class PuzzlePool:
+    """按难度分组的谜题池
+
+    每个难度一个队列，元素是 (谜题, 答案) 两个 PackedBoard，取用是 O(1) 的出队操作。后台线程在某个难度的谜题数
+    低于 low_water 时把它补充到 size 个，补充完成后把整个谜题池保存到磁盘，
+    因此冷启动时也可以立即从磁盘中取到谜题。每次完整生成的谜题还会通过对称变换
+    派生出 config.GAME['variants'] 个谜题，大部分谜题只需要一次置换的开销。
+    完整生成的谜题先在去重索引（config.DEDUP）中按规范形式查重，
+    与之前出现过的谜题对称等价时丢弃并重新生成。
+    """
+
+    def __init__(self, path=None, low_water=None, size=None):
+        """
+        Args:
+            path: 谜题池文件路径，默认为 config.POOL['path']
+            low_water: 低水位，默认为 config.POOL['low_water']
+            size: 每次补充到的数量，默认为 config.POOL['size']
+        """
+        self.path = path or config.POOL['path']
+        self.low_water = config.POOL['low_water'] if low_water is None else low_water
+        self.size = config.POOL['size'] if size is None else size
+        self.pools = {difficulty: collections.deque() for difficulty in config.GAME['difficulties']}
+        self.lock = threading.Lock()       # 保护各难度队列
+        self.wakeup = threading.Event()    # 通知后台线程检查水位
+        self.stopping = False
+        self.dirty = False                 # 谜题池是否有尚未保存的变化
+        self.thread = None
+        # 后台线程和调用线程各用一个算法实例，求解器的内部数组不能跨线程共用
+        self.worker_algorithm = SudokuAlgorithm()
+        self.algorithm = SudokuAlgorithm()
+        self.seen = DedupIndex(config.DEDUP['path'])  # 由 self.lock 保护
+        self.load()
+
+    def start(self):
+        """启动后台补充线程"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='puzzle-pool', daemon=True)
+            self.thread.start()
+        self.wakeup.set()
+
+    def stop(self):
+        """停止后台线程并保存谜题池"""
+        self.stopping = True
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.save()
+
+    def take(self, difficulty):
+        """取出一个谜题，池为空时在当前线程同步生成
+        Returns:
+            tuple: (谜题棋盘, 完整答案)，均为 PackedBoard
+        """
+        puzzle = self.pop(difficulty)
+        if puzzle is None:
+            puzzle = self.generate(self.algorithm, difficulty)
+        return puzzle
+
+    def pop(self, difficulty):
+        """取出一个谜题并通知后台线程补充，池为空时返回 None"""
+        with self.lock:
+            pool = self.pools[difficulty]
+            puzzle = pool.popleft() if pool else None
+            self.dirty = self.dirty or puzzle is not None
+        self.wakeup.set()
+        return puzzle
+
+    def put(self, difficulty, puzzle):
+        """放回一个谜题（例如后台生成后没有被使用的谜题）"""
+        with self.lock:
+            self.pools[difficulty].append(puzzle)
+            self.dirty = True
+
+    def count(self, difficulty):
+        """返回某个难度当前可用的谜题数"""
+        with self.lock:
+            return len(self.pools[difficulty])
+
+    @staticmethod
+    def generate(algorithm, difficulty):
+        """生成一个谜题，返回 (谜题棋盘, 完整答案)，均为 PackedBoard"""
+        board = PackedBoard.from_rows(algorithm.generate_board())
+        solution = board.copy()
+        algorithm.remove_numbers(board, difficulty)
+        return board, solution
+
+    def generate_many(self, algorithm, difficulty, count):
+        """生成一个没有出现过的谜题，并通过对称变换派生出其余谜题，总共最多 count 个
+        Args:
+            algorithm: 当前线程专用的算法实例
+            difficulty: 难度
+            count: 最多返回的谜题数
+        Returns:
+            list: 每个元素是 (谜题棋盘, 完整答案)，均为 PackedBoard，第一个是完整生成的谜题
+        """
+        for _ in range(config.GAME['max_restarts'] + 1):
+            puzzle, solution = self.generate(algorithm, difficulty)
+            key = canonical_form(puzzle)  # 规范化较慢，不在锁内进行
+            with self.lock:
+                if self.seen.add_key(key):
+                    break
+            logger.info("生成了重复的%s谜题，重新生成", difficulty)
+        count = min(count, config.GAME['variants'] + 1)
+        return [(puzzle, solution)] + variants(puzzle, solution, count - 1)
+
+    def _run(self):
+        """后台线程：把低于低水位的难度补充到指定数量"""
+        while not self.stopping:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            for difficulty in self.pools:
+                if self.count(difficulty) >= self.low_water:
+                    continue
+                while not self.stopping and self.count(difficulty) < self.size:
+                    puzzles = self.generate_many(self.worker_algorithm, difficulty,
+                                                 self.size - self.count(difficulty))
+                    with self.lock:
+                        self.pools[difficulty].extend(puzzles)
+                        self.dirty = True
+            if self.dirty:
+                self.save()
+
+    def load(self):
+        """从磁盘加载谜题池，文件不存在或损坏时保持为空"""
+        pools = load_file(self.path, _parse) or {}
+        with self.lock:
+            for difficulty, puzzles in pools.items():
+                if difficulty in self.pools:
+                    self.pools[difficulty].extend(puzzles)
+
+    def save(self):
+        """把谜题池和去重索引原子写入磁盘（见 file_io.atomic_write）
+
+        只在加锁时复制数据，写文件在释放锁之后进行，界面线程的 pop()/count() 不会等待磁盘写入。
+        """
+        with self.lock:
+            self.dirty = False
+            data = {difficulty: [[puzzle.to_string(), solution.to_string()]
+                                 for puzzle, solution in pool]
+                    for difficulty, pool in self.pools.items()}
+            seen = self.seen.dumps()
+        self.seen.save(seen)
+        atomic_write(self.path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+
+def _parse(data):
+    """解析谜题池文件的内容，返回 {难度: [(谜题, 答案), ...]}"""
+    return {difficulty: [(PackedBoard.from_string(puzzle), PackedBoard.from_string(solution))
+                         for puzzle, solution in puzzles]
+            for difficulty, puzzles in json.loads(data.decode('utf-8')).items()}
@@ -0,0 +1,178 @@
+"""存档：按名称区分的多个存档槽，紧凑的二进制格式，原子写入，后台线程读写
+
+每个存档槽是 config.SAVES['dir'] 下的一个文件，用 file_io.atomic_write 原子写入，
+写到一半时崩溃也不会损坏已有的存档。
+文件读写在一个后台线程中进行（只有一个线程，所以同一个槽的写入按提交顺序完成），
+界面线程只负责编码，编码只需要几微秒。
+
+文件布局（整数均为小端序）：
+    文件头（16字节）：8字节魔数 b'SUDOKUSV'、u16 版本号、2字节保留、u32 数据部分的 CRC32
+    数据部分：u8 已检查次数、u8 最大检查次数、u8 难度名称字节数、u16 撤销步数、u16 重做步数、
+             难度名称（UTF-8）、谜题、答案、当前棋盘（各41字节，见 PackedBoard.pack）、
+             撤销步骤和重做步骤（每步一个 u16，编码见 history.py）
+一局游戏的存档通常不到200字节。
+
+9x9 以外的棋盘使用版本2：数据部分开头多一个 u8 棋盘边长，三个棋盘各按每格一字节保存，
+每个撤销/重做步骤为一个 u32。9x9 的存档仍然写成版本1。
+"""
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+import config
+from file_io import atomic_write
+from game_session import GameSession
+from history import History, digit_bits
+from packed_board import PackedBoard, PACKED_SIZE
+
+MAGIC = b'SUDOKUSV'
+VERSION = 1
+GRID_VERSION = 2  # 9x9 以外的棋盘
+SUFFIX = '.sav'
+_HEADER = struct.Struct('<8sH2xI')
+_FIELDS = struct.Struct('<BBBHH')
+_GRID_FIELDS = struct.Struct('<BBBBHH')
+
+
+def encode(session):
+    """把游戏会话编码为存档数据"""
+    difficulty = session.difficulty.encode('utf-8')
+    undo, redo = session.history.undo_stack, session.history.redo_stack
+    fields = (session.check_count, session.max_checks, len(difficulty), len(undo), len(redo))
+    boards = (session.board, session.solution, PackedBoard(session.tracker.cells))
+    if session.size == 9:
+        version = VERSION
+        body = b''.join((
+            _FIELDS.pack(*fields),
+            difficulty,
+            *(board.pack() for board in boards),
+            struct.pack(f'<{len(undo)}H{len(redo)}H', *undo, *redo),
+        ))
+    else:
+        version = GRID_VERSION
+        body = b''.join((
+            _GRID_FIELDS.pack(session.size, *fields),
+            difficulty,
+            *(bytes(board.cells) for board in boards),
+            struct.pack(f'<{len(undo)}I{len(redo)}I', *undo, *redo),
+        ))
+    return _HEADER.pack(MAGIC, version, zlib.crc32(body)) + body
+
+
+def decode(data):
+    """把存档数据解码为游戏会话
+    Raises:
+        ValueError: 数据不是存档、版本不支持或已损坏
+    """
+    if len(data) < _HEADER.size + _FIELDS.size:
+        raise ValueError("存档文件不完整")
+    magic, version, checksum = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("不是存档文件")
+    if version not in (VERSION, GRID_VERSION):
+        raise ValueError(f"不支持的存档版本: {version}")
+    body = memoryview(data)[_HEADER.size:]
+    if zlib.crc32(body) != checksum:
+        raise ValueError("存档文件已损坏")
+
+    if version == VERSION:
+        size = 9
+        check_count, max_checks, name_size, undo_count, redo_count = _FIELDS.unpack_from(body)
+        offset = _FIELDS.size
+    else:
+        size, check_count, max_checks, name_size, undo_count, redo_count = \
+            _GRID_FIELDS.unpack_from(body)
+        offset = _GRID_FIELDS.size
+    difficulty = bytes(body[offset:offset + name_size]).decode('utf-8')
+    offset += name_size
+    boards = []
+    board_size = PACKED_SIZE if version == VERSION else size * size
+    for _ in range(3):
+        raw = bytes(body[offset:offset + board_size])
+        boards.append(PackedBoard.from_packed(raw) if version == VERSION else PackedBoard(raw))
+        offset += board_size
+    moves = struct.unpack_from(f'<{undo_count + redo_count}{"H" if version == VERSION else "I"}',
+                               body, offset)
+
+    board, solution, cells = boards
+    session = GameSession(board, solution, difficulty, max_checks)
+    for pos in range(len(cells.cells)):
+        if not board.cells[pos] and cells.cells[pos]:
+            session.input(pos, cells.cells[pos], record=False)
+    session.check_count = check_count
+    session.history = History.from_dict({'undo': moves[:undo_count], 'redo': moves[undo_count:]},
+                                        bits=digit_bits(size))
+    return session
+
+
+class SaveStore:
+    """多个存档槽的读写
+
+    save()/load() 在调用线程中同步读写；save_async()/load_async() 在后台线程中读写，
+    返回 concurrent.futures.Future，界面线程可以轮询 done() 再取结果，不会被磁盘 I/O 阻塞。
+    """
+
+    def __init__(self, directory=None):
+        """
+        Args:
+            directory: 存档目录，默认为 config.SAVES['dir']
+        """
+        self.directory = directory or config.SAVES['dir']
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='save-io')
+
+    def path(self, slot):
+        """返回存档槽对应的文件路径"""
+        slot = str(slot)
+        if not slot or os.sep in slot or (os.altsep and os.altsep in slot) or slot.startswith('.'):
+            raise ValueError(f"无效的存档名称: {slot!r}")
+        return os.path.join(self.directory, slot + SUFFIX)
+
+    def slots(self):
+        """返回已有存档的名称，按修改时间从新到旧排列"""
+        if not os.path.isdir(self.directory):
+            return []
+        names = [name for name in os.listdir(self.directory) if name.endswith(SUFFIX)]
+        names.sort(key=lambda name: os.path.getmtime(os.path.join(self.directory, name)),
+                   reverse=True)
+        return [name[:-len(SUFFIX)] for name in names]
+
+    def exists(self, slot):
+        return os.path.exists(self.path(slot)) or self._legacy(slot) is not None
+
+    def _legacy(self, slot):
+        """默认存档槽没有存档时，返回旧版本的 JSON 存档路径（不存在时返回 None）"""
+        legacy = config.SAVES['legacy_path']
+        if str(slot) == config.SAVES['slots'][0] and legacy and os.path.exists(legacy):
+            return legacy
+        return None
+
+    def save(self, slot, session):
+        """保存游戏会话到存档槽"""
+        atomic_write(self.path(slot), encode(session))
+
+    def load(self, slot):
+        """从存档槽加载游戏会话，只恢复存档中的状态，不会生成新的谜题
+        Raises:
+            FileNotFoundError: 存档不存在
+            ValueError: 存档已损坏
+        """
+        path = self.path(slot)
+        if not os.path.exists(path):
+            legacy = self._legacy(slot)
+            if legacy is not None:
+                return GameSession.load(legacy)
+        with open(path, 'rb') as f:
+            return decode(f.read())
+
+    def save_async(self, slot, session):
+        """在后台线程中保存；会话在调用线程中立即编码，之后的修改不影响这次保存"""
+        path = self.path(slot)
+        return self.executor.submit(atomic_write, path, encode(session))
+
+    def load_async(self, slot):
+        """在后台线程中加载，Future 的结果为 GameSession"""
+        return self.executor.submit(self.load, slot)
+
+    def close(self):
+        """等待尚未完成的读写并停止后台线程"""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,130 @@
+"""完整棋盘种子库：预先生成一批完整棋盘，生成新棋盘时随机取一个并做随机对称变换
+
+对称变换（见 symmetry.py）保持棋盘有效，每个种子可以变换出约 1.2×10^12 个不同的棋盘，
+所以生成棋盘只需一次置换，不需要回溯填充，耗时稳定在几十微秒。
+种子库在第一次使用时用回溯填充建立并保存到文件，之后直接加载。
+本质不同的完整棋盘约有 5.5×10^9 个，随机填充的种子几乎不会互为对称变换，
+因此只按棋盘内容去重，不计算规范形式（完整棋盘的规范形式计算较慢）。
+
+文件布局（整数均为小端序）：
+    文件头（16字节）：8字节魔数 b'SUDOKUSD'、u16 版本号、2字节保留、u32 种子数
+    种子：每个种子41字节（见 PackedBoard.pack）
+"""
+import random
+import struct
+import threading
+import config
+from file_io import atomic_write, load_file
+from packed_board import PackedBoard, PACKED_SIZE
+from symmetry import apply_transform, random_transform
+
+MAGIC = b'SUDOKUSD'
+VERSION = 1
+_HEADER = struct.Struct('<8sH2xI')
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared():
+    """返回进程内共用的种子库（config.SEEDS['path']），各线程的算法实例共用一个种子库"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SeedLibrary(config.SEEDS['path'], config.SEEDS['size'])
+        return _shared
+
+
+def seeded(seed, fill, size=None):
+    """建立内容只由随机种子决定的种子库，只在内存中使用
+
+    批量生成指定随机种子时使用，结果不依赖本机是否已有种子库文件。
+    fill 使用全局随机数，建立期间临时设置种子，结束后恢复原来的随机数状态。
+    Args:
+        seed: 随机种子
+        fill: 同 SeedLibrary.ensure
+        size: 种子数，默认为 config.SEEDS['size']
+    """
+    library = SeedLibrary(None, config.SEEDS['size'] if size is None else size)
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        library.ensure(fill)
+    finally:
+        random.setstate(state)
+    return library
+
+
+class SeedLibrary:
+    """完整棋盘种子库
+
+    ensure() 建立种子库后 draw() 只读取种子列表，可以在多个线程中同时调用。
+    """
+
+    def __init__(self, path=None, size=1000, seeds=None):
+        """
+        Args:
+            path: 种子库文件，存在时从中加载，建立后保存到该文件；为 None 时只在内存中使用
+            size: 种子库的种子数
+            seeds: 已有的种子列表（每个种子是81字节的 bytes），提供时不再读取文件
+        """
+        self.path = path
+        self.size = size
+        self.seeds = list(seeds or ())
+        self.lock = threading.Lock()  # 保护建立种子库
+        self.loaded = seeds is not None
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def ready(self):
+        """种子库是否已经建立"""
+        return len(self.seeds) >= self.size
+
+    def ensure(self, fill):
+        """加载种子库，种子不足时用 fill 补充并保存
+        Args:
+            fill: 无参数的函数，每次返回一个新的完整棋盘（例如 SudokuAlgorithm.fill_new_board）
+        """
+        with self.lock:
+            if not self.loaded:
+                self.loaded = True
+                self.seeds = load_file(self.path, self.loads) or []
+            if self.ready():
+                return
+            seeds = list(self.seeds)
+            known = set(seeds)
+            while len(seeds) < self.size:
+                seed = bytes(PackedBoard.of(fill()).cells)
+                if seed not in known:
+                    known.add(seed)
+                    seeds.append(seed)
+            self.seeds = seeds
+            if self.path:
+                self.save(self.path)
+
+    def draw(self):
+        """随机取一个种子并做随机对称变换
+        Returns:
+            PackedBoard: 新的完整棋盘
+        """
+        return apply_transform(PackedBoard(random.choice(self.seeds)), random_transform())
+
+    def save(self, path):
+        """原子写入文件（见 file_io.atomic_write）"""
+        atomic_write(path, _HEADER.pack(MAGIC, VERSION, len(self.seeds))
+                     + b''.join(PackedBoard(seed).pack() for seed in self.seeds))
+
+    @staticmethod
+    def loads(data):
+        """解析 save() 写入的文件内容，返回种子列表（每个种子是81字节的 bytes）"""
+        magic, version, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("不是种子库文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的种子库版本: {version}")
+        data = data[_HEADER.size:]
+        if len(data) != count * PACKED_SIZE:
+            raise ValueError("种子库文件不完整")
+        return [bytes(PackedBoard.from_packed(data[offset:offset + PACKED_SIZE]).cells)
+                for offset in range(0, len(data), PACKED_SIZE)]
@@ -0,0 +1,193 @@
+"""求解结果缓存：按棋盘哈希记录解的个数和解，同一个棋盘不需要重复搜索
+
+键是棋盘格子（按行优先排列，每格一字节）的 16 字节 BLAKE2b 摘要，与棋盘用二维列表
+还是 PackedBoard 表示无关；不同大小的棋盘格子数不同，摘要也不同。
+每条记录保存一次搜索的结果：解的个数 count、搜索时的上限 limit 和找到的解（可以没有）。
+count < limit 时 count 就是解的确切个数，否则只知道解至少有 count 个。
+记录数超过容量时淘汰最久未使用的记录。
+
+文件布局（整数均为小端序）：
+    文件头（16字节）：8字节魔数 b'SUDOKUSC'、u16 版本号、2字节保留、u32 记录数
+    记录（从最久未使用到最近使用）：16字节键、u32 解的个数、u32 搜索上限、
+                                  u16 解的长度（没有解时为 0）、解（每格一字节）
+"""
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+import config
+from file_io import atomic_write, load_file
+from packed_board import PackedBoard
+
+MAGIC = b'SUDOKUSC'
+VERSION = 1
+_HEADER = struct.Struct('<8sH2xI')
+_RECORD = struct.Struct('<16sIIH')
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared():
+    """返回进程内共用的缓存（config.CACHE），各线程的算法实例共用一个缓存"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SolveCache(config.CACHE['capacity'], config.CACHE['path'])
+        return _shared
+
+
+def board_key(board):
+    """计算棋盘的缓存键
+    Args:
+        board: PackedBoard 或 n x n 二维列表
+    Returns:
+        bytes: 16 字节摘要
+    """
+    cells = board.cells if isinstance(board, PackedBoard) else bytes(
+        num for row in board for num in row)
+    return hashlib.blake2b(cells, digest_size=16).digest()
+
+
+class SolveCache:
+    """LRU 求解结果缓存，可选保存到文件
+
+    所有方法都加锁，可以在多个线程中同时使用。
+    hits/misses 统计查询的命中和未命中次数，evictions 统计因超过容量淘汰的记录数。
+    """
+
+    def __init__(self, capacity=10000, path=None):
+        """
+        Args:
+            capacity: 最多保存的记录数
+            path: 缓存文件路径，文件存在时从中加载；为 None 时只在内存中使用
+        """
+        self.capacity = capacity
+        self.path = path
+        self.entries = OrderedDict()  # 键 -> (count, limit, 解或 None)，最近使用的在末尾
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 文件中的记录从最久未使用到最近使用，超过容量时只保留最近使用的
+        self.entries.update(load_file(path, _parse) or ())
+        while len(self.entries) > capacity:
+            self.entries.popitem(last=False)
+
+    def get_count(self, key, limit):
+        """查询解的个数
+        Args:
+            key: board_key() 的返回值
+            limit: 解的个数上限，与 SudokuAlgorithm.count_solutions 相同
+        Returns:
+            int: 解的个数，最多为 limit；缓存中的记录不足以回答时返回 None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                count, searched = entry[0], entry[1]
+                if count < searched or count >= limit:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return min(count, limit)
+            self.misses += 1
+            return None
+
+    def get_solution(self, key):
+        """查询棋盘的解
+        Returns:
+            bytes: 解的格子（每格一字节）；已知无解时返回 b''；
+                   缓存中没有解也不知道是否无解时返回 None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                count, searched, solution = entry
+                if solution is not None or (count == 0 and searched > 0):
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return solution or b''
+            self.misses += 1
+            return None
+
+    def put(self, key, count, limit, solution=None):
+        """记录一次搜索的结果，与已有的记录合并，保留信息更多的一方
+        Args:
+            key: board_key() 的返回值
+            count: 找到的解的个数（最多为 limit）
+            limit: 搜索时的解的个数上限
+            solution: 找到的一个解（每格一字节的序列），没有时为 None
+        """
+        if solution is not None:
+            solution = bytes(solution)
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                old_count, old_limit, old_solution = entry
+                # 确切的个数优先，其次是更大的下限
+                if old_count < old_limit or (count >= limit and old_count > count):
+                    count, limit = old_count, old_limit
+                if solution is None:
+                    solution = old_solution
+            self.entries[key] = (count, limit, solution)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """清空所有记录和统计"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def snapshot(self):
+        """返回统计的字典副本，便于导出"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def save(self):
+        """原子写入 path（见 file_io.atomic_write），没有指定路径时什么也不做"""
+        if not self.path:
+            return
+        with self.lock:
+            records = list(self.entries.items())
+        parts = [_HEADER.pack(MAGIC, VERSION, len(records))]
+        for key, (count, limit, solution) in records:
+            solution = solution or b''
+            parts.append(_RECORD.pack(key, count, limit, len(solution)))
+            parts.append(solution)
+        atomic_write(self.path, b''.join(parts))
+
+
+def _parse(data):
+    """解析 SolveCache.save() 写入的文件内容，返回 [(键, (count, limit, 解或 None)), ...]"""
+    magic, version, record_count = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("不是求解缓存文件")
+    if version != VERSION:
+        raise ValueError(f"不支持的求解缓存版本: {version}")
+    records = []
+    offset = _HEADER.size
+    for _ in range(record_count):
+        key, count, limit, length = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        solution = data[offset:offset + length] if length else None
+        if solution is not None and len(solution) != length:
+            raise ValueError("求解缓存文件不完整")
+        offset += length
+        records.append((key, (count, limit, solution)))
+    return records
@@ -0,0 +1,146 @@
+"""求解器：公共接口与迭代回溯求解器，供生成、填充和唯一解验证共用"""
+import random
+from board_state import FULL_MASK, MASK_DIGITS, POPCOUNT
+from propagation import CONTRADICTION
+
+
+def random_digit(mask):
+    """随机返回掩码中的一个数字（用于超过9个数字、没有查找表的掩码）"""
+    for _ in range(random.randrange(mask.bit_count())):
+        mask &= mask - 1
+    return (mask & -mask).bit_length()
+
+
+class Solver:
+    """求解器公共接口
+
+    所有求解引擎都在位掩码棋盘状态（board_state.BoardState）上原地搜索，
+    因此 SudokuAlgorithm 可以通过配置在不同引擎之间切换。
+    """
+    __slots__ = ('branches', 'backtracks', 'propagated')
+
+    def __init__(self):
+        self.branches = 0    # 最近一次搜索的分支次数
+        self.backtracks = 0  # 最近一次搜索中某层候选全部失败、退回上一层的次数
+        self.propagated = 0  # 最近一次搜索中由推理直接填入的格子数
+
+    def search(self, state, limit=1, randomize=False, keep=False):
+        """搜索数独的解
+        Args:
+            state: 位掩码棋盘状态，搜索在其上原地进行
+            limit: 找到多少个解后停止
+            randomize: 是否按随机顺序尝试候选数（用于生成棋盘）
+            keep: 为 True 且找到 limit 个解时，state 停留在最后一个解上；
+                  否则搜索结束后 state 恢复为搜索前的状态
+        Returns:
+            int: 找到的解的个数，最多为 limit
+        """
+        raise NotImplementedError
+
+
+class BacktrackingSolver(Solver):
+    """基于位掩码棋盘状态的迭代回溯求解器
+
+    每一层搜索在预先分配的数组中记录（格子位置, 尚未尝试的候选数掩码,
+    进入本层时已填格子栈的高度），搜索过程中不创建任何列表，
+    也不受 Python 递归深度限制。
+    可以传入一个约束传播阶段（propagation.Propagator），在每次分支前运行，
+    传播填入的数字和分支填入的数字记录在同一个栈中，回溯时一起撤销。
+    求解器只通过状态的接口访问棋盘，因此同样适用于其他大小的棋盘
+    （grid_state.GridState 和 GridPropagator），只需按格子数分配数组。
+    同一个实例的数组会被反复使用，因此一个实例不能同时在多个线程中使用。
+    """
+    __slots__ = ('propagator', 'branch_limit', 'trail_pos', 'trail_mask', 'trail_mark', 'placed')
+
+    def __init__(self, propagator=None, cells=81, branch_limit=None):
+        """
+        Args:
+            propagator: 可选的约束传播阶段，为 None 时只做最小剩余值回溯
+            cells: 棋盘的格子数
+            branch_limit: 每次搜索最多的分支次数，达到后放弃搜索（结果不完整），
+                          只用于随机填充：大棋盘的随机填充偶尔会陷入很深的回溯，放弃后重新开始更快
+        """
+        super().__init__()
+        self.propagator = propagator
+        self.branch_limit = branch_limit
+        # 最多 cells 个空格，每层一个分支格子
+        self.trail_pos = [0] * cells
+        self.trail_mask = [0] * cells
+        self.trail_mark = [0] * cells
+        self.placed = [0] * cells  # 已填格子栈（分支和传播填入的格子）
+
+    def _next(self, state, empties, top):
+        """运行传播（如果有）并选出下一个分支位置，返回 (栈顶, 位置, 候选数掩码)"""
+        if self.propagator is None:
+            pos, mask = state.find_empty(empties)
+            return top, pos, mask
+        return self.propagator.propagate(state, empties, self.placed, top)
+
+    def search(self, state, limit=1, randomize=False, keep=False):
+        """搜索数独的解，参数见 Solver.search；propagated 为传播填入的格子数，即省掉的分支点数"""
+        self.branches = 0
+        self.backtracks = 0
+        self.propagated = 0
+        if not state.valid:
+            return 0
+        propagator = self.propagator
+        assigned = propagator.assigned if propagator else 0
+        empties = state.empty_positions()
+        trail_pos, trail_mask, trail_mark = self.trail_pos, self.trail_mask, self.trail_mark
+        placed = self.placed
+        branch_limit = self.branch_limit or -1
+        count = branches = backtracks = 0  # 用局部变量计数，搜索结束后再写回
+
+        top, pos, mask = self._next(state, empties, 0)
+        if pos == -1:
+            count = 1
+        elif pos >= 0:
+            trail_pos[0], trail_mask[0], trail_mark[0] = pos, mask, top
+            depth = 0
+            while depth >= 0:
+                # 撤销本层上一次尝试填入的所有格子
+                mark = trail_mark[depth]
+                while top > mark:
+                    top -= 1
+                    state.unplace(placed[top])
+                mask = trail_mask[depth]
+                if not mask:  # 本层候选数已用完，回溯
+                    depth -= 1
+                    backtracks += 1
+                    continue
+
+                if not randomize:
+                    num = (mask & -mask).bit_length()  # 最小的候选数
+                elif mask <= FULL_MASK:
+                    num = MASK_DIGITS[mask][random.randrange(POPCOUNT[mask])]
+                else:
+                    num = random_digit(mask)
+                trail_mask[depth] = mask & ~(1 << (num - 1))
+                pos = trail_pos[depth]
+                state.place(pos, num)
+                placed[top] = pos
+                top += 1
+                branches += 1
+                if branches == branch_limit:
+                    break
+
+                top, pos, mask = self._next(state, empties, top)
+                if pos >= 0:  # 还有空格，进入下一层
+                    depth += 1
+                    trail_pos[depth], trail_mask[depth], trail_mark[depth] = pos, mask, top
+                    continue
+                if pos == CONTRADICTION:
+                    continue
+
+                count += 1
+                if count >= limit:
+                    break
+
+        self.branches, self.backtracks = branches, backtracks
+        if propagator:
+            self.propagated = propagator.assigned - assigned
+        if count < limit or not keep:
+            while top > 0:
+                top -= 1
+                state.unplace(placed[top])
+        return count
@@ -1,31 +1,141 @@
+import logging
 import random
+import time
 import config
+from board_state import BoardState, MASK_DIGITS
+from geometry import geometry, mask_digits
+from grid_state import GridState, GridPropagator
+from solver import BacktrackingSolver
+from propagation import make_propagator
+from dlx import DLXSolver
+from packed_board import copy_board
+from instrumentation import Instrumentation
+from grader import Grader
+import seed_library
+import solve_cache
+from solve_cache import board_key
+
+# 默认不输出任何日志，使用方通过 logging 配置开启（例如 logging.basicConfig(level=logging.DEBUG)）
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 class SudokuAlgorithm:
+    """数独生成与求解算法
+
+    所有接受棋盘的方法既可以使用 n x n 二维列表，也可以使用 packed_board.PackedBoard。
+    棋盘大小由宫大小 box 决定（边长 n = box * box，默认 9x9）：9x9 使用按固定大小展开的
+    位掩码状态和可配置的求解引擎；其他大小使用 grid_state 中的通用位掩码状态，
+    回溯求解时在分支前做唯一候选数和隐性唯一数传播。难度评分只支持 9x9。
+    self.stats（instrumentation.Instrumentation）累计搜索节点数、回溯次数、
+    唯一解检查次数、重试次数和各阶段耗时，可以注册回调导出这些开销。
+    self.cache（solve_cache.SolveCache）按棋盘哈希记录解的个数和解，count_solutions、
+    is_unique_solution 和 solve 先查缓存，命中时不搜索；设为 None 时每次都重新搜索。
+    """
+    def __init__(self, engine=None, box=3):
+        """
+        Args:
+            engine: 求解引擎，'backtracking' 或 'dlx'，默认使用 config.GAME['solver']；
+                    只用于 9x9，其他大小总是使用通用的回溯引擎
+            box: 宫的边长（2-5），棋盘边长为 box * box
+        """
+        self.geometry = geometry(box)
+        # 求解器内部数组在多次搜索间复用
+        engine = engine or config.GAME['solver']
+        if engine not in ('backtracking', 'dlx'):
+            raise ValueError(f"未知的求解引擎: {engine}")
+        if box != 3:
+            cells = self.geometry.cells
+            # 随机填充设置分支上限，陷入很深的回溯时放弃并重新开始
+            self.fill_solver = BacktrackingSolver(GridPropagator(self.geometry), cells,
+                                                  config.GAME['fill_branch_limit'])
+            self.check_solver = self.solve_solver = BacktrackingSolver(
+                GridPropagator(self.geometry), cells)
+            self.mask_digits = mask_digits
+        elif engine == 'dlx':
+            # 舞蹈链的覆盖矩阵较大，三个场景共用一个实例
+            self.fill_solver = self.check_solver = self.solve_solver = DLXSolver()
+        elif engine == 'backtracking':
+            # 各场景的约束传播技巧见 config.GAME['propagation']
+            propagation = config.GAME['propagation']
+            self.fill_solver = BacktrackingSolver(make_propagator(propagation['fill']))
+            self.check_solver = BacktrackingSolver(make_propagator(propagation['check']))
+            self.solve_solver = BacktrackingSolver(make_propagator(propagation['solve']))
+        if box == 3:
+            self.mask_digits = MASK_DIGITS.__getitem__
+        self.restarts = 0  # 最近一次 generate_board 的重试次数
+        self.stats = Instrumentation()
+        self.grader = Grader()  # 按技巧评分，见 config.GRADING
+        # 9x9 完整棋盘种子库，所有实例共用，见 config.SEEDS
+        self.seeds = seed_library.shared() if config.SEEDS['enabled'] and box == 3 else None
+        # 求解结果缓存，所有实例共用，见 config.CACHE
+        self.cache = solve_cache.shared() if config.CACHE['enabled'] else None
+
+    def _state(self, board):
+        """为棋盘创建位掩码状态（独立副本，不会修改原棋盘）"""
+        if self.geometry.box == 3:
+            return BoardState(board)
+        return GridState(board, self.geometry)
+
+    def _search(self, solver, state, limit=1, randomize=False, keep=False):
+        """调用求解器搜索，并把节点数和回溯次数累加到 self.stats"""
+        count = solver.search(state, limit, randomize, keep)
+        self.stats.record_search(solver)
+        return count
+
     def generate_board(self):
-        """生成一个完整的数独棋盘"""
-        print("开始生成数独棋盘...")
-        board = [[0 for _ in range(9)] for _ in range(9)]
+        """生成一个完整的数独棋盘
         
-        # 优化1：先填充对角线上的3个3x3方格
-        # 这些方格之间互不影响（不共享行列），可以独立填充
-        # 这样可以提供一个良好的初始状态，加快后续填充
-        for i in range(0, 9, 3):
-            nums = list(range(1, 10))
-            random.shuffle(nums)  # 随机打乱1-9的顺序
-            for row in range(3):
-                for col in range(3):
-                    # 将打乱后的数字按顺序填入3x3方格
-                    board[i + row][i + col] = nums[row * 3 + col]
+        使用种子库时从中随机取一个完整棋盘并做随机对称变换，不需要回溯填充；
+        种子库在第一次使用时由 fill_new_board() 建立。不使用种子库时（以及 9x9 以外的棋盘）
+        直接调用 fill_new_board()。
+        """
+        if self.seeds is None:
+            return self.fill_new_board()
+        if not self.seeds.ready():
+            self.seeds.ensure(self.fill_new_board)
+        start = self.stats.start()
+        board = self.seeds.draw().to_rows()
+        self.restarts = 0
+        self.stats.finish('generate', start)
+        return board
+
+    def fill_new_board(self):
+        """用回溯填充生成一个完整的数独棋盘
         
-        print("开始填充剩余格子...")
-        if self.fill_board(board):
-            print("数独棋盘生成成功！")
-            return board
-        else:
+        填充失败时重新生成，最多重试 config.GAME['max_restarts'] 次，
+        实际重试次数记录在 self.restarts 中。
+        """
+        stats = self.stats
+        start = stats.start()
+        logger.debug("开始生成数独棋盘")
+        max_restarts = config.GAME['max_restarts']
+        n, box = self.geometry.size, self.geometry.box
+        for attempt in range(max_restarts + 1):
+            board = self.geometry.empty_board()
+            
+            # 优化1：先填充对角线上的宫
+            # 这些宫之间互不影响（不共享行列），可以独立填充
+            # 这样可以提供一个良好的初始状态，加快后续填充
+            for i in range(0, n, box):
+                nums = list(range(1, n + 1))
+                random.shuffle(nums)  # 随机打乱1-n的顺序
+                for row in range(box):
+                    for col in range(box):
+                        # 将打乱后的数字按顺序填入宫
+                        board[i + row][i + col] = nums[row * box + col]
+            
+            if self.fill_board(board):
+                self.restarts = attempt
+                stats.restarts += attempt
+                stats.finish('generate', start)
+                logger.info("数独棋盘生成成功，重试 %d 次", attempt)
+                return board
             # 如果填充失败，重新生成整个棋盘
-            print("生成失败，重试中...")
-            return self.generate_board()
+            logger.debug("生成失败，重试中")
+        self.restarts = max_restarts
+        stats.restarts += max_restarts
+        stats.finish('generate', start)
+        raise RuntimeError(f"数独棋盘生成失败，已重试 {max_restarts} 次")
 
     def fill_board(self, board):
         """使用优化的回溯算法填充数独棋盘
@@ -33,31 +143,17 @@ class SudokuAlgorithm:
         优化策略：
         1. 优先填充可能性最少的位置
         2. 提前计算有效数字，减少无效尝试
+        3. 用行/列/宫位掩码维护状态，候选数查询只需几次位运算
+        4. 迭代搜索，按随机顺序尝试候选数，增加生成棋盘的随机性
         """
-        # 找到最优的空位置（可能性最少的位置）
-        empty = self.find_empty(board)
-        if not empty:
-            return True
-        
-        row, col = empty
-        nums = list(range(1, 10))
-        random.shuffle(nums)  # 随机打乱数字顺序，增加生成棋盘的随机性
-        
-        # 优化2：提前计算当前位置所有可能的有效数字
-        # 避免在回溯过程中重复验证无效数字
-        possible_nums = []
-        for num in nums:
-            if self.is_valid_for_check(board, row, col, num):
-                possible_nums.append(num)
-        
-        # 只尝试可能的有效数字
-        for num in possible_nums:
-            board[row][col] = num
-            if self.fill_board(board):
-                return True
-            board[row][col] = 0
-        
-        return False
+        start = self.stats.start()
+        state = self._state(board)
+        filled = self._search(self.fill_solver, state, 1, randomize=True, keep=True)
+        if filled:
+            # 填充成功后写回原棋盘
+            state.write_to(board)
+        self.stats.finish('fill', start)
+        return bool(filled)
 
     def find_empty(self, board):
         """查找最优的空位置
@@ -67,101 +163,355 @@ class SudokuAlgorithm:
         1. 可能性少的位置填错的概率更低
         2. 即使填错，也能更快地发现错误并回溯
         """
-        min_possibilities = 10  # 初始化为一个大于9的数
-        best_position = None
-        
-        for i in range(9):
-            for j in range(9):
-                if board[i][j] == 0:
-                    # 计算当前空位置可以填入的有效数字数量
-                    count = 0
-                    for num in range(1, 10):
-                        if self.is_valid_for_check(board, i, j, num):
-                            count += 1
-                    # 更新最优位置
-                    if count < min_possibilities:
-                        min_possibilities = count
-                        best_position = (i, j)
-                        # 如果找到只有一种可能的位置，立即返回
-                        # 这是最优的情况，不需要继续搜索
-                        if count == 1:
-                            return best_position
-        
-        return best_position
+        pos, _ = self._state(board).find_empty()
+        if pos < 0:
+            return None
+        return divmod(pos, self.geometry.size)
 
     def remove_numbers(self, board, difficulty):
-        """根据难度移除数字创建数独谜题"""
-        print(f"开始移除数字，难度：{difficulty}")
-        # 根据难度设置要移除的数字数量
+        """根据难度移除数字创建数独谜题
+        
+        board 必须是完整棋盘或只有唯一解的谜题。按难度移除
+        config.GAME['difficulties'][difficulty] 个数字（保持唯一解时），挖空过程见 carve()。
+        其他大小的棋盘按格子数等比例换算移除的数量。
+        """
         cells_to_remove = config.GAME['difficulties'][difficulty]  # 根据难度设置要移除的数字数量
+        if self.geometry.cells != 81:
+            cells_to_remove = round(cells_to_remove * self.geometry.cells / 81)
+        logger.debug("开始移除数字，难度：%s，计划移除 %d 个数字", difficulty, cells_to_remove)
+        clues = sum(1 for row in board for num in row if num)
+        removed_count = clues - self.carve(board, clues - cells_to_remove)
+        logger.info("完成数字移除，难度：%s，共移除 %d 个数字", difficulty, removed_count)
+
+    def carve(self, board, target_clues, budget=None, symmetric=None):
+        """挖空到指定的提示数，返回时间预算内找到的提示数最少的谜题
         
-        print(f"计划移除 {cells_to_remove} 个数字")
-        positions = [(i, j) for i in range(9) for j in range(9)]
+        board 必须是完整棋盘或只有唯一解的谜题。按随机顺序成组移除数字：
+        整组移除后只做一次最多找2个解的搜索，仍然唯一解就全部保留移除，
+        否则把这组二分后分别重试，直到单个格子时改用只查找其他数字的检查。
+        成功后组的大小加倍，失败后减半，所以容易移除的早期步骤只需要很少的搜索，
+        接近极限时退化为逐格检查。整个过程共用一个位掩码状态，失败的格子不再重试。
+        一遍挖空后仍未达到目标且还有时间时，换一个随机顺序从头再挖，保留提示数最少的结果。
+        Args:
+            board: 数独谜题，原地修改
+            target_clues: 目标提示数，达到后立即停止（不会挖到少于该数）
+            budget: 时间预算（秒），为 None 时只挖一遍
+            symmetric: 是否成对移除中心对称的格子，默认为 config.CARVING['symmetric']
+        Returns:
+            int: 结果的提示数
+        """
+        start = self.stats.start()
+        symmetric = config.CARVING['symmetric'] if symmetric is None else symmetric
+        deadline = None if budget is None else time.perf_counter() + budget
+        geometry = self.geometry
+        original = [num for row in board for num in row]
+        best, best_clues = None, geometry.cells + 1
+        passes = 0
+        while True:
+            state = self._state(geometry.to_rows(original))
+            clues = self._carve_pass(state, target_clues, symmetric, deadline)
+            passes += 1
+            if clues < best_clues:
+                best, best_clues = list(state.cells), clues
+            if best_clues <= target_clues or deadline is None or time.perf_counter() >= deadline:
+                break
+        n = geometry.size
+        for pos in range(geometry.cells):
+            board[pos // n][pos % n] = best[pos]
+        if self.cache is not None and all(original):
+            # 从完整棋盘挖出的谜题唯一解就是原棋盘，记下来以后检查和求解时不用再搜索
+            self.cache.put(board_key(board), 1, 2, original)
+        self.stats.finish('remove', start)
+        logger.debug("挖空结束，%d 遍，提示数 %d，目标 %d", passes, best_clues, target_clues)
+        return best_clues
+
+    def _carve_pass(self, state, target_clues, symmetric, deadline):
+        """按一个随机顺序挖空一遍，返回剩余的提示数"""
+        cells = state.cells
+        last = len(cells) - 1
+        positions = [pos for pos in range(len(cells)) if cells[pos]]
         random.shuffle(positions)
-        
-        removed_count = 0
-        for i in range(cells_to_remove):
-            row, col = positions[i]
-            temp = board[row][col]
-            board[row][col] = 0
-            
-            print(f"尝试移除位置 ({row}, {col}) 的数字 {temp}")
-            # 如果移除后导致多解，则恢复该数字
-            if not self.is_unique_solution(board):
-                print(f"移除后会导致多解，恢复数字 {temp}")
-                board[row][col] = temp
+        # 挖空的单位：单个格子，或中心对称的一对格子
+        groups = []
+        taken = set()
+        for pos in positions:
+            if pos in taken:
+                continue
+            mirror = last - pos
+            if symmetric and mirror != pos and cells[mirror]:
+                taken.add(mirror)
+                groups.append((pos, mirror))
             else:
-                removed_count += 1
-                print(f"成功移除数字，当前已移除 {removed_count} 个数字")
-        
-        print(f"完成数字移除，共移除 {removed_count} 个数字")
+                groups.append((pos,))
+        clues = len(positions)
+        size = max_size = config.CARVING['group_size']
+        index = 0
+        while index < len(groups) and clues > target_clues:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            batch = []
+            count = 0
+            while index < len(groups) and len(batch) < size:
+                group = groups[index]
+                index += 1
+                if clues - count - len(group) >= target_clues:  # 不挖到少于目标
+                    batch.append(group)
+                    count += len(group)
+            removed = self._remove_groups(state, batch)
+            clues -= removed
+            size = min(size * 2, max_size) if removed == count else max(1, size // 2)
+        return clues
+
+    def _remove_groups(self, state, groups):
+        """尝试移除若干组格子，多解时二分重试，返回实际移除的格子数"""
+        if not groups:
+            return 0
+        cells = state.cells
+        removed = [(pos, cells[pos]) for group in groups for pos in group]
+        for pos, _ in removed:
+            state.unplace(pos)
+        if len(groups) == 1:
+            unique = not self._group_has_other_solution(state, removed)
+        else:
+            self.stats.checks += 1
+            unique = self._search(self.check_solver, state, 2) == 1
+        if unique:
+            return len(removed)
+        for pos, num in removed:
+            state.place(pos, num)
+        if len(groups) == 1:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("移除格子 %s 会导致多解，已恢复", [pos for pos, _ in removed])
+            return 0
+        half = len(groups) // 2
+        return self._remove_groups(state, groups[:half]) + self._remove_groups(state, groups[half:])
+
+    def _group_has_other_solution(self, state, removed):
+        """removed 中的格子都已移除时，查找与原数字不同的解
+
+        依次检查第 i 个格子不等于原数字、而前 i-1 个格子等于原数字的解，
+        每一步都只需要查找其他数字，并可以使用隐性唯一数的快速判断。
+        """
+        placed = 0
+        found = False
+        for pos, num in removed:
+            if self._has_other_solution(state, pos, num):
+                found = True
+                break
+            state.place(pos, num)
+            placed += 1
+        for pos, _ in removed[:placed]:
+            state.unplace(pos)
+        return found
+
+    def rate(self, board):
+        """按解题技巧评估谜题难度，技巧和权重见 config.GRADING
+        Returns:
+            int: 评分，越高越难；谜题有矛盾时返回 -1。用到的技巧见 self.grader.report()
+        Raises:
+            ValueError: 棋盘不是 9x9
+        """
+        self._require_grading()
+        start = self.stats.start()
+        score = self.grader.grade(board)
+        self.stats.finish('rate', start)
+        return score
+
+    def carve_to_rating(self, board, low, high):
+        """继续挖空，直到评分落在 [low, high] 区间内
+
+        board 必须是完整棋盘或只有唯一解的谜题（例如 remove_numbers 的结果）。
+        按随机顺序尝试移除剩余的数字：导致多解或使评分超过 high 的移除会被撤销，
+        评分达到 low 后立即停止。
+        Args:
+            board: 数独谜题，原地修改
+            low: 评分下限
+            high: 评分上限
+        Returns:
+            int: 最终评分；所有数字都尝试过仍未落在区间内时返回 None
+        """
+        self._require_grading()
+        start = self.stats.start()
+        grader = self.grader
+        state = BoardState(board)  # 挖空和评分共用一个位掩码状态
+        score = grader.grade(state)
+        positions = [pos for pos in range(81) if state.cells[pos]]
+        random.shuffle(positions)
+        for pos in positions:
+            if score >= low:
+                break
+            num = state.cells[pos]
+            state.unplace(pos)
+            if self._has_other_solution(state, pos, num):
+                state.place(pos, num)
+                continue
+            rated = grader.grade(state)
+            if rated > high:
+                state.place(pos, num)
+                continue
+            row, col = divmod(pos, 9)
+            board[row][col] = 0
+            score = rated
+        self.stats.finish('carve', start)
+        logger.debug("定向挖空结束，评分 %d，目标区间 [%d, %d]", score, low, high)
+        return score if low <= score <= high else None
+
+    def _require_grading(self):
+        """评分的推理技巧按 9x9 的单元结构实现，其他大小的棋盘不能评分"""
+        if self.geometry.box != 3:
+            raise ValueError(f"难度评分只支持 9x9 棋盘，当前为 {self.geometry.size}x{self.geometry.size}")
+
+    def generate_rated(self, difficulty, band=None):
+        """生成评分落在难度对应区间内的谜题
+
+        先按 config.GAME['difficulties'] 挖空，再用 carve_to_rating 继续挖空直到评分达标；
+        最多尝试 config.GRADING['max_attempts'] 个完整棋盘。
+        Args:
+            difficulty: 难度名称
+            band: 评分区间 (下限, 上限)，默认为 config.GRADING['bands'][difficulty]
+        Returns:
+            tuple: (谜题, 完整答案, 评分)，谜题和答案为 9x9 二维列表
+        """
+        self._require_grading()
+        low, high = band or config.GRADING['bands'][difficulty]
+        max_attempts = config.GRADING['max_attempts']
+        for _ in range(max_attempts):
+            board = self.generate_board()
+            solution = copy_board(board)
+            self.remove_numbers(board, difficulty)
+            score = self.carve_to_rating(board, low, high)
+            if score is not None:
+                return board, solution, score
+        raise RuntimeError(f"尝试 {max_attempts} 个棋盘后仍未生成评分在 [{low}, {high}] 内的谜题")
 
     def is_unique_solution(self, board):
         """检查数独谜题是否有唯一解"""
-        temp_board = [row[:] for row in board]
-        count = [0]  # 使用列表存储计数，以便在内部函数中修改
+        return self.count_solutions(board, 2) == 1
 
-        def solve():
-            if count[0] > 1:  # 如果已经找到多个解，直接返回
-                return True
-            
-            # 找到一个空位置
-            empty = self.find_empty(temp_board)
-            if not empty:
-                count[0] += 1
-                return count[0] == 1
-
-            row, col = empty
-            for num in range(1, 10):
-                if self.is_valid_for_check(temp_board, row, col, num):
-                    temp_board[row][col] = num
-                    solve()
-                    if count[0] > 1:
-                        return True
-                    temp_board[row][col] = 0
+    def count_solutions(self, board, limit=2):
+        """统计数独谜题的解的个数，找到 limit 个解后立即停止
+        Args:
+            board: 数独谜题，0 表示空格（不会被修改）
+            limit: 解的个数上限
+        Returns:
+            int: 解的个数，最多为 limit
+        """
+        start = self.stats.start()
+        cache = self.cache
+        if cache is not None:
+            key = board_key(board)
+            count = cache.get_count(key, limit)
+            if count is not None:
+                self.stats.finish('check', start)
+                return count
+        state = self._state(board)  # 位掩码状态是独立副本，不会修改原棋盘
+        self.stats.checks += 1
+        count = self._search(self.check_solver, state, limit)
+        if cache is not None:
+            cache.put(key, count, limit)
+        self.stats.finish('check', start)
+        return count
+
+    def has_other_solution(self, board, row, col, num):
+        """检查除了在 (row, col) 填 num 之外，谜题是否还有别的解
+        Args:
+            board: 数独谜题（不会被修改），(row, col) 处的值会被忽略
+            row: 行索引 (0 到 n-1)
+            col: 列索引 (0 到 n-1)
+            num: 已知可以得到一个解的数字 (1-n)
+        Returns:
+            bool: 找到一个该格不是 num 的解时返回 True
+        """
+        start = self.stats.start()
+        temp_board = copy_board(board)
+        temp_board[row][col] = 0
+        state = self._state(temp_board)
+        found = state.valid and self._has_other_solution(
+            state, row * self.geometry.size + col, num)
+        self.stats.finish('check', start)
+        return found
+
+    def _has_other_solution(self, state, pos, num):
+        """在位掩码状态上查找该空格不填 num 的解，找到一个即返回"""
+        self.stats.checks += 1
+        mask = state.candidates(pos) & ~self.geometry.bit[num]
+        if not mask:
+            return False
+        if self._is_forced(state, pos, num):
             return False
+        for other in self.mask_digits(mask):
+            state.place(pos, other)
+            found = self._search(self.check_solver, state, 1)
+            state.unplace(pos)
+            if found:
+                return True
+        return False
+
+    def _is_forced(self, state, pos, num):
+        """num 在 pos 所在的某个单元中只能填在 pos（隐性唯一数）时返回 True
+
+        此时任何解中 pos 都只能是 num，不需要搜索就知道不存在 pos 不为 num 的解。
+        """
+        geometry = self.geometry
+        bit = geometry.bit[num]
+        cells, candidates, units = state.cells, state.candidates, geometry.units
+        for unit in geometry.units_of[pos]:
+            for other in units[unit]:
+                if other != pos and not cells[other] and candidates(other) & bit:
+                    break
+            else:
+                return True
+        return False
 
-        solve()
-        return count[0] == 1
+    def solve(self, board):
+        """求解数独谜题
+        
+        先用约束传播填入所有能推理出的数字，只在推理不下去时才分支。
+        求解后 self.solve_solver.propagated 为传播填入的格子数（即省掉的分支点数），
+        self.solve_solver.branches 为实际分支次数。
+        Args:
+            board: 数独谜题，0 表示空格（不会被修改）
+        Returns:
+            list: 解出的 n x n 棋盘；无解时返回 None
+        """
+        start = self.stats.start()
+        cache = self.cache
+        if cache is not None:
+            key = board_key(board)
+            solution = cache.get_solution(key)
+            if solution is not None:
+                self.stats.finish('solve', start)
+                return self.geometry.to_rows(solution) if solution else None
+        state = self._state(board)
+        solved = self._search(self.solve_solver, state, 1, keep=True)
+        if cache is not None:
+            cache.put(key, solved, 1, state.cells if solved else None)
+        self.stats.finish('solve', start)
+        return state.to_board() if solved else None
 
     def is_valid_for_check(self, board, row, col, num):
         """检查数字在指定位置是否有效
         Args:
             board: 当前数独棋盘状态
-            row: 行索引 (0-8)
-            col: 列索引 (0-8)
-            num: 要检查的数字 (1-9)
+            row: 行索引 (0 到 n-1)
+            col: 列索引 (0 到 n-1)
+            num: 要检查的数字 (1-n)
         Returns:
             bool: 数字是否有效
         """
-        # 检查同一行和同一列
-        for i in range(9):
-            if board[row][i] == num or board[i][col] == num:
+        n = self.geometry.size
+        # 与原来逐行、列、宫扫描一致，该格本身已经是 num 时也视为无效
+        if board[row][col] == num:
+            return False
+        # 其余只检查相关格子（同行、同列、同宫），不重复检查
+        for other in self.geometry.peers[row * n + col]:
+            if board[other // n][other % n] == num:
                 return False
-        # 检查3x3小方格
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(start_row, start_row + 3):
-            for j in range(start_col, start_col + 3):
-                if board[i][j] == num:
-                    return False
-        return True
\ No newline at end of file
+        return True
+
+
+if __name__ == '__main__':
+    # 批量生成等命令行功能，见 batch.py
+    import sys
+    from batch import main
+    sys.exit(main())
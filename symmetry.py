@@ -0,0 +1,223 @@
+"""对称变换：把一个谜题变换成许多等价的新谜题
+
+数字重新编号、三个行带（列带）之间的置换、带内的行（列）置换以及转置
+都不会改变数独的约束结构，变换后的谜题仍然有且只有一个解（答案做相同的变换），
+因此不需要重新验证唯一性，也不会改变解题需要的技巧。
+一个谜题共有 9! × 6^8 × 2 ≈ 1.2×10^12 种变换。
+"""
+import itertools
+import random
+from packed_board import PackedBoard
+
+
+def _line_order():
+    """随机打乱三个带的顺序和每个带内三条线的顺序，返回新的线序（9个原下标）"""
+    return [band * 3 + line for band in random.sample(range(3), 3)
+            for line in random.sample(range(3), 3)]
+
+
+def random_transform():
+    """随机生成一个对称变换
+    Returns:
+        tuple: (格子映射, 数字转换表)。变换后第 pos 格的值为
+               数字转换表[原棋盘第 格子映射[pos] 格的值]，数字转换表可直接用于 bytes.translate
+    """
+    rows, cols = _line_order(), _line_order()
+    if random.getrandbits(1):  # 转置
+        cell_map = [rows[col] * 9 + cols[row] for row in range(9) for col in range(9)]
+    else:
+        cell_map = [rows[row] * 9 + cols[col] for row in range(9) for col in range(9)]
+    digits = random.sample(range(1, 10), 9)
+    return cell_map, bytes([0] + digits) + bytes(246)
+
+
+def apply_transform(board, transform):
+    """对棋盘应用对称变换
+    Args:
+        board: PackedBoard 或 9x9 二维列表（不会被修改）
+        transform: random_transform() 的返回值
+    Returns:
+        PackedBoard: 变换后的新棋盘
+    """
+    cell_map, digit_table = transform
+    cells = board.cells if isinstance(board, PackedBoard) else PackedBoard.from_rows(board).cells
+    return PackedBoard(bytes(map(cells.__getitem__, cell_map)).translate(digit_table))
+
+
+def variants(puzzle, solution, count):
+    """由一个谜题变换出 count 个互不相同、也与原谜题不同的新谜题
+    Args:
+        puzzle: 已验证唯一解的谜题（PackedBoard 或 9x9 二维列表）
+        solution: 该谜题的完整答案
+        count: 变换出的谜题数量
+    Returns:
+        list: 每个元素是 (谜题, 答案)，均为 PackedBoard
+    """
+    puzzle, solution = PackedBoard.of(puzzle), PackedBoard.of(solution)
+    seen = {bytes(puzzle.cells)}
+    results = []
+    while len(results) < count:
+        transform = random_transform()
+        variant = apply_transform(puzzle, transform)
+        key = bytes(variant.cells)
+        if key in seen:  # 对称的谜题可能被某些变换映射为自身
+            continue
+        seen.add(key)
+        results.append((variant, apply_transform(solution, transform)))
+    return results
+
+
+def _first_row_orders(row):
+    """返回使某一行字典序最小的所有列序
+
+    数字重新编号后，第一行的值只取决于空格的位置：空格为0，非空格依次编号为 1, 2, 3…
+    因此最小的第一行把空格多的列带排在前面，带内空格排在前面；
+    空格数相同的列带之间、带内的空格之间和非空格之间可以任意排列。
+    Returns:
+        tuple: (最小的第一行, 列序列表)
+    """
+    stacks = []
+    for stack in range(3):
+        cols = range(stack * 3, stack * 3 + 3)
+        stacks.append(([col for col in cols if not row[col]], [col for col in cols if row[col]]))
+    zeros = sorted((len(empty) for empty, _ in stacks), reverse=True)
+    best = []
+    label = 0
+    for count in zeros:
+        best.extend([0] * count)
+        for _ in range(3 - count):
+            label += 1
+            best.append(label)
+
+    orders = []
+    for stack_order in itertools.permutations(range(3)):
+        if [len(stacks[stack][0]) for stack in stack_order] != zeros:
+            continue
+        parts = [[empty + filled for empty in itertools.permutations(stacks[stack][0])
+                  for filled in itertools.permutations(stacks[stack][1])]
+                 for stack in stack_order]
+        for first, second, third in itertools.product(*parts):
+            orders.append(first + second + third)
+    return best, orders
+
+
+def _line_classes(grid):
+    """给内容相同的行（列）相同的编号
+    Returns:
+        tuple: (每行的编号, 每列的编号)；所有行和所有列的内容都互不相同时返回 None
+    """
+    rows, cols = {}, {}
+    row_class = [rows.setdefault(grid[row * 9:row * 9 + 9], len(rows)) for row in range(9)]
+    col_class = [cols.setdefault(grid[col::9], len(cols)) for col in range(9)]
+    if len(rows) == 9 and len(cols) == 9:
+        return None
+    return row_class, col_class
+
+
+def _state_key(grid, classes, rows, cols, mapping):
+    """候选状态的等价键：键相同的状态之后得到的各行完全相同，只需保留一个
+
+    交换内容相同的两列、或同一行带内内容相同的两行不改变棋盘，
+    因此只按列序中各列的内容、尚未选择的各行的内容（保留行带结构）和数字编号表区分状态。
+    没有内容相同的行或列（classes 为 None）时各状态互不等价，返回 None。
+    """
+    if classes is None:
+        return None
+    row_class, col_class = classes
+    current = ()
+    if len(rows) % 3:
+        band = rows[-1] // 3 * 3
+        current = tuple(sorted(row_class[row] for row in range(band, band + 3)
+                               if row not in rows))
+    used = {row // 3 for row in rows}
+    bands = tuple(sorted(tuple(sorted(row_class[band * 3:band * 3 + 3]))
+                         for band in range(3) if band not in used))
+    return grid, tuple(col_class[col] for col in cols), current, bands, tuple(mapping)
+
+
+def canonical_form(board):
+    """返回谜题在对称群下的规范形式：所有对称变换结果中字典序最小的一个
+
+    逐行确定规范形式：先找出使第一行最小的所有 (是否转置, 行, 列序)，之后每一行
+    在当前行带内（行带用完时在剩余行带中）选择使该行最小的行，只保留并列最小的候选。
+    数字按出现顺序重新编号，0（空格）最小。互为对称变换的谜题得到相同的规范形式。
+    空行和空列很多时并列的候选会成倍增加，交换内容相同的行或列得到的候选只保留一个
+    （见 _state_key）。挖空得到的唯一解谜题一般只需几毫秒；提示数很少或高度对称的棋盘
+    （包括空棋盘和只有一个提示数的棋盘）并列的候选最多，约需0.2秒。
+    Args:
+        board: PackedBoard 或 9x9 二维列表，不要求有唯一解
+    Returns:
+        str: 81个字符的规范形式
+    """
+    cells = PackedBoard.of(board).cells
+    transposed = bytes(cells[col * 9 + row] for row in range(9) for col in range(9))
+    classes = {}
+
+    # 候选状态：(棋盘, 已选的行, 列序, 数字编号表, 下一个编号)
+    best, states, seen = None, [], set()
+    for grid in (bytes(cells), transposed):
+        classes[grid] = _line_classes(grid)
+        for row in range(9):
+            line, orders = _first_row_orders(grid[row * 9:row * 9 + 9])
+            if best is None or line < best:
+                best, states = line, []
+                seen.clear()
+            if line == best:
+                for cols in orders:
+                    mapping = [0] * 10
+                    label = 0
+                    for col in cols:
+                        num = grid[row * 9 + col]
+                        if num:
+                            label += 1
+                            mapping[num] = label
+                    key = _state_key(grid, classes[grid], (row,), cols, mapping)
+                    if key is None or key not in seen:
+                        seen.add(key)
+                        states.append((grid, (row,), cols, mapping, label + 1))
+    result = list(best)
+
+    for depth in range(1, 9):
+        best, next_states = None, []
+        seen.clear()
+        for grid, rows, cols, mapping, label in states:
+            if depth % 3:  # 在当前行带内选择
+                band = rows[-1] // 3 * 3
+                choices = [row for row in range(band, band + 3) if row not in rows]
+            else:          # 进入一个新的行带
+                used = {row // 3 for row in rows}
+                choices = [row for row in range(9) if row // 3 not in used]
+            for row in choices:
+                base = row * 9
+                line = []
+                new_mapping, new_label = mapping, label
+                equal = best is not None  # 到目前为止与当前最小行相等
+                for index, col in enumerate(cols):
+                    num = grid[base + col]
+                    if num:
+                        value = new_mapping[num]
+                        if not value:
+                            if new_mapping is mapping:
+                                new_mapping = mapping[:]
+                            value = new_mapping[num] = new_label
+                            new_label += 1
+                    else:
+                        value = 0
+                    if equal:
+                        if value > best[index]:
+                            break
+                        if value < best[index]:
+                            equal = False
+                            best, next_states = None, []
+                            seen.clear()
+                    line.append(value)
+                else:
+                    if best is None:
+                        best = line
+                    key = _state_key(grid, classes[grid], rows + (row,), cols, new_mapping)
+                    if key is None or key not in seen:
+                        seen.add(key)
+                        next_states.append((grid, rows + (row,), cols, new_mapping, new_label))
+        states = next_states
+        result.extend(best)
+    return ''.join(map(str, result))
@@ -0,0 +1,20 @@
+"""测试公共设置：把仓库根目录加入模块搜索路径，并让测试不读写 saves/ 下的文件"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+
+# 种子库和求解结果缓存都会读写 saves/；测试每次都回溯填充，缓存由用到它的测试单独创建
+config.SEEDS['enabled'] = False
+config.CACHE['enabled'] = False
+
+
+@pytest.fixture(autouse=True)
+def fixed_seed():
+    """每个测试使用固定的随机种子，失败时可以复现"""
+    random.seed(2024)
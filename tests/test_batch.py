@@ -0,0 +1,46 @@
+"""批量生成：指定随机种子时结果可以复现"""
+import random
+
+import pytest
+
+import config
+import seed_library
+from batch import generate_puzzles
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _generate(seed):
+    return [record for chunk in generate_puzzles(2, ['简单'], workers=1, chunk_size=1,
+                                                 seed=seed, variants=1)
+            for record in chunk]
+
+
+@pytest.fixture
+def seed_file(monkeypatch, tmp_path):
+    """启用种子库，并使用临时目录中的种子库文件"""
+    monkeypatch.setitem(config.SEEDS, 'enabled', True)
+    monkeypatch.setitem(config.SEEDS, 'size', 20)
+    monkeypatch.setitem(config.SEEDS, 'path', str(tmp_path / 'seeds.bin'))
+    monkeypatch.setattr(seed_library, '_shared', None)
+    return tmp_path / 'seeds.bin'
+
+
+def test_seeded_run_does_not_depend_on_the_seed_file(seed_file):
+    first = _generate(5)
+    assert not seed_file.exists()  # 指定种子时不读写种子库文件
+    # 本机已有一个（用其他随机数建立的）种子库文件
+    random.seed(99)
+    algorithm = SudokuAlgorithm()
+    algorithm.seeds.ensure(algorithm.fill_new_board)
+    assert seed_file.exists()
+    assert _generate(5) == first
+    assert _generate(6) != first
+
+
+def test_seeded_library_keeps_the_global_random_state():
+    random.seed(1)
+    expected = random.random()
+    random.seed(1)
+    library = seed_library.seeded(3, SudokuAlgorithm().fill_new_board, size=5)
+    assert random.random() == expected
+    assert library.seeds == seed_library.seeded(3, SudokuAlgorithm().fill_new_board, size=5).seeds
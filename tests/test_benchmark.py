@@ -0,0 +1,37 @@
+"""性能基准：同一个随机种子总是得到同一批测试谜题"""
+import random
+
+import pytest
+
+import benchmark
+import config
+import seed_library
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _corpus(seed):
+    corpus = benchmark.build_corpus(SudokuAlgorithm(), 2, seed)
+    return {category: [str(board) for board in puzzles] for category, puzzles in corpus.items()}
+
+
+@pytest.fixture
+def seed_file(monkeypatch, tmp_path):
+    """启用种子库，并使用临时目录中的种子库文件"""
+    monkeypatch.setitem(config.SEEDS, 'enabled', True)
+    monkeypatch.setitem(config.SEEDS, 'size', 20)
+    monkeypatch.setitem(config.SEEDS, 'path', str(tmp_path / 'seeds.bin'))
+    monkeypatch.setattr(seed_library, '_shared', None)
+    monkeypatch.setattr(benchmark, '_seed_libraries', {})
+    return tmp_path / 'seeds.bin'
+
+
+def test_corpus_does_not_depend_on_the_seed_file(seed_file):
+    first = _corpus(5)
+    assert not seed_file.exists()  # 不读写种子库文件
+    # 本机已有一个（用其他随机数建立的）种子库文件
+    random.seed(99)
+    algorithm = SudokuAlgorithm()
+    algorithm.seeds.ensure(algorithm.fill_new_board)
+    assert seed_file.exists()
+    assert _corpus(5) == first
+    assert _corpus(6) != first
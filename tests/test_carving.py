@@ -0,0 +1,58 @@
+"""挖空后的谜题总是只有唯一解"""
+import pytest
+
+import config
+from packed_board import copy_board
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _clues(board):
+    return sum(1 for row in board for num in row if num)
+
+
+@pytest.mark.parametrize('symmetric', [False, True])
+@pytest.mark.parametrize('group_size', [1, 4])
+def test_carve_keeps_a_unique_solution(monkeypatch, symmetric, group_size):
+    monkeypatch.setitem(config.CARVING, 'group_size', group_size)
+    algorithm = SudokuAlgorithm()
+    for _ in range(3):
+        board = algorithm.generate_board()
+        solution = copy_board(board)
+        clues = algorithm.carve(board, 24, symmetric=symmetric)
+        assert clues == _clues(board) >= 24
+        assert algorithm.count_solutions(board) == 1
+        assert algorithm.solve(board) == solution
+        if symmetric:
+            cells = [num for row in board for num in row]
+            assert all(bool(cells[pos]) == bool(cells[80 - pos]) for pos in range(81))
+
+
+def test_carve_stops_at_the_target():
+    algorithm = SudokuAlgorithm()
+    board = algorithm.generate_board()
+    assert algorithm.carve(board, 60) == 60 == _clues(board)
+    assert algorithm.is_unique_solution(board)
+
+
+@pytest.mark.parametrize('box', [2, 4])
+def test_carve_other_sizes(box):
+    algorithm = SudokuAlgorithm(box=box)
+    board = algorithm.generate_board()
+    solution = copy_board(board)
+    algorithm.remove_numbers(board, '困难')
+    assert algorithm.count_solutions(board) == 1
+    assert algorithm.solve(board) == solution
+
+
+@pytest.mark.parametrize('difficulty', ['简单', '中等', '困难'])
+def test_carve_to_rating_keeps_a_unique_solution(difficulty):
+    algorithm = SudokuAlgorithm()
+    low, high = config.GRADING['bands'][difficulty]
+    for _ in range(3):
+        board = algorithm.generate_board()
+        algorithm.remove_numbers(board, '简单')
+        score = algorithm.carve_to_rating(board, low, high)
+        assert algorithm.count_solutions(board) == 1
+        if score is not None:
+            assert low <= score <= high
+            assert algorithm.rate(board) == score
@@ -0,0 +1,60 @@
+"""冲突跟踪：任意填入/清除序列之后，计数和冲突格子与重新扫描的结果一致"""
+import random
+
+import pytest
+
+from conflict_tracker import ConflictTracker
+from geometry import geometry
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _scan(cells, geo):
+    """重新扫描整个棋盘得到的计数和冲突格子"""
+    counts = {}
+    for unit, members in enumerate(geo.units):
+        for pos in members:
+            if cells[pos]:
+                counts[unit, cells[pos]] = counts.get((unit, cells[pos]), 0) + 1
+    conflicts = {pos for pos in range(geo.cells) if cells[pos] and any(
+        counts[unit, cells[pos]] > 1 for unit in geo.units_of[pos])}
+    return counts, conflicts
+
+
+@pytest.mark.parametrize('box', [2, 3, 4])
+def test_counts_match_a_full_scan(box):
+    geo = geometry(box)
+    algorithm = SudokuAlgorithm(box=box)
+    solution = algorithm.generate_board()
+    puzzle = [row[:] for row in solution]
+    algorithm.remove_numbers(puzzle, '中等')
+    tracker = ConflictTracker(puzzle, solution)
+    editable = [pos for pos in range(geo.cells) if not tracker.fixed[pos]]
+    for _ in range(500):
+        pos = random.choice(editable)
+        num = random.choice([0] * 3 + list(range(1, geo.size + 1)))
+        before = set(tracker.conflicts())
+        changed = tracker.set(pos, num)
+        counts, conflicts = _scan(tracker.cells, geo)
+        assert tracker.conflicts() == conflicts
+        assert changed == before ^ conflicts
+        for unit in range(len(geo.units)):
+            for digit in range(1, geo.size + 1):
+                assert tracker.count(unit, digit) == counts.get((unit, digit), 0)
+        assert tracker.remaining == tracker.cells.count(0)
+        flat = [num for row in solution for num in row]
+        assert tracker.wrong == sum(1 for pos in editable
+                                    if tracker.cells[pos] and tracker.cells[pos] != flat[pos])
+
+
+def test_fixed_cells_cannot_change():
+    solution = SudokuAlgorithm().generate_board()
+    puzzle = [row[:] for row in solution]
+    puzzle[0][0] = 0
+    tracker = ConflictTracker(puzzle, solution)
+    with pytest.raises(ValueError):
+        tracker.set(1, 0)
+    assert tracker.remaining == 1 and not tracker.is_complete()
+    tracker.set(0, solution[0][0])
+    assert tracker.is_complete() and tracker.is_solved()
+    tracker.set(0, 0)
+    assert tracker.remaining == 1 and tracker.conflicts() == set()
@@ -0,0 +1,76 @@
+"""去重索引：按规范形式查重和文件读写"""
+import time
+
+from board_state import BoardState
+from dedup import DedupIndex
+from packed_board import PackedBoard, copy_board
+from symmetry import apply_transform, canonical_form, random_transform, variants
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _puzzle():
+    algorithm = SudokuAlgorithm()
+    board = algorithm.generate_board()
+    algorithm.remove_numbers(board, '中等')
+    return board
+
+
+def test_transformed_puzzle_is_a_duplicate():
+    index = DedupIndex(capacity=1000, error_rate=0.001)
+    puzzle = _puzzle()
+    assert index.add(puzzle)
+    assert apply_transform(puzzle, random_transform()) in index
+    assert not index.add(apply_transform(puzzle, random_transform()))
+
+
+def test_canonical_form_of_sparse_boards():
+    """空行空列很多的棋盘并列的候选最多，规范化仍然很快，且与对称变换无关"""
+    for text in ('.' * 81, '5' + '.' * 80, '1' + '.' * 39 + '2' + '.' * 39 + '3'):
+        board = PackedBoard.from_string(text)
+        start = time.perf_counter()
+        form = canonical_form(board)
+        assert time.perf_counter() - start < 2
+        assert canonical_form(apply_transform(board, random_transform())) == form
+
+
+def test_transform_keeps_the_solution():
+    algorithm = SudokuAlgorithm()
+    solution = algorithm.generate_board()
+    puzzle = copy_board(solution)
+    algorithm.remove_numbers(puzzle, '困难')
+    for _ in range(5):
+        transform = random_transform()
+        new_puzzle = apply_transform(puzzle, transform)
+        new_solution = apply_transform(solution, transform)
+        assert BoardState(new_puzzle).valid
+        assert algorithm.solve(new_puzzle) == new_solution.to_rows()
+
+
+def test_variants_are_distinct_unique_puzzles():
+    algorithm = SudokuAlgorithm()
+    solution = algorithm.generate_board()
+    puzzle = copy_board(solution)
+    algorithm.remove_numbers(puzzle, '中等')
+    results = variants(puzzle, solution, 5)
+    assert len(results) == 5
+    keys = {bytes(variant.cells) for variant, _ in results}
+    assert len(keys) == 5 and bytes(PackedBoard.of(puzzle).cells) not in keys
+    for variant, answer in results:
+        assert BoardState(variant).valid
+        assert all(num in (0, answer.cells[pos]) for pos, num in enumerate(variant.cells))
+        assert algorithm.count_solutions(variant) == 1
+        assert algorithm.solve(variant) == answer.to_rows()
+
+
+def test_dumps_is_a_snapshot(tmp_path):
+    path = str(tmp_path / 'puzzles.seen')
+    index = DedupIndex(path, capacity=1000, error_rate=0.001)
+    first, second = _puzzle(), _puzzle()
+    index.add(first)
+    data = index.dumps()
+    index.add(second)  # 复制之后的修改不影响已复制的内容
+    index.save(data)
+    loaded = DedupIndex(path)
+    assert first in loaded and second not in loaded and len(loaded) == 1
+    index.save()
+    assert second in DedupIndex(path)
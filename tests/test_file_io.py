@@ -0,0 +1,35 @@
+"""原子写入和容错读取"""
+import os
+
+import pytest
+
+from file_io import atomic_write, load_file
+
+
+def test_atomic_write_creates_and_replaces(tmp_path):
+    path = str(tmp_path / 'nested' / 'data.bin')
+    atomic_write(path, b'first')
+    atomic_write(path, b'second')
+    with open(path, 'rb') as f:
+        assert f.read() == b'second'
+    assert os.listdir(tmp_path / 'nested') == ['data.bin']
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / 'data.bin')
+    atomic_write(path, b'old')
+    with pytest.raises(TypeError):
+        atomic_write(path, 'not bytes')
+    with open(path, 'rb') as f:
+        assert f.read() == b'old'
+    assert os.listdir(tmp_path) == ['data.bin']
+
+
+def test_load_file_returns_none_when_missing_or_corrupt(tmp_path):
+    path = str(tmp_path / 'data.bin')
+    assert load_file(None, bytes) is None
+    assert load_file(path, bytes) is None
+    atomic_write(path, b'12')
+    assert load_file(path, int) == 12
+    atomic_write(path, b'garbage')
+    assert load_file(path, int) is None
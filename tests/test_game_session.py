@@ -0,0 +1,59 @@
+"""游戏会话：输入、撤销/重做和检查次数用完后揭示答案"""
+from game_session import GameSession
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _session(max_checks=2):
+    algorithm = SudokuAlgorithm()
+    solution = algorithm.generate_board()
+    puzzle = [row[:] for row in solution]
+    algorithm.remove_numbers(puzzle, '中等')
+    return GameSession(puzzle, solution, '中等', max_checks)
+
+
+def _wrong(session, pos):
+    return session.solution.cells[pos] % 9 + 1
+
+
+def test_undo_redo_restores_values():
+    session = _session()
+    pos = next(pos for pos in range(81) if not session.is_fixed(pos))
+    session.input(pos, 3)
+    session.input(pos, 4)
+    assert session.undo()[0] == pos and session.value(pos) == 3
+    assert session.undo()[0] == pos and session.value(pos) == 0
+    assert session.undo() is None
+    session.redo()
+    assert session.value(pos) == 3
+
+
+def test_undo_after_reveal_keeps_the_answer():
+    session = _session()
+    empties = [pos for pos in range(81) if not session.is_fixed(pos)]
+    wrong, right = empties[0], empties[1]
+    session.input(right, session.solution.cells[right])
+    session.input(wrong, _wrong(session, wrong))
+    errors, revealed = session.check()
+    assert wrong in errors and not revealed
+    errors, revealed = session.check()  # 最后一次检查：揭示答案
+    assert wrong in revealed
+    assert session.value(wrong) == session.solution.cells[wrong]
+    # 揭示的格子不能再被撤销，其他格子的步骤仍然可以撤销
+    assert session.undo()[0] == right
+    assert session.value(wrong) == session.solution.cells[wrong]
+    assert session.value(right) == 0
+    assert session.undo() is None
+    assert session.redo()[0] == right and session.redo() is None
+    assert session.check() is None
+
+
+def test_to_dict_round_trip():
+    session = _session()
+    empties = [pos for pos in range(81) if not session.is_fixed(pos)]
+    session.input(empties[0], _wrong(session, empties[0]))
+    session.input(empties[1], session.solution.cells[empties[1]])
+    session.check()
+    restored = GameSession.from_dict(session.to_dict())
+    assert [restored.value(pos) for pos in range(81)] == [session.value(pos) for pos in range(81)]
+    assert restored.check_count == 1
+    assert restored.undo()[0] == empties[1]
@@ -0,0 +1,42 @@
+"""难度评分：固定谜题的评分和最难技巧"""
+import pytest
+
+from grader import GUESS, Grader
+from packed_board import PackedBoard
+
+# (谜题, 评分, 最难技巧, 各技巧的使用步数)，权重为 config.GRADING 的默认值
+GRADED = [
+    ("070040500010759008003200000100000480857012639034097025296300000780905200340028090",
+     40, 'naked_singles', {'naked_singles': 40}),
+    ("730140560050703040614952007200005600483609000561830000000586300000004026046200008",
+     52, 'hidden_singles', {'naked_singles': 28, 'hidden_singles': 12}),
+    ("4.....938.32.941...953..24.37.6.9..4529..16736.47.3.9.957..83....39..4..24..3.7.9",
+     45, 'locked_candidates', {'naked_singles': 37, 'locked_candidates': 1}),
+    ("1.....569492.561.8.561.924...964.8.1.64.1....218.356.4.4.5...169.5.614.2621.....5",
+     101, 'x_wing', {'naked_singles': 25, 'hidden_singles': 10, 'locked_candidates': 2,
+                     'hidden_pairs': 1, 'x_wing': 1}),
+    ("8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+     60, GUESS, {}),
+]
+
+
+@pytest.fixture(scope='module')
+def grader():
+    return Grader()
+
+
+@pytest.mark.parametrize('text, score, hardest, report', GRADED)
+def test_grade(grader, text, score, hardest, report):
+    board = PackedBoard.from_string(text)
+    assert grader.grade(board) == score
+    assert grader.hardest == hardest
+    assert grader.solved == (hardest != GUESS)
+    assert grader.report() == report
+    assert str(board) == PackedBoard.from_string(text).to_string()  # 不修改谜题
+
+
+def test_grade_contradiction(grader):
+    board = PackedBoard.from_string("11" + "." * 79)
+    assert grader.grade(board) == -1
+    assert grader.hardest is None
+    assert grader.report() == {}
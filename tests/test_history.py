@@ -0,0 +1,71 @@
+"""撤销/重做历史：编码、上限和撤销重做顺序"""
+import pytest
+
+from history import History, decode_move, digit_bits, encode_move
+
+
+@pytest.mark.parametrize('bits, move', [(4, (80, 9, 0)), (4, (0, 0, 9)), (5, (255, 16, 3)),
+                                        (5, (624, 25, 25))])
+def test_encode_round_trip(bits, move):
+    assert decode_move(encode_move(*move, bits=bits), bits) == move
+
+
+def test_digit_bits():
+    assert digit_bits(4) == digit_bits(9) == 4
+    assert digit_bits(16) == digit_bits(25) == 5
+
+
+def test_undo_redo_order():
+    history = History(limit=10)
+    history.record(1, 0, 5)
+    history.record(2, 0, 7)
+    history.record(1, 5, 6)
+    assert history.undo() == (1, 5, 6)
+    assert history.undo() == (2, 0, 7)
+    assert history.redo() == (2, 0, 7)
+    assert history.can_undo() and history.can_redo()
+    history.record(3, 0, 1)  # 新的修改清空重做栈
+    assert not history.can_redo() and history.redo() is None
+
+
+def test_no_op_is_not_recorded():
+    history = History(limit=10)
+    history.record(4, 3, 3)
+    assert history.undo() is None
+
+
+def test_history_is_capped():
+    history = History(limit=3)
+    for pos in range(5):
+        history.record(pos, 0, 1)
+    assert len(history.undo_stack) == 3
+    assert [history.undo()[0] for _ in range(3)] == [4, 3, 2]  # 最早的两步被丢弃
+    assert history.undo() is None
+    for _ in range(3):
+        history.redo()
+    assert len(history.redo_stack) == 0 and len(history.undo_stack) == 3
+
+
+def test_to_dict_round_trip():
+    history = History(limit=5, bits=5)
+    history.record(300, 0, 17)
+    history.record(12, 17, 0)
+    history.undo()
+    restored = History.from_dict(history.to_dict(), limit=5, bits=5)
+    assert restored.undo() == (300, 0, 17)
+    assert restored.redo() == (300, 0, 17)
+    assert restored.redo() == (12, 17, 0)
+    assert History.from_dict(None).undo() is None
+
+
+def test_discard_removes_only_those_cells():
+    history = History(limit=10)
+    history.record(1, 0, 5)
+    history.record(2, 0, 7)
+    history.record(1, 5, 6)
+    history.record(3, 0, 2)
+    history.undo()
+    history.discard([1, 3])
+    assert history.undo() == (2, 0, 7)
+    assert history.undo() is None
+    assert history.redo() == (2, 0, 7) and history.redo() is None
@@ -0,0 +1,61 @@
+"""推理技巧只排除错误的候选数，不会排除解中的数字"""
+import pytest
+
+from board_state import BIT, BoardState
+from packed_board import PackedBoard
+from propagation import (hidden_pairs, hidden_singles, locked_candidates, naked_pairs,
+                         naked_singles, x_wing, Propagator)
+from sudoku_algorithm import SudokuAlgorithm
+
+ORDER = (naked_singles, hidden_singles, locked_candidates, naked_pairs, hidden_pairs, x_wing)
+
+# 技巧 -> 传播到该技巧时会取得进展的已知谜题
+PUZZLES = {
+    naked_pairs: [
+        "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+        ".2..........6....3.74.8.........3..2.8..4..1.6..5.........1.78.5....9..........4.",
+    ],
+    hidden_pairs: [
+        "....14....3....2...7..........9...3.6.1.............8.2.....1.4....5.6.....7.8...",
+        "1.....569492.561.8.561.924...964.8.1.64.1....218.356.4.4.5...169.5.614.2621.....5",
+    ],
+    x_wing: [
+        "1.....569492.561.8.561.924...964.8.1.64.1....218.356.4.4.5...169.5.614.2621.....5",
+    ],
+}
+
+
+def _propagate(text):
+    """按从易到难的顺序传播到不动点，每次应用技巧后检查解中的数字都还在候选数中
+    Returns:
+        set: 取得过进展的技巧
+    """
+    board = PackedBoard.from_string(text)
+    solution = [num for row in SudokuAlgorithm().solve(board) for num in row]
+    state = BoardState(board)
+    empties = state.empty_positions()
+    propagator = Propagator(ORDER)
+    propagator.begin(state, empties, [0] * 81, 0)
+    fired = set()
+    index = 0
+    while index < len(ORDER):
+        result = ORDER[index](propagator, empties)
+        assert result >= 0
+        for pos in empties:
+            if state.cells[pos]:
+                assert state.cells[pos] == solution[pos]
+            else:
+                assert propagator.cand[pos] & BIT[solution[pos]]
+        if result:
+            fired.add(ORDER[index])
+            index = 0
+        else:
+            index += 1
+    return fired
+
+
+@pytest.mark.parametrize('technique, text',
+                         [(technique, text) for technique, texts in PUZZLES.items()
+                          for text in texts])
+def test_technique_keeps_the_solution(technique, text):
+    assert technique in _propagate(text)
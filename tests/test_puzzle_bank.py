@@ -0,0 +1,64 @@
+"""题库文件：写入、重新打开和按编号读取"""
+import pytest
+
+from packed_board import PackedBoard
+from puzzle_bank import PuzzleBank, PuzzleBankWriter
+from sudoku_algorithm import SudokuAlgorithm
+
+DIFFICULTIES = ['简单', '中等', '困难']
+
+
+def _records(count):
+    algorithm = SudokuAlgorithm()
+    records = []
+    for index in range(count):
+        solution = PackedBoard.from_rows(algorithm.generate_board())
+        puzzle = solution.copy()
+        difficulty = DIFFICULTIES[index % len(DIFFICULTIES)]
+        algorithm.remove_numbers(puzzle, difficulty)
+        records.append((puzzle, solution, difficulty, index * 40))
+    return records
+
+
+def test_write_reopen_get(tmp_path):
+    path = str(tmp_path / 'puzzles.bank')
+    records = _records(7)
+    with PuzzleBankWriter(path, DIFFICULTIES) as writer:
+        for record in records:
+            writer.append(*record)
+    with PuzzleBank(path) as bank:
+        assert len(bank) == 7
+        assert [bank.count(difficulty) for difficulty in DIFFICULTIES] == [3, 2, 2]
+        for index, (puzzle, solution, difficulty, rating) in enumerate(records):
+            assert bank.get(index) == (puzzle, solution, difficulty, min(rating, 255))
+        assert bank.get_by_difficulty('中等', 1)[0] == records[4][0]
+        assert bank.random('困难')[2] == '困难'
+        with pytest.raises(IndexError):
+            bank.get(7)
+
+
+def test_append_to_existing_bank(tmp_path):
+    path = str(tmp_path / 'puzzles.bank')
+    records = _records(5)
+    with PuzzleBankWriter(path, DIFFICULTIES) as writer:
+        for record in records[:3]:
+            writer.append(*record)
+    with PuzzleBankWriter(path, DIFFICULTIES) as writer:
+        for record in records[3:]:
+            writer.append(*record)
+    with PuzzleBank(path) as bank:
+        assert len(bank) == 5
+        assert [bank.get(index)[0] for index in range(5)] == [record[0] for record in records]
+        assert bank.count('简单') == 2
+    with pytest.raises(ValueError):
+        PuzzleBankWriter(path, ['easy'])
+
+
+def test_unfinished_bank_is_rejected(tmp_path):
+    path = str(tmp_path / 'puzzles.bank')
+    writer = PuzzleBankWriter(path, DIFFICULTIES)
+    writer.append(*_records(1)[0])
+    writer.file.flush()
+    with pytest.raises(ValueError):
+        PuzzleBank(path)
+    writer.close()
@@ -0,0 +1,85 @@
+"""存档格式：版本1（9x9）和版本2（其他大小）的往返，以及损坏的存档被拒绝"""
+import struct
+
+import pytest
+
+import save_store
+from game_session import GameSession
+from save_store import SaveStore, decode, encode
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _session(box):
+    """生成一局游戏，填写几个数字（包括一个错误的数字）并撤销一步"""
+    algorithm = SudokuAlgorithm(box=box)
+    solution = algorithm.generate_board()
+    puzzle = [row[:] for row in solution]
+    algorithm.remove_numbers(puzzle, '中等')
+    session = GameSession(puzzle, solution, '中等')
+    n = session.size
+    empties = [pos for pos in range(n * n) if not session.is_fixed(pos)]
+    for pos in empties[:4]:
+        session.input(pos, session.solution.cells[pos])
+    session.input(empties[4], session.solution.cells[empties[4]] % n + 1)
+    session.undo()
+    session.check_count = 2
+    return session
+
+
+def _assert_same(restored, session):
+    n = session.size
+    assert restored.size == n
+    assert restored.difficulty == session.difficulty
+    assert restored.board == session.board
+    assert restored.solution == session.solution
+    assert [restored.value(pos) for pos in range(n * n)] == \
+        [session.value(pos) for pos in range(n * n)]
+    assert restored.check_count == session.check_count
+    assert restored.max_checks == session.max_checks
+    assert list(restored.history.undo_stack) == list(session.history.undo_stack)
+    assert list(restored.history.redo_stack) == list(session.history.redo_stack)
+
+
+@pytest.mark.parametrize('box, version', [(3, save_store.VERSION), (2, save_store.GRID_VERSION),
+                                          (4, save_store.GRID_VERSION)])
+def test_round_trip(box, version):
+    session = _session(box)
+    data = encode(session)
+    assert struct.unpack_from('<H', data, 8)[0] == version
+    restored = decode(data)
+    _assert_same(restored, session)
+    assert restored.redo() is not None  # 重做栈也恢复了
+
+
+def test_crc_mismatch_is_rejected():
+    data = bytearray(encode(_session(3)))
+    data[-1] ^= 0xFF
+    with pytest.raises(ValueError, match="损坏"):
+        decode(bytes(data))
+
+
+@pytest.mark.parametrize('data', [b'', b'SUDOKUSV', b'NOTASAVE' + bytes(16)])
+def test_invalid_data_is_rejected(data):
+    with pytest.raises(ValueError):
+        decode(data)
+
+
+def test_unknown_version_is_rejected():
+    data = bytearray(encode(_session(3)))
+    data[8] = 99
+    with pytest.raises(ValueError, match="版本"):
+        decode(bytes(data))
+
+
+def test_store_slots(tmp_path):
+    store = SaveStore(str(tmp_path / 'slots'))
+    session = _session(3)
+    store.save('1', session)
+    store.save_async('2', _session(4)).result()
+    assert set(store.slots()) == {'1', '2'}
+    _assert_same(store.load('1'), session)
+    assert store.load_async('2').result().size == 16
+    assert not list(tmp_path.glob('slots/*.tmp'))
+    with pytest.raises(ValueError):
+        store.path('../escape')
+    store.close()
@@ -0,0 +1,105 @@
+"""求解结果缓存：合并规则、查询、淘汰和文件读写"""
+from solve_cache import SolveCache, board_key
+from packed_board import PackedBoard
+from sudoku_algorithm import SudokuAlgorithm
+
+KEY = b'k' * 16
+SOLUTION = bytes(range(1, 10)) * 9
+
+
+def test_exact_count_is_kept_over_lower_bounds():
+    cache = SolveCache()
+    cache.put(KEY, 1, 2)        # 确切个数：唯一解
+    cache.put(KEY, 1, 1)        # 只知道至少1个解
+    assert cache.entries[KEY][:2] == (1, 2)
+
+
+def test_exact_count_replaces_a_lower_bound():
+    cache = SolveCache()
+    cache.put(KEY, 1, 1)
+    cache.put(KEY, 3, 5)
+    assert cache.entries[KEY][:2] == (3, 5)
+
+
+def test_larger_lower_bound_wins():
+    cache = SolveCache()
+    cache.put(KEY, 2, 2)
+    cache.put(KEY, 1, 1)
+    assert cache.entries[KEY][:2] == (2, 2)
+    cache.put(KEY, 5, 5)
+    assert cache.entries[KEY][:2] == (5, 5)
+
+
+def test_solution_is_kept_when_merging():
+    cache = SolveCache()
+    cache.put(KEY, 1, 1, SOLUTION)
+    cache.put(KEY, 1, 2)
+    assert cache.entries[KEY] == (1, 2, SOLUTION)
+
+
+def test_get_count_answers_only_what_is_known():
+    cache = SolveCache()
+    cache.put(KEY, 1, 1)
+    assert cache.get_count(KEY, 1) == 1
+    assert cache.get_count(KEY, 2) is None  # 不知道是否还有第二个解
+    cache.put(KEY, 2, 2)
+    assert cache.get_count(KEY, 2) == 2
+    assert cache.get_count(KEY, 5) is None
+    cache.put(KEY, 3, 10)
+    assert cache.get_count(KEY, 5) == 3
+    assert cache.get_count(KEY, 2) == 2
+    assert cache.snapshot()['hits'] == 4 and cache.snapshot()['misses'] == 2
+
+
+def test_get_solution():
+    cache = SolveCache()
+    assert cache.get_solution(KEY) is None
+    cache.put(KEY, 1, 2)
+    assert cache.get_solution(KEY) is None  # 知道个数但没有记录解
+    cache.put(KEY, 1, 1, SOLUTION)
+    assert cache.get_solution(KEY) == SOLUTION
+    cache.put(b'x' * 16, 0, 1)
+    assert cache.get_solution(b'x' * 16) == b''  # 已知无解
+
+
+def test_least_recently_used_is_evicted():
+    cache = SolveCache(2)
+    cache.put(b'a' * 16, 1, 2)
+    cache.put(b'b' * 16, 1, 2)
+    cache.get_count(b'a' * 16, 2)
+    cache.put(b'c' * 16, 1, 2)
+    assert b'b' * 16 not in cache and b'a' * 16 in cache
+    assert len(cache) == 2 and cache.evictions == 1
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'cache.bin')
+    cache = SolveCache(10, path)
+    cache.put(b'a' * 16, 1, 2, SOLUTION)
+    cache.put(b'b' * 16, 7, 7)
+    cache.save()
+    assert SolveCache(10, path).entries == cache.entries
+    assert list(SolveCache(1, path).entries) == [b'b' * 16]
+    (tmp_path / 'cache.bin').write_bytes(b'garbage')
+    assert len(SolveCache(10, path)) == 0
+
+
+def test_board_key_ignores_representation():
+    rows = [[(row * 3 + row // 3 + col) % 9 + 1 for col in range(9)] for row in range(9)]
+    assert board_key(rows) == board_key(PackedBoard.from_rows(rows))
+    other = [row[:] for row in rows]
+    other[0][0] = 0
+    assert board_key(other) != board_key(rows)
+
+
+def test_algorithm_consults_the_cache():
+    algorithm = SudokuAlgorithm()
+    algorithm.cache = cache = SolveCache()
+    solution = algorithm.generate_board()
+    puzzle = [row[:] for row in solution]
+    algorithm.remove_numbers(puzzle, '困难')
+    checks = algorithm.stats.checks
+    assert algorithm.is_unique_solution(puzzle)
+    assert algorithm.solve(puzzle) == solution
+    assert algorithm.stats.checks == checks  # 挖空时记下的结果直接命中
+    assert cache.snapshot()['misses'] == 0
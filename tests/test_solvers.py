@@ -0,0 +1,63 @@
+"""回溯引擎与舞蹈链引擎的解的个数一致"""
+import random
+
+import pytest
+
+from benchmark import KNOWN_PUZZLES
+from packed_board import PackedBoard
+from sudoku_algorithm import SudokuAlgorithm
+
+ENGINES = ('backtracking', 'dlx')
+
+
+def _puzzles():
+    """已知谜题、生成的谜题和去掉若干提示后有多个解的谜题"""
+    puzzles = [PackedBoard.from_string(text) for texts in KNOWN_PUZZLES.values() for text in texts]
+    algorithm = SudokuAlgorithm('backtracking')
+    random.seed(7)
+    for difficulty in ('简单', '困难'):
+        for _ in range(3):
+            board = PackedBoard.from_rows(algorithm.generate_board())
+            algorithm.remove_numbers(board, difficulty)
+            puzzles.append(board)
+    for puzzle in list(puzzles[:6]):
+        loose = puzzle.copy()
+        clues = [pos for pos in range(81) if loose.cells[pos]]
+        for pos in clues[:4]:
+            loose.cells[pos] = 0
+        puzzles.append(loose)
+    return puzzles
+
+
+PUZZLES = _puzzles()
+
+
+@pytest.fixture(scope='module')
+def algorithms():
+    return {engine: SudokuAlgorithm(engine) for engine in ENGINES}
+
+
+@pytest.mark.parametrize('limit', [1, 2, 5])
+def test_engines_count_the_same_solutions(algorithms, limit):
+    for puzzle in PUZZLES:
+        counts = {engine: algorithm.count_solutions(puzzle, limit)
+                  for engine, algorithm in algorithms.items()}
+        assert counts['backtracking'] == counts['dlx'], puzzle.to_string()
+
+
+def test_engines_agree_on_contradictions(algorithms):
+    puzzle = PUZZLES[0].copy()
+    puzzle[0, 1] = puzzle[0, 0] = 1  # 同一行的两个1
+    for algorithm in algorithms.values():
+        assert algorithm.count_solutions(puzzle) == 0
+        assert algorithm.solve(puzzle) is None
+
+
+def test_engines_solve_to_a_valid_solution(algorithms):
+    for puzzle in PUZZLES[:9]:
+        solutions = [algorithm.solve(puzzle) for algorithm in algorithms.values()]
+        assert solutions[0] == solutions[1]
+        solution = solutions[0]
+        assert all(puzzle.cells[pos] in (0, solution[pos // 9][pos % 9]) for pos in range(81))
+        assert all(sorted(row) == list(range(1, 10)) for row in solution)
+        assert all(sorted(col) == list(range(1, 10)) for col in zip(*solution))
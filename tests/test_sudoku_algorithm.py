@@ -0,0 +1,34 @@
+"""SudokuAlgorithm 的公开查询方法"""
+import pytest
+
+from sudoku_algorithm import SudokuAlgorithm
+
+
+def _reference_is_valid(board, row, col, num, box):
+    """逐行、列、宫扫描的参考实现（包括该格本身）"""
+    n = box * box
+    if any(board[row][i] == num or board[i][col] == num for i in range(n)):
+        return False
+    top, left = box * (row // box), box * (col // box)
+    return all(board[i][j] != num for i in range(top, top + box) for j in range(left, left + box))
+
+
+@pytest.mark.parametrize('box', [2, 3, 4])
+def test_is_valid_for_check_matches_a_full_scan(box):
+    algorithm = SudokuAlgorithm(box=box)
+    n = box * box
+    board = algorithm.generate_board()
+    algorithm.remove_numbers(board, '中等')
+    for row in range(n):
+        for col in range(n):
+            for num in range(1, n + 1):
+                assert algorithm.is_valid_for_check(board, row, col, num) == \
+                    _reference_is_valid(board, row, col, num, box)
+
+
+def test_is_valid_for_check_rejects_the_cells_own_value():
+    algorithm = SudokuAlgorithm()
+    board = [[0] * 9 for _ in range(9)]
+    board[4][4] = 5
+    assert not algorithm.is_valid_for_check(board, 4, 4, 5)
+    assert algorithm.is_valid_for_check(board, 4, 4, 6)
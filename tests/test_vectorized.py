@@ -0,0 +1,100 @@
+"""NumPy 批量校验与传播的结果与逐格的 BoardState、solve() 一致"""
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import vectorized  # noqa: E402
+from board_state import PEERS, BoardState  # noqa: E402
+from packed_board import PackedBoard  # noqa: E402
+from sudoku_algorithm import SudokuAlgorithm  # noqa: E402
+
+
+def _corrupt(board, rng):
+    """复制棋盘并把一个已知数字改成同行中另一个已知数字，制造重复"""
+    board = board.copy()
+    filled = [pos for pos in range(81) if board.cells[pos]]
+    while True:
+        pos, other = rng.sample(filled, 2)
+        if pos // 9 == other // 9 and board.cells[pos] != board.cells[other]:
+            board.cells[pos] = board.cells[other]
+            return board
+
+
+@pytest.fixture(scope='module')
+def boards():
+    """完整棋盘、谜题和被破坏的谜题"""
+    algorithm = SudokuAlgorithm()
+    rng = random.Random(16)
+    random.seed(16)
+    solutions, puzzles = [], []
+    for difficulty in ('简单', '中等', '困难'):
+        for _ in range(4):
+            solution = PackedBoard.from_rows(algorithm.generate_board())
+            puzzle = solution.copy()
+            algorithm.remove_numbers(puzzle, difficulty)
+            solutions.append(solution)
+            puzzles.append(puzzle)
+    corrupted = [_corrupt(board, rng) for board in solutions[:4] + puzzles[4:]]
+    return solutions, puzzles, corrupted
+
+
+def _all(boards):
+    solutions, puzzles, corrupted = boards
+    return solutions + puzzles + corrupted
+
+
+def test_conflicts_and_is_valid(boards):
+    boards = _all(boards)
+    conflicts = vectorized.conflicts(boards)
+    for board, marked, valid in zip(boards, conflicts, vectorized.is_valid(boards)):
+        cells = board.cells
+        expected = [bool(cells[pos]) and any(cells[peer] == cells[pos] for peer in PEERS[pos])
+                    for pos in range(81)]
+        assert marked.reshape(81).tolist() == expected
+        assert valid == BoardState(board).valid
+
+
+def test_is_solved_and_matches(boards):
+    solutions, puzzles, corrupted = boards
+    assert vectorized.is_solved(solutions).all()
+    assert not vectorized.is_solved(puzzles).any()
+    assert not vectorized.is_solved(corrupted).any()
+    assert vectorized.matches(puzzles, solutions).all()
+    # 错开一位后谜题和答案不再对应
+    assert not vectorized.matches(puzzles, solutions[1:] + solutions[:1]).any()
+
+
+def test_candidates(boards):
+    solutions, puzzles, _ = boards
+    for board, cand in zip(puzzles + solutions, vectorized.candidates(puzzles + solutions)):
+        state = BoardState(board)
+        cand = cand.reshape(81).tolist()
+        for pos in range(81):
+            assert cand[pos] == (0 if board.cells[pos] else state.candidates(pos))
+
+
+def test_propagate(boards):
+    solutions, puzzles, corrupted = boards
+    algorithm = SudokuAlgorithm()
+    result, status = vectorized.propagate(puzzles + corrupted)
+    for board, after, state in zip(puzzles + corrupted, result, status):
+        solution = algorithm.solve(board)
+        if solution is None:
+            assert state == vectorized.CONTRADICTION
+            continue
+        assert state != vectorized.CONTRADICTION
+        cells = after.reshape(81).tolist()
+        expected = [num for row in solution for num in row]
+        # 传播填入的数字都与唯一解一致，解出时就是唯一解
+        assert all(num in (0, expected[pos]) for pos, num in enumerate(cells))
+        assert (state == vectorized.SOLVED) == (cells == expected)
+    assert (status[:len(puzzles)] != vectorized.CONTRADICTION).all()
+    assert (status[len(puzzles):] == vectorized.CONTRADICTION).all()
+
+    # 输入已经是数组时也不会被修改
+    array = vectorized.to_array(puzzles)
+    before = array.copy()
+    vectorized.propagate(array)
+    assert (array == before).all()
@@ -1,8 +1,20 @@
 import tkinter as tk
 from tkinter import messagebox
+import logging
+import os
+import queue
 import random
+import threading
 import config
 from sudoku_algorithm import SudokuAlgorithm
+from packed_board import copy_board
+from puzzle_pool import PuzzlePool
+from puzzle_bank import PuzzleBank
+from game_session import GameSession
+from save_store import SaveStore
+from grid_view import create_grid, REVEAL_FONT
+
+logger = logging.getLogger(__name__)
 
 class Sudoku:
     """数独游戏主类，负责管理游戏逻辑和UI"""
@@ -16,41 +28,180 @@ class Sudoku:
         # 设置窗口最小尺寸
         master.minsize(config.WINDOW['min_width'], config.WINDOW['min_height'])
         
-        # 初始化撤销/重做栈
-        self.undo_stack = []
-        self.redo_stack = []
-        
-        # 初始化检查次数
-        self.max_checks = config.GAME['max_checks']  # 最大检查次数
-        self.check_count = 0
+        # 当前一局游戏的全部状态（谜题、填写的数字、撤销历史、检查次数），与界面无关
+        self.session = None
         
-        self.algorithm = SudokuAlgorithm()  # 实例化算法类
+        self.algorithm = SudokuAlgorithm()  # 实例化算法类，只在后台生成线程中使用
+        self.algorithms = {3: self.algorithm}  # 各宫大小的算法实例，见 algorithm_for
+        # 后台生成状态：正在生成的 (难度, 宫大小)、最新请求的 (难度, 宫大小)、生成结果队列
+        self.generating = None
+        self.pending_request = None
+        self.generation_queue = queue.Queue()
+        self.generating_label = None
+        self.grid_view = None  # 数独网格，第一次显示游戏时创建，之后每局复用
+        # 谜题池在后台预先生成谜题，开始新游戏时直接取用
+        self.puzzle_pool = PuzzlePool()
+        self.puzzle_pool.start()
+        self.puzzle_bank = self.open_bank()
+        self.save_store = SaveStore()  # 存档在后台线程中读写
+        master.protocol("WM_DELETE_WINDOW", self.close)
         self.new_game()  # 开始新游戏
 
-    def new_game(self, difficulty="简单"):
+    def new_game(self, difficulty="简单", box=None):
         """开始新游戏
+        
+        优先从题库文件中随机取题，其次从谜题池取出谜题；都没有时在后台线程生成，
+        界面显示生成状态，生成完成后再显示新游戏，Tk 事件循环不会被阻塞。
+        题库和谜题池只保存 9x9 的谜题，其他大小的棋盘总是在后台生成。
         Args:
             difficulty: 游戏难度，可选"简单"、"中等"、"困难"
+            box: 宫大小，默认为 config.GAME['box_size']
+        """
+        box = box or config.GAME['box_size']
+        if box != 3:
+            self.request_generation(difficulty, box)
+            return
+        if self.puzzle_bank is not None and self.puzzle_bank.count(difficulty):
+            puzzle, solution, _, _ = self.puzzle_bank.random(difficulty)
+            self.show_game(difficulty, puzzle, solution)
+            return
+        puzzle = self.puzzle_pool.pop(difficulty)
+        if puzzle is None:
+            self.request_generation(difficulty, box)
+            return
+        self.show_game(difficulty, *puzzle)
+
+    def show_game(self, difficulty, board, solution):
+        """显示一局新游戏
+        Args:
+            difficulty: 游戏难度
+            board: 谜题棋盘
+            solution: 完整答案
+        """
+        self.show_session(GameSession(board, solution, difficulty))
+
+    def show_session(self, session):
+        """显示一个游戏会话（新游戏或加载的存档）
+
+        同时取消尚未完成的生成请求：后台生成的结果到达时不会再替换这个会话。
         """
-        self.board = self.algorithm.generate_board()  # 生成完整数独
-        self.solution = [row[:] for row in self.board]  # 保存原始答案
-        self.cells = {}  # 初始化单元格字典
+        self.session = session
+        self.pending_request = None
+        
+        if self.grid_view is None:
+            # 第一次显示游戏：清除启动时的状态标签，创建游戏界面
+            for widget in self.master.winfo_children():
+                widget.destroy()
+            self.create_widgets()
+        
+        # 之后每局只更新网格和状态，不重建界面（棋盘大小改变时网格自行重建）
+        self.grid_view.show(session.board)
+        for pos in range(session.size * session.size):
+            if not session.is_fixed(pos) and session.value(pos):
+                self.grid_view.set_value(pos, session.value(pos))
+            if session.is_conflict(pos):
+                self.show_conflict(pos)
+        self.update_check_label()
+        self.generating_label.config(text="")
+        self.update_remaining()
+        self.update_undo_redo_buttons()
         
-        # 保存当前难度设置
-        current_difficulty = difficulty
+        # 设置难度和棋盘大小下拉菜单的值
+        self.difficulty_var.set(session.difficulty)
+        self.size_var.set(size_name(session.size))
+
+    def request_generation(self, difficulty, box=3):
+        """请求在后台生成谜题
         
-        # 清除所有现有的界面组件
-        for widget in self.master.winfo_children():
-            widget.destroy()
+        已有生成任务时不会再启动新任务，只记录最新请求的难度和棋盘大小，
+        多次请求会合并为一次。
+        """
+        self.pending_request = (difficulty, box)
+        self.show_generating(difficulty, box)
+        if self.generating is None:
+            self.start_generation(difficulty, box)
+
+    def start_generation(self, difficulty, box=3):
+        """启动后台生成线程，并开始轮询生成结果"""
+        self.generating = (difficulty, box)
+        threading.Thread(target=self.generate_in_background, args=(difficulty, box),
+                         name='puzzle-generation', daemon=True).start()
+        self.master.after(config.GAME['poll_interval'], self.poll_generation)
+
+    def algorithm_for(self, box):
+        """返回宫大小为 box 的算法实例（只在后台生成线程中使用）"""
+        algorithm = self.algorithms.get(box)
+        if algorithm is None:
+            algorithm = self.algorithms[box] = SudokuAlgorithm(box=box)
+        return algorithm
+
+    def generate_in_background(self, difficulty, box=3):
+        """后台线程：生成谜题并把结果放入队列（不能在这里访问任何 Tk 组件）
+
+        9x9 谜题同时通过对称变换派生出的谜题直接放入谜题池，之后的新游戏不必再等待生成。
+        """
+        try:
+            if box == 3:
+                puzzles = self.puzzle_pool.generate_many(self.algorithm, difficulty,
+                                                         config.GAME['variants'] + 1)
+                result = puzzles[0]
+                for puzzle in puzzles[1:]:
+                    self.puzzle_pool.put(difficulty, puzzle)
+            else:
+                algorithm = self.algorithm_for(box)
+                board = algorithm.generate_board()
+                solution = copy_board(board)
+                algorithm.remove_numbers(board, difficulty)
+                result = (board, solution)
+        except Exception as e:
+            result = e
+        self.generation_queue.put(((difficulty, box), result))
+
+    def poll_generation(self):
+        """在 Tk 主线程中轮询后台生成结果"""
+        try:
+            request, result = self.generation_queue.get_nowait()
+        except queue.Empty:
+            self.master.after(config.GAME['poll_interval'], self.poll_generation)
+            return
+        self.generating = None
         
-        # 根据难度移除不同数量的数字
-        self.algorithm.remove_numbers(self.board, current_difficulty)
+        if isinstance(result, Exception):
+            self.pending_request = None
+            self.show_generating(None)
+            messagebox.showerror("错误", f"生成谜题失败: {str(result)}")
+            return
         
-        # 创建游戏界面
-        self.create_widgets()
+        # 生成期间用户改选了其他难度或大小：9x9 的结果放回谜题池，再为最新的请求取题或生成
+        pending = self.pending_request
+        if request != pending:
+            if request[1] == 3:
+                self.puzzle_pool.put(request[0], result)
+            if pending is None:  # 生成期间已经从谜题池开始了新游戏
+                return
+            difficulty, box = pending
+            result = self.puzzle_pool.pop(difficulty) if box == 3 else None
+            if result is None:
+                self.start_generation(difficulty, box)
+                return
+            request = pending
         
-        # 设置难度下拉菜单的值
-        self.difficulty_var.set(current_difficulty)
+        self.show_game(request[0], *result)
+
+    def show_generating(self, difficulty, box=3):
+        """显示或清除"正在生成"状态
+        Args:
+            difficulty: 正在生成的难度，为 None 时清除状态
+            box: 正在生成的棋盘的宫大小
+        """
+        size = "" if box == 3 else size_name(box * box)
+        text = f"正在生成{size}{difficulty}谜题…" if difficulty else ""
+        if self.generating_label is None or not self.generating_label.winfo_exists():
+            # 还没有游戏界面（例如启动时），单独显示一个状态标签
+            self.generating_label = tk.Label(self.master, font=config.FONTS['label'])
+            self.generating_label.grid(row=0, column=0, padx=config.WINDOW['padding'],
+                                       pady=config.WINDOW['padding'])
+        self.generating_label.config(text=text)
 
     def create_widgets(self):
         """创建游戏界面组件"""
@@ -63,55 +214,9 @@ class Sudoku:
                               font=config.FONTS['title'], pady=10)
         title_label.grid(row=0, column=0)
 
-        # 创建数独网格的主框架
-        main_grid = tk.Frame(main_container, 
-                            relief='solid', 
-                            borderwidth=2)
-        main_grid.grid(row=1, column=0, pady=10)
-
-        # 创建9个3x3的子框架，移除背景色设置
-        subgrids = {}
-        for i in range(3):
-            for j in range(3):
-                frame = tk.Frame(main_grid, 
-                               relief='solid', 
-                               borderwidth=2)
-                frame.grid(row=i, column=j, padx=2, pady=2)
-                subgrids[(i, j)] = frame
-
-        # 创建9x9的数独格子
-        for i in range(9):
-            for j in range(9):
-                value = self.board[i][j]
-                subgrid_row, subgrid_col = i // 3, j // 3
-                cell_row, cell_col = i % 3, j % 3
-                
-                if value == 0:  # 空格子使用Entry组件
-                    entry = tk.Entry(subgrids[(subgrid_row, subgrid_col)],
-                                   width=2,
-                                   font=config.FONTS['cell'],
-                                   justify='center',
-                                   relief='solid',
-                                   borderwidth=1)
-                    entry.grid(row=cell_row, column=cell_col,
-                             padx=2, pady=2, ipadx=2, ipady=2)
-                    entry.bind('<KeyPress>', self.validate_input)
-                    # 修改高亮颜色
-                    entry.bind('<FocusIn>', lambda e, entry=entry: 
-                             entry.configure(bg='#e0e8ff'))
-                    entry.bind('<FocusOut>', lambda e, entry=entry: 
-                             entry.configure(bg='systemWindowBody'))
-                    self.cells[(i, j)] = entry
-                else:  # 已有数字使用Label组件
-                    label = tk.Label(subgrids[(subgrid_row, subgrid_col)],
-                                   text=str(value),
-                                   width=2,
-                                   font=config.FONTS['cell_fixed'],
-                                   relief='solid',
-                                   borderwidth=1)
-                    label.grid(row=cell_row, column=cell_col,
-                             padx=2, pady=2, ipadx=2, ipady=2)
-                    self.cells[(i, j)] = label
+        # 创建数独网格（按 config.GRID['renderer'] 选择绘制方式）
+        self.grid_view = create_grid(main_container, self.on_cell_input)
+        self.grid_view.grid(row=1, column=0, pady=10)
 
         # 创建按钮框架
         button_frame = tk.Frame(main_container)
@@ -135,6 +240,15 @@ class Sudoku:
         difficulty_dropdown.config(font=('Arial', 12))
         difficulty_dropdown.grid(row=0, column=1)
 
+        # 棋盘大小选择，见 config.GAME['sizes']
+        self.size_var = tk.StringVar(self.master)
+        self.size_var.set(size_name(config.GAME['box_size'] ** 2))
+        size_dropdown = tk.OptionMenu(difficulty_frame,
+                                      self.size_var,
+                                      *config.GAME['sizes'])
+        size_dropdown.config(font=('Arial', 12))
+        size_dropdown.grid(row=0, column=2, padx=5)
+
         # 创建按钮
         new_game_button = tk.Button(button_frame,
                                    text="新游戏",
@@ -162,10 +276,20 @@ class Sudoku:
 
         # 显示剩余检查次数
         self.check_label = tk.Label(status_frame,
-                                   text=f"剩余检查次数: {self.max_checks - self.check_count}",
                                    font=config.FONTS['label'])
         self.check_label.grid(row=0, column=0, padx=10)
 
+        # 显示后台生成状态
+        self.generating_label = tk.Label(status_frame,
+                                        text="",
+                                        font=config.FONTS['label'])
+        self.generating_label.grid(row=0, column=1, padx=10)
+
+        # 显示剩余空格数和完成状态
+        self.remaining_label = tk.Label(status_frame,
+                                       font=config.FONTS['label'])
+        self.remaining_label.grid(row=0, column=2, padx=10)
+
         # 创建操作按钮框架
         operation_frame = tk.Frame(main_container)
         operation_frame.grid(row=4, column=0, pady=5)
@@ -212,186 +336,171 @@ class Sudoku:
                                fg=config.COLORS['button_fg'])     # 按钮文字颜色
         load_button.grid(row=0, column=3, padx=5)
 
+        # 存档槽选择
+        self.slot_var = tk.StringVar(self.master)
+        self.slot_var.set(config.SAVES['slots'][0])
+        slot_dropdown = tk.OptionMenu(operation_frame,
+                                      self.slot_var,
+                                      *config.SAVES['slots'])
+        slot_dropdown.config(font=('Arial', 12))
+        slot_dropdown.grid(row=0, column=4, padx=5)
+
+    def open_bank(self):
+        """打开 config.BANK 中配置的题库文件，文件不存在或无效时返回 None"""
+        path = config.BANK['path']
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return PuzzleBank(path)
+        except (OSError, ValueError) as e:
+            logger.warning("无法打开题库 %s: %s", path, e)
+            return None
+
+    def close(self):
+        """关闭窗口前停止谜题池，并把谜题池和求解结果缓存保存到磁盘"""
+        self.puzzle_pool.stop()
+        self.save_store.close()  # 等待尚未写完的存档
+        if self.puzzle_bank is not None:
+            self.puzzle_bank.close()
+        if self.algorithm.cache is not None:
+            self.algorithm.cache.save()  # 求解结果缓存，下次启动时加载
+        self.master.destroy()
+
     def start_new_game(self):
         """开始新游戏的处理函数"""
-        self.new_game(self.difficulty_var.get())
+        self.new_game(self.difficulty_var.get(), config.GAME['sizes'][self.size_var.get()])
 
     def check_solution(self):
         """检查当前解答是否正确"""
-        if self.check_count >= self.max_checks:
+        result = self.session.check()
+        if result is None:
             messagebox.showwarning("警告", "已达到最大检查次数！")
             return
+        self.update_check_label()
         
-        self.check_count += 1
-        self.check_label.config(text=f"剩余检查次数: {self.max_checks - self.check_count}")
-        
-        has_error = False  # 错误标志
-        # 检查所有可编辑的单元格
-        for i in range(9):
-            for j in range(9):
-                if isinstance(self.cells[(i, j)], tk.Entry):
-                    value = self.cells[(i, j)].get()
-                    # 检查输入是否有效且正确
-                    if value == "" or not value.isdigit() or int(value) != self.solution[i][j]:
-                        self.cells[(i, j)].config(bg="red")  # 错误标红
-                        has_error = True
-                    else:
-                        self.cells[(i, j)].config(bg="green")  # 正确标绿
+        errors, revealed = result
+        # 为空或与答案不同的格子标红，正确的标绿
+        self.grid_view.show_check(set(errors))
         # 显示相应的消息框
-        if has_error:
+        if errors:
             messagebox.showerror("错误", "数独未完成或有错误")
         else:
             messagebox.showinfo("成功", "数独已完成，且正确！")
-        # 如果用户检查次数超过5次且仍有错误，显示正确答案
-        if self.check_count >= 5 and has_error:
-            for i in range(9):
-                for j in range(9):
-                    # 只处理可编辑的单元格
-                    if isinstance(self.cells[(i, j)], tk.Entry):
-                        value = self.cells[(i, j)].get()
-                        # 如果单元格为空或值错误
-                        if value == "" or not value.isdigit() or int(value) != self.solution[i][j]:
-                            # 清空单元格内容
-                            self.cells[(i, j)].delete(0, tk.END)
-                            # 插入正确答案
-                            self.cells[(i, j)].insert(0, str(self.solution[i][j]))
-                            # 将答案显示为蓝色加粗字体
-                            self.cells[(i, j)].config(fg="blue", font=('Arial', 20, 'bold'))
-
-    def validate_input(self, event):
-        """验证输入是否为1-9的数字"""
-        # 允许删除和退格键
-        if event.keysym in ['BackSpace', 'Delete']:
-            return
-        # 只允许输入1-9的数字
-        if event.char not in '123456789':
-            return "break"
-        # 如果已经有数字，阻止输入
-        if event.widget.get():
-            return "break"
-        
-        # 在输入前保存当前状态用于撤销
-        self.save_state()
-
-    def save_state(self):
-        """保存当前状态用于撤销"""
-        current_state = {}
-        for i in range(9):
-            for j in range(9):
-                if isinstance(self.cells[(i, j)], tk.Entry):
-                    current_state[(i, j)] = self.cells[(i, j)].get()
-        
-        self.undo_stack.append(current_state)
-        self.redo_stack.clear()  # 新的操作会清空重做栈
+        # 检查次数用完且仍有错误时，会话已填入正确答案，显示为蓝色加粗字体
+        if revealed:
+            self.redraw(range(self.session.size * self.session.size))
+        for pos in revealed:
+            self.grid_view.set_value(pos, self.session.value(pos))
+            self.grid_view.set_fg(pos, config.COLORS['fg_hint'], REVEAL_FONT)
+
+    def update_check_label(self):
+        """显示剩余检查次数"""
+        self.check_label.config(text=f"剩余检查次数: {self.session.checks_left}")
+
+    def on_cell_input(self, pos, num):
+        """玩家修改格子后交给会话处理，只重新着色冲突状态改变的格子
+        Args:
+            pos: 一维下标
+            num: 修改后的数字，0 表示清空
+        """
+        self.redraw(self.session.input(pos, num))
         self.update_undo_redo_buttons()
 
+    def redraw(self, positions):
+        """按会话的状态重新着色格子，并更新剩余空格数"""
+        for pos in positions:
+            self.show_conflict(pos)
+        self.update_remaining()
+
+    def show_conflict(self, pos):
+        """按冲突状态设置格子的文字颜色"""
+        session = self.session
+        if session.is_conflict(pos):
+            color = config.COLORS['fg_conflict']
+        elif session.is_fixed(pos):
+            color = config.COLORS['fg_fixed']
+        else:
+            color = config.COLORS['fg_default']
+        self.grid_view.set_fg(pos, color)
+
+    def update_remaining(self):
+        """显示剩余空格数，填满且没有冲突时显示已完成"""
+        tracker = self.session.tracker
+        if tracker.is_complete():
+            text = "已完成"
+        else:
+            text = f"剩余空格: {tracker.remaining}"
+            if tracker.conflicts():
+                text += f"  冲突: {len(tracker.conflicts())}"
+        self.remaining_label.config(text=text)
+
     def undo(self):
-        """撤销操作"""
-        if not self.undo_stack:
-            return
-        
-        # 保存当前状态到重做栈
-        current_state = {}
-        for i in range(9):
-            for j in range(9):
-                if isinstance(self.cells[(i, j)], tk.Entry):
-                    current_state[(i, j)] = self.cells[(i, j)].get()
-        self.redo_stack.append(current_state)
-        
-        # 恢复上一个状态
-        previous_state = self.undo_stack.pop()
-        for (i, j), value in previous_state.items():
-            if isinstance(self.cells[(i, j)], tk.Entry):
-                self.cells[(i, j)].delete(0, tk.END)
-                if value:
-                    self.cells[(i, j)].insert(0, value)
-        
-        self.update_undo_redo_buttons()
+        """撤销操作：把上一步修改的格子恢复为修改前的数字"""
+        self.apply_move(self.session.undo())
 
     def redo(self):
-        """重做操作"""
-        if not self.redo_stack:
+        """重做操作：把撤销的格子重新设为修改后的数字"""
+        self.apply_move(self.session.redo())
+
+    def apply_move(self, move):
+        """显示撤销/重做的结果，只更新被修改的那一个格子"""
+        if move is None:
             return
-        
-        # 保存当前状态到撤销栈
-        current_state = {}
-        for i in range(9):
-            for j in range(9):
-                if isinstance(self.cells[(i, j)], tk.Entry):
-                    current_state[(i, j)] = self.cells[(i, j)].get()
-        self.undo_stack.append(current_state)
-        
-        # 恢复下一个状态
-        next_state = self.redo_stack.pop()
-        for (i, j), value in next_state.items():
-            if isinstance(self.cells[(i, j)], tk.Entry):
-                self.cells[(i, j)].delete(0, tk.END)
-                if value:
-                    self.cells[(i, j)].insert(0, value)
-        
+        pos, positions = move
+        self.grid_view.set_value(pos, self.session.value(pos))
+        self.redraw(positions)
         self.update_undo_redo_buttons()
 
     def update_undo_redo_buttons(self):
         """更新撤销/重做按钮状态"""
-        self.undo_button['state'] = 'normal' if self.undo_stack else 'disabled'
-        self.redo_button['state'] = 'normal' if self.redo_stack else 'disabled'
+        history = self.session.history
+        self.undo_button['state'] = 'normal' if history.can_undo() else 'disabled'
+        self.redo_button['state'] = 'normal' if history.can_redo() else 'disabled'
 
     def save_game(self):
-        """保存游戏状态"""
-        import json
-        import os
-        
-        game_state = {
-            'board': self.board,
-            'solution': self.solution,
-            'current_state': {},
-            'difficulty': self.difficulty_var.get(),
-            'check_count': self.check_count
-        }
-        
-        # 保存当前填写的数字
-        for i in range(9):
-            for j in range(9):
-                if isinstance(self.cells[(i, j)], tk.Entry):
-                    game_state['current_state'][f"{i},{j}"] = self.cells[(i, j)].get()
-        
-        # 确保存档目录存在
-        if not os.path.exists('saves'):
-            os.makedirs('saves')
-        
-        # 保存到文件
-        with open('saves/sudoku_save.json', 'w') as f:
-            json.dump(game_state, f)
-        
-        messagebox.showinfo("保存成功", "游戏已保存")
+        """保存游戏状态到选中的存档槽（在后台线程中写入）"""
+        future = self.save_store.save_async(self.slot_var.get(), self.session)
+        self.poll_io(future, self.on_saved)
+
+    def on_saved(self, future):
+        """存档写入完成后在 Tk 主线程中调用"""
+        error = future.exception()
+        if error is not None:
+            messagebox.showerror("错误", f"保存存档失败: {str(error)}")
+        else:
+            messagebox.showinfo("保存成功", "游戏已保存")
 
     def load_game(self):
-        """加载游戏状态"""
-        import json
-        import os
-        
-        if not os.path.exists('saves/sudoku_save.json'):
+        """从选中的存档槽加载游戏状态（在后台线程中读取）
+
+        存档直接恢复为游戏会话并显示，不会生成新的谜题。
+        """
+        slot = self.slot_var.get()
+        if not self.save_store.exists(slot):
             messagebox.showerror("错误", "没有找到存档文件")
             return
-        
-        try:
-            with open('saves/sudoku_save.json', 'r') as f:
-                game_state = json.load(f)
-            
-            self.board = game_state['board']
-            self.solution = game_state['solution']
-            self.check_count = game_state['check_count']
-            
-            # 重新创建界面
-            self.new_game(game_state['difficulty'])
-            
-            # 恢复保存的数字
-            for pos, value in game_state['current_state'].items():
-                i, j = map(int, pos.split(','))
-                if isinstance(self.cells[(i, j)], tk.Entry) and value:
-                    self.cells[(i, j)].insert(0, value)
-            
-            messagebox.showinfo("加载成功", "游戏已加载")
-            
-        except Exception as e:
-            messagebox.showerror("错误", f"加载存档失败: {str(e)}")
+        self.poll_io(self.save_store.load_async(slot), self.on_loaded)
+
+    def on_loaded(self, future):
+        """存档读取完成后在 Tk 主线程中调用"""
+        error = future.exception()
+        if error is not None:
+            messagebox.showerror("错误", f"加载存档失败: {str(error)}")
+            return
+        self.show_session(future.result())
+        messagebox.showinfo("加载成功", "游戏已加载")
+
+    def poll_io(self, future, callback):
+        """在 Tk 主线程中轮询后台读写，完成后调用 callback(future)"""
+        if future.done():
+            callback(future)
+        else:
+            self.master.after(config.GAME['poll_interval'], self.poll_io, future, callback)
+
+
+def size_name(size):
+    """返回边长为 size 的棋盘在界面中的名称（config.GAME['sizes'] 的键）"""
+    for name, box in config.GAME['sizes'].items():
+        if box * box == size:
+            return name
+    return f"{size}x{size}"
@@ -0,0 +1,162 @@
+"""NumPy 批量校验与候选数传播：一次处理形状为 (N, 9, 9) 的一批棋盘
+
+逐格的 Python 循环适合单个棋盘；需要校验成千上万个提交的答案、
+或在批量生成中一次筛选大量候选棋盘时，这里的行/列/宫检查都是整批的数组运算。
+本模块依赖 numpy（可选依赖，只有批量校验需要）。
+"""
+import numpy as np
+from board_state import FULL_MASK
+from packed_board import PackedBoard
+
+# 数字 n 对应的候选数位，0（空格）对应0
+DIGIT_BITS = np.array([0] + [1 << (num - 1) for num in range(1, 10)], dtype=np.uint16)
+# 只有一个候选数的掩码对应的数字
+SINGLE_DIGIT = np.zeros(FULL_MASK + 1, dtype=np.uint8)
+SINGLE_DIGIT[DIGIT_BITS[1:]] = np.arange(1, 10, dtype=np.uint8)
+
+# propagate 返回的每个棋盘的状态
+CONTRADICTION = -1
+UNSOLVED = 0
+SOLVED = 1
+
+
+def to_array(boards):
+    """把一批棋盘转换为 (N, 9, 9) 的 uint8 数组
+    Args:
+        boards: 棋盘序列，元素可以是 PackedBoard、81字符字符串或 9x9 二维列表；
+                已经是数组时直接整理形状
+    """
+    if isinstance(boards, np.ndarray):
+        return boards.astype(np.uint8, copy=False).reshape(-1, 9, 9)
+    data = b''.join(bytes(board.cells) if isinstance(board, PackedBoard)
+                    else bytes(PackedBoard.of(board).cells) for board in boards)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 9, 9).copy()
+
+
+def _boxes(array):
+    """把 (N, 9, 9, ...) 的数组按宫重排为 (N, 9宫, 9格, ...)；该变换是自身的逆变换"""
+    rest = array.shape[3:]
+    return (array.reshape((-1, 3, 3, 3, 3) + rest).swapaxes(2, 3)
+            .reshape((-1, 9, 9) + rest))
+
+
+def _one_hot(boards):
+    """返回 (N, 9, 9, 9) 的布尔数组，最后一维表示该格是否为数字 1-9"""
+    return boards[..., None] == np.arange(1, 10, dtype=np.uint8)
+
+
+def conflicts(boards):
+    """标出与同行、同列或同宫的格子重复的数字
+    Returns:
+        ndarray: (N, 9, 9) 的布尔数组，True 表示该格的数字与其他格冲突
+    """
+    boards = to_array(boards)
+    hot = _one_hot(boards)
+    row_dup = hot.sum(axis=2, dtype=np.uint8)[:, :, None, :] > 1
+    col_dup = hot.sum(axis=1, dtype=np.uint8)[:, None, :, :] > 1
+    box_dup = _boxes(np.broadcast_to(
+        _boxes(hot).sum(axis=2, dtype=np.uint8)[:, :, None, :] > 1, (len(boards), 9, 9, 9)))
+    return (hot & (row_dup | col_dup | box_dup)).any(axis=3)
+
+
+def is_valid(boards):
+    """检查每个棋盘是否没有超出范围的值、也没有重复的数字（允许空格）
+    Returns:
+        ndarray: (N,) 的布尔数组
+    """
+    boards = to_array(boards)
+    return (boards <= 9).all(axis=(1, 2)) & ~conflicts(boards).any(axis=(1, 2))
+
+
+def is_solved(boards):
+    """检查每个棋盘是否是完整且正确的解
+    Returns:
+        ndarray: (N,) 的布尔数组
+    """
+    boards = to_array(boards)
+    hot = _one_hot(boards)
+    # 每行、每列、每宫中每个数字恰好出现一次
+    return ((hot.sum(axis=2) == 1).all(axis=(1, 2)) & (hot.sum(axis=1) == 1).all(axis=(1, 2))
+            & (_boxes(hot).sum(axis=2) == 1).all(axis=(1, 2)))
+
+
+def matches(puzzles, solutions):
+    """检查每个答案是否保留了谜题中的所有已知数字
+    Returns:
+        ndarray: (N,) 的布尔数组
+    """
+    puzzles, solutions = to_array(puzzles), to_array(solutions)
+    return ((puzzles == 0) | (puzzles == solutions)).all(axis=(1, 2))
+
+
+def candidates(boards):
+    """计算每个空格的候选数掩码（第 n-1 位表示数字 n），已填的格子为0
+    Returns:
+        ndarray: (N, 9, 9) 的 uint16 数组
+    """
+    boards = to_array(boards)
+    bits = DIGIT_BITS[boards]
+    used = (np.bitwise_or.reduce(bits, axis=2)[:, :, None]
+            | np.bitwise_or.reduce(bits, axis=1)[:, None, :]
+            | _boxes(np.broadcast_to(np.bitwise_or.reduce(_boxes(bits), axis=2)[:, :, None],
+                                       (len(boards), 9, 9))))
+    return np.where(boards == 0, ~used & FULL_MASK, 0).astype(np.uint16)
+
+
+def _hidden_singles(boards, cand):
+    """对整批棋盘找出隐性唯一数：某数字在一行、一列或一宫中只有一个候选位置
+    Returns:
+        tuple: ((N, 9, 9) 的 uint8 数组，找到隐性唯一数的格子为该数字，其余为0；
+                (N,) 的布尔数组，True 表示某个数字在某个单元中既没有填入也无处可填)
+    """
+    hot = (cand[..., None] & DIGIT_BITS[1:]) != 0  # (N, 9, 9, 9数字)
+    single = ((hot.sum(axis=2, keepdims=True) == 1)
+              | (hot.sum(axis=1, keepdims=True) == 1)
+              | _boxes(np.broadcast_to(_boxes(hot).sum(axis=2, keepdims=True) == 1, hot.shape)))
+    # 每个数字在每个单元中要么已经填入，要么至少有一个候选位置
+    covered = hot | _one_hot(boards)
+    missing = (~covered.any(axis=2).all(axis=(1, 2)) | ~covered.any(axis=1).all(axis=(1, 2))
+               | ~_boxes(covered).any(axis=2).all(axis=(1, 2)))
+    found = hot & single
+    # 一个格子同时是两个数字的唯一位置时取较小的数字，随后的校验会发现矛盾
+    fill = np.where(found.any(axis=3), found.argmax(axis=3) + 1, 0).astype(np.uint8)
+    return fill, missing
+
+
+def propagate(boards, hidden=True, max_rounds=81):
+    """对整批棋盘反复填入唯一候选数（以及隐性唯一数），直到不再有进展
+    Args:
+        boards: 一批棋盘（不会被修改）
+        hidden: 是否同时应用隐性唯一数
+        max_rounds: 最多传播的轮数
+    Returns:
+        tuple: (传播后的 (N, 9, 9) 数组, (N,) 的状态数组)。状态为 SOLVED（已解出）、
+               UNSOLVED（需要继续搜索）或 CONTRADICTION（发现矛盾，无解）
+    """
+    boards = to_array(boards).copy()
+    status = np.where(is_valid(boards), UNSOLVED, CONTRADICTION).astype(np.int8)
+    status[(status == UNSOLVED) & (boards != 0).all(axis=(1, 2))] = SOLVED
+    active = np.flatnonzero(status == UNSOLVED)  # 仍在取得进展的棋盘
+    for _ in range(max_rounds):
+        if not len(active):
+            break
+        work = boards[active]
+        cand = candidates(work)
+        empty = work == 0
+        dead = (empty & (cand == 0)).any(axis=(1, 2))
+        fill = np.where(empty, SINGLE_DIGIT[cand], 0).astype(np.uint8)
+        if hidden:
+            hidden_fill, missing = _hidden_singles(work, cand)
+            fill = np.where(fill == 0, hidden_fill, fill)
+            dead |= missing
+        progress = (fill != 0).any(axis=(1, 2)) & ~dead
+        work += fill * progress[:, None, None].astype(np.uint8)
+        # 同时填入的数字之间可能冲突，冲突说明该棋盘无解
+        dead |= progress & ~is_valid(work)
+        boards[active] = work
+        solved = ~dead & (work != 0).all(axis=(1, 2))
+        status[active[dead]] = CONTRADICTION
+        status[active[solved]] = SOLVED
+        # 没有进展的棋盘需要继续搜索，不再参与传播
+        active = active[progress & ~dead & ~solved]
+    return boards, status